@@ -1,32 +1,37 @@
 #!/usr/bin/env python3
 """
-��Ϸ�����ű�
-��������ļ������� Pixel Runner Game
+游戏启动脚本
+运行这个文件来启动 Pixel Runner Game
 """
 
 import sys
 import os
 
-# ����srcĿ¼��Python·��
+# 添加src目录到Python路径
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(current_dir, 'src')
 sys.path.insert(0, src_dir)
 
+# 先导入启动计时：系统不提供进程启动时间时从这里开始计时，下面导入游戏的时间计入 imports 阶段
+import src.startup  # noqa: E402,F401
+
 try:
-    # ���Ե��벢������������Ϸ
-    from src.game_v2 import main as game_v2_main
-    print("���� Pixel Runner Game v2.0...")
-    game_v2_main()
+    # 优先使用新版本游戏
+    from src.game_v2 import main
+    print("启动 Pixel Runner Game v2.0...")
 except ImportError:
-    # ��������治���ã�����ԭ��
-    print("�����治���ã�����ԭ����Ϸ...")
+    # 新版本不可用时运行原版
+    print("新版本不可用，运行原版游戏...")
     try:
-        import enhanced_game
-        enhanced_game.main()
+        from enhanced_game import main
     except ImportError as e:
-        print(f"�޷�������Ϸ: {e}")
-        print("��ȷ����װ����������: pip install -r requirements.txt")
+        print(f"无法启动游戏: {e}")
+        print("请确保已安装所需依赖: pip install -r requirements.txt")
         sys.exit(1)
+
+# 游戏运行中的错误不会被当作模块缺失而换用另一个版本
+try:
+    main()
 except Exception as e:
-    print(f"��Ϸ����ʱ����: {e}")
+    print(f"游戏运行时出错: {e}")
     sys.exit(1)
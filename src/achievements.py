@@ -1,88 +1,191 @@
-﻿from typing import Dict, List, Any
+﻿import json
+import os
+from bisect import bisect_right
+from typing import Dict, List, Any, Optional, Tuple
+
+ACHIEVEMENTS_FILE = "config/achievements.json"
+SCOPES = ('run', 'lifetime')
+# 比较方向：True 表示数值越大越容易满足
+COMPARISONS = {'>=': (True, 0), '>': (True, 1), '<=': (False, 0), '<': (False, 1)}
+
+_MISSING = object()
+
+DEFAULT_ACHIEVEMENTS = [
+    {'id': 'first_100', 'name': 'First Steps', 'description': 'Reach 100 points', 'stat': 'score', 'threshold': 100},
+    {'id': 'score_500', 'name': 'Runner', 'description': 'Reach 500 points', 'stat': 'score', 'threshold': 500},
+    {'id': 'score_1000', 'name': 'Expert Runner', 'description': 'Reach 1000 points', 'stat': 'score', 'threshold': 1000},
+    {'id': 'star_collector', 'name': 'Star Collector', 'description': 'Collect 10 stars in one game',
+     'stat': 'stars_collected_in_game', 'threshold': 10},
+    {'id': 'speed_demon', 'name': 'Speed Demon', 'description': 'Reach speed 10', 'stat': 'max_speed', 'threshold': 10},
+]
 
 class Achievement:
-    def __init__(self, id: str, name: str, description: str, icon: str, condition_func):
+    def __init__(self, id: str, name: str, description: str, icon: str = '', stat: str = 'score',
+                 comparison: str = '>=', threshold: float = 0, scope: str = 'run'):
+        if comparison not in COMPARISONS:
+            raise ValueError(f"achievement {id!r}: unknown comparison {comparison!r}")
+        if scope not in SCOPES:
+            raise ValueError(f"achievement {id!r}: unknown scope {scope!r}")
+        if isinstance(threshold, bool) or not isinstance(threshold, (int, float)):
+            raise ValueError(f"achievement {id!r}: threshold must be a number")
         self.id = id
         self.name = name
         self.description = description
         self.icon = icon
-        self.condition_func = condition_func
+        self.stat = stat
+        self.comparison = comparison
+        self.threshold = threshold
+        self.scope = scope
         self.unlocked = False
 
+    @property
+    def sort_key(self) -> Tuple[float, int]:
+        """Position in a ThresholdIndex: a value v satisfies the achievement iff sort_key <= query_key(v)"""
+        rising, strict = COMPARISONS[self.comparison]
+        return (self.threshold if rising else -self.threshold, strict)
+
+    def met(self, value) -> bool:
+        return self.sort_key <= ThresholdIndex.query_key(value, COMPARISONS[self.comparison][0])
+
+def load_achievements(path: str = ACHIEVEMENTS_FILE) -> Dict[str, Achievement]:
+    """Read achievement definitions from a JSON list; falls back to the built-in set"""
+    definitions = DEFAULT_ACHIEVEMENTS
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                definitions = json.load(f)
+    except Exception as e:
+        print(f"Failed to load achievements: {e}")
+    achievements = {}
+    for definition in definitions:
+        try:
+            achievement = Achievement(**definition)
+        except TypeError as e:
+            raise ValueError(f"bad achievement definition {definition!r}: {e}") from None
+        if achievement.id in achievements:
+            raise ValueError(f"duplicate achievement id {achievement.id!r}")
+        achievements[achievement.id] = achievement
+    return achievements
+
+class ThresholdIndex:
+    """Pending achievements on one stat, sorted by threshold.
+
+    Rising (>=, >) and falling (<=, <) comparisons are kept in separate lists
+    with falling thresholds negated, so in both lists the achievements a
+    value satisfies form a prefix that one bisect finds.
+    """
+
+    def __init__(self):
+        # 每个方向一对平行列表：排序键和成就
+        self.lists = {True: ([], []), False: ([], [])}
+
+    def __len__(self):
+        return sum(len(keys) for keys, _ in self.lists.values())
+
+    @staticmethod
+    def query_key(value, rising: bool) -> Tuple[float, int]:
+        return (value if rising else -value, 0)
+
+    def add(self, achievement: Achievement):
+        keys, items = self.lists[COMPARISONS[achievement.comparison][0]]
+        key = achievement.sort_key
+        i = bisect_right(keys, key)
+        keys.insert(i, key)
+        items.insert(i, achievement)
+
+    def crossed(self, value) -> List[Achievement]:
+        """Remove and return every achievement that value satisfies"""
+        result = []
+        for rising, (keys, items) in self.lists.items():
+            n = bisect_right(keys, self.query_key(value, rising))
+            if n:
+                result.extend(items[:n])
+                del keys[:n], items[:n]
+        return result
+
+def lookup(stats: Dict[str, Any], path: str, default=None):
+    """stats['a']['b'] for the path 'a.b'"""
+    value = stats
+    for key in path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
+
 class AchievementManager:
-    def __init__(self, save_manager):
+    """Tracks which achievements are unlocked without touching the save file.
+
+    Definitions come from a data file and pending ones are compiled into a
+    ThresholdIndex per (scope, stat). A check only looks at stats whose value
+    changed since the last check, and each of those is a single bisect, so
+    it is cheap enough to run every frame.
+    """
+
+    def __init__(self, save_manager, path: str = ACHIEVEMENTS_FILE):
         self.save_manager = save_manager
-        self.achievements = self._create_achievements()
+        self.achievements = load_achievements(path)
         self.recently_unlocked = []
-        
-    def _create_achievements(self) -> Dict[str, Achievement]:
-        achievements = {}
-        
-        achievements['first_100'] = Achievement(
-            'first_100', 'First Steps', 'Reach 100 points', '',
-            lambda stats: stats.get('score', 0) >= 100
-        )
-        
-        achievements['score_500'] = Achievement(
-            'score_500', 'Runner', 'Reach 500 points', '',
-            lambda stats: stats.get('score', 0) >= 500
-        )
-        
-        achievements['score_1000'] = Achievement(
-            'score_1000', 'Expert Runner', 'Reach 1000 points', '',
-            lambda stats: stats.get('score', 0) >= 1000
-        )
-        
-        achievements['star_collector'] = Achievement(
-            'star_collector', 'Star Collector', 'Collect 10 stars in one game', '',
-            lambda stats: stats.get('stars_collected_in_game', 0) >= 10
-        )
-        
-        achievements['speed_demon'] = Achievement(
-            'speed_demon', 'Speed Demon', 'Reach speed 10', '',
-            lambda stats: stats.get('max_speed', 0) >= 10
-        )
-        
-        return achievements
+        self.unlocked = {aid for aid in self.achievements if save_manager.is_achievement_unlocked(aid)}
+        self.indexes: Dict[Tuple[str, str], ThresholdIndex] = {}
+        for achievement in self.achievements.values():
+            achievement.unlocked = achievement.id in self.unlocked
+            if not achievement.unlocked:
+                key = (achievement.scope, achievement.stat)
+                self.indexes.setdefault(key, ThresholdIndex()).add(achievement)
+        self.last_stats: Dict[Tuple[str, str], Any] = {}
+        self._progress: Optional[Dict[str, Any]] = None
     
-    def check_achievements(self, game_stats: Dict[str, Any]) -> List[Achievement]:
+    def check_achievements(self, game_stats: Dict[str, Any],
+                           lifetime_stats: Optional[Dict[str, Any]] = None) -> List[Achievement]:
+        """Unlock what the stats now satisfy.
+
+        Run-scope achievements read game_stats; lifetime ones read
+        lifetime_stats, which defaults to the save data.
+        """
+        if lifetime_stats is None:
+            lifetime_stats = self.save_manager.load_game_data()
+        sources = {'run': game_stats, 'lifetime': lifetime_stats}
         newly_unlocked = []
         
-        for achievement in self.achievements.values():
-            if not self.save_manager.is_achievement_unlocked(achievement.id):
-                if achievement.condition_func(game_stats):
-                    if self.save_manager.unlock_achievement(achievement.id, {
-                        'name': achievement.name,
-                        'description': achievement.description,
-                        'icon': achievement.icon
-                    }):
-                        achievement.unlocked = True
-                        newly_unlocked.append(achievement)
-                        self.recently_unlocked.append(achievement)
+        for key, index in list(self.indexes.items()):
+            value = lookup(sources[key[0]], key[1], _MISSING)
+            if value is _MISSING or self.last_stats.get(key, _MISSING) == value:
+                continue
+            self.last_stats[key] = value
+            for achievement in index.crossed(value):
+                self._unlock(achievement)
+                newly_unlocked.append(achievement)
+            if not index:
+                del self.indexes[key]
         
+        self.recently_unlocked.extend(newly_unlocked)
         return newly_unlocked
     
+    def _unlock(self, achievement: Achievement):
+        self.save_manager.unlock_achievement(achievement.id, {
+            'name': achievement.name,
+            'description': achievement.description,
+            'icon': achievement.icon
+        })
+        achievement.unlocked = True
+        self.unlocked.add(achievement.id)
+        self._progress = None
+    
     def get_unlocked_achievements(self) -> List[Achievement]:
-        unlocked = []
-        save_data = self.save_manager.load_game_data()
-        
-        for achievement in self.achievements.values():
-            if achievement.id in save_data.get('achievements', {}):
-                achievement.unlocked = True
-                unlocked.append(achievement)
-        
-        return unlocked
+        return [a for a in self.achievements.values() if a.id in self.unlocked]
     
     def get_progress_info(self) -> Dict[str, Any]:
-        total_achievements = len(self.achievements)
-        unlocked_count = len(self.get_unlocked_achievements())
-        
-        return {
-            'total': total_achievements,
-            'unlocked': unlocked_count,
-            'progress': unlocked_count / total_achievements if total_achievements > 0 else 0,
-            'recently_unlocked': self.recently_unlocked
-        }
+        """Cached until the next unlock; cheap enough to call every frame"""
+        if self._progress is None:
+            total_achievements = len(self.achievements)
+            unlocked_count = len(self.unlocked)
+            self._progress = {
+                'total': total_achievements,
+                'unlocked': unlocked_count,
+                'progress': unlocked_count / total_achievements if total_achievements > 0 else 0,
+                'recently_unlocked': self.recently_unlocked
+            }
+        return self._progress
     
     def clear_recent_achievements(self):
         self.recently_unlocked.clear()
@@ -0,0 +1,333 @@
+import math
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.simulation import (
+    DEFAULT_RULES, GROUND_HEIGHT, HEIGHT, OBSTACLE_TYPES, WIDTH, Player, Rules, Star, ms_to_frames,
+)
+
+# 实体尺寸取自模拟核心的实体类，保证两边一致
+_PLAYER = Player()
+_STAR = Star(random.Random(0))
+
+OBSTACLE_WIDTHS = np.array([t['width'] for t in OBSTACLE_TYPES], dtype=np.float64)
+OBSTACLE_TOPS = np.array([HEIGHT - t['height'] - GROUND_HEIGHT for t in OBSTACLE_TYPES], dtype=np.float64)
+OBSTACLE_HEIGHTS = np.array([t['height'] for t in OBSTACLE_TYPES], dtype=np.float64)
+MAX_OBSTACLE_WIDTH = float(OBSTACLE_WIDTHS.max())
+
+STAR_X_RANGE = (WIDTH, WIDTH + 100)
+STAR_Y_RANGE = (HEIGHT // 2, HEIGHT - 60)
+
+
+def slot_counts(rules: Rules) -> Tuple[int, int]:
+    """Obstacle and star slots needed so a slot is free again before it is reused.
+
+    Speed never drops below rules.initial_speed, so an obstacle is on screen
+    for at most (WIDTH + widest obstacle) / initial_speed frames, and
+    obstacles spawn at least the shorter of the two spawn intervals apart;
+    stars likewise, star_interval + 1 frames apart. With the default rules
+    that is 4 obstacle slots and 2 star slots.
+    """
+    obstacle_frames = (WIDTH + MAX_OBSTACLE_WIDTH + 1) / rules.initial_speed
+    obstacle_gap = ms_to_frames(min(rules.obstacle_spawn_ms, rules.min_obstacle_spawn_ms))
+    star_frames = (STAR_X_RANGE[1] + _STAR.width + 1) / rules.initial_speed
+    return math.ceil(obstacle_frames / obstacle_gap) + 1, math.ceil(star_frames / (rules.star_interval + 1)) + 1
+
+
+def _sweep_span(a0, a1, a_size, b0, b1, b_size):
+    """Vectorised simulation._sweep_span; same operations, so the same floats"""
+    d0 = b0 - a0
+    v = (b1 - a1) - d0
+    moving = v != 0
+    safe_v = np.where(moving, v, 1.0)
+    t0 = (-b_size - d0) / safe_v
+    t1 = (a_size - d0) / safe_v
+    lo = np.where(v > 0, t0, t1)
+    hi = np.where(v > 0, t1, t0)
+    inside = (-b_size < d0) & (d0 < a_size)
+    lo = np.where(moving, lo, np.where(inside, -np.inf, np.inf))
+    hi = np.where(moving, hi, np.where(inside, np.inf, -np.inf))
+    return lo, hi
+
+
+def _time_of_impact(px, pw, ph, y0, y1, bx0, bx1, bw, by, bh):
+    """Vectorised simulation.time_of_impact for the player against one slot; inf means no hit"""
+    # 没有星星的局 x 为 inf，inf - inf 得到 nan，nan 的比较全为 False，结果仍是 inf
+    with np.errstate(invalid='ignore'):
+        x_lo, x_hi = _sweep_span(px, px, pw, bx0, bx1, bw)
+    y_lo, y_hi = _sweep_span(y0, y1, ph, by, by, bh)
+    start = np.maximum(x_lo, y_lo)
+    end = np.minimum(x_hi, y_hi)
+    swept = (start < end) & (start < 1) & (end > 0)
+    overlap = (px < bx1 + bw) & (px + pw > bx1) & (y1 < by + bh) & (y1 + ph > by)
+    return np.where(swept, np.maximum(start, 0.0), np.where(overlap, 1.0, np.inf))
+
+
+class BatchWorld:
+    """N independent runs of World advanced in lockstep with NumPy.
+
+    Every run starts on the same frame and World's spawn and difficulty
+    timers never depend on what the player does, so the timers, the speed
+    and the x of every obstacle are shared scalars; only the random parts
+    (obstacle type, star chance and position) and the player are per run.
+    Obstacles and stars sit in small ring buffers of slots. All arithmetic
+    repeats Player.update, World.step and overlaps() op for op in float64,
+    so a run is bit-identical to a World that got the same spawns.
+
+    Physics, spawn and scoring parameters come from ``rules``, as in World;
+    a new Rules takes effect at the next reset(). Runs that die keep their
+    final results; their rows are compacted away once enough of the batch
+    has died. Clouds are cosmetic and not simulated.
+    """
+
+    def __init__(self, n: int, rng: Optional[np.random.Generator] = None, rules: Rules = DEFAULT_RULES):
+        self.n = n
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.rules = rules
+        self.player_x = float(_PLAYER.x)
+        self.ground_y = float(_PLAYER.ground_y)
+        self.reset()
+
+    def reset(self):
+        """Start a new run in every lane"""
+        n = self.n
+        self.run_rules = rules = self.rules
+        self.obstacle_slots, self.star_slots = slot_counts(rules)
+        # 所有局共享的计时和速度
+        self.frame = 0
+        self.speed = float(rules.initial_speed)
+        self.obstacle_timer = 0
+        self.obstacle_interval = ms_to_frames(rules.obstacle_spawn_ms)
+        self.star_timer = 0
+        self.difficulty_timer = 0
+        self.obs_x = np.full(self.obstacle_slots, np.inf)
+        self.obs_next = 0
+        self.star_travel = np.full(self.star_slots, np.inf)  # 槽位内星星已移动的距离（近似，仅用于筛选）
+        self.star_next = 0
+
+        # 仍在进行的局（按行存放），ids 把行映射回局编号
+        self.ids = np.arange(n)
+        self.live = np.ones(n, dtype=bool)
+        self.y = np.full(n, self.ground_y)
+        self.vel_y = np.zeros(n)
+        self.on_ground = np.ones(n, dtype=bool)
+        self.obs_width = np.zeros((self.obstacle_slots, n))
+        self.obs_top = np.zeros((self.obstacle_slots, n))
+        self.obs_height = np.zeros((self.obstacle_slots, n))
+        self.star_x = np.full((self.star_slots, n), np.inf)
+        self.star_y = np.zeros((self.star_slots, n))
+        self.star_collected = np.zeros((self.star_slots, n), dtype=bool)
+        self.row_score = np.zeros(n, dtype=np.int64)
+        self.row_stars = np.zeros(n, dtype=np.int64)
+        self.row_avoided = np.zeros(n, dtype=np.int64)
+
+        # 已结束的局的最终结果（按局编号）
+        self.game_over = np.zeros(n, dtype=bool)
+        self.final_frame = np.zeros(n, dtype=np.int64)
+        self.final_speed = np.zeros(n)
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.final_stars = np.zeros(n, dtype=np.int64)
+        self.final_avoided = np.zeros(n, dtype=np.int64)
+
+    # Random draws are isolated here so callers can script or replay spawns.
+    # ``runs`` are the run numbers that need a value, in row order.
+    def _obstacle_types(self, runs: np.ndarray) -> np.ndarray:
+        return self.rng.integers(0, len(OBSTACLE_TYPES), len(runs))
+
+    def _star_rolls(self, runs: np.ndarray) -> np.ndarray:
+        return self.rng.random(len(runs))
+
+    def _star_positions(self, runs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        x = self.rng.integers(STAR_X_RANGE[0], STAR_X_RANGE[1] + 1, len(runs))
+        y = self.rng.integers(STAR_Y_RANGE[0], STAR_Y_RANGE[1] + 1, len(runs))
+        return x, y
+
+    def _merge(self, final: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        out = final.copy()
+        out[self.ids[self.live]] = rows[self.live]
+        return out
+
+    @property
+    def alive(self) -> np.ndarray:
+        return ~self.game_over
+
+    @property
+    def score(self) -> np.ndarray:
+        return self._merge(self.final_score, self.row_score)
+
+    @property
+    def stars_collected(self) -> np.ndarray:
+        return self._merge(self.final_stars, self.row_stars)
+
+    @property
+    def obstacles_avoided(self) -> np.ndarray:
+        return self._merge(self.final_avoided, self.row_avoided)
+
+    @property
+    def frames(self) -> np.ndarray:
+        """Frames each run has lasted"""
+        return np.where(self.game_over, self.final_frame, self.frame)
+
+    @property
+    def max_speed(self) -> np.ndarray:
+        return np.where(self.game_over, self.final_speed, self.speed)
+
+    def step(self, jump: Optional[np.ndarray] = None) -> np.ndarray:
+        """Advance every live run one frame.
+
+        ``jump`` is an optional bool array indexed by run number. Returns a
+        bool array of the runs that died on this frame.
+        """
+        died = np.zeros(self.n, dtype=bool)
+        if not self.live.any():
+            return died
+        self.frame += 1
+        rules = self.run_rules
+        speed = self.speed
+        px, pw, ph = self.player_x, _PLAYER.width, _PLAYER.height
+
+        # 生成障碍物
+        self.obstacle_timer += 1
+        if self.obstacle_timer >= self.obstacle_interval:
+            self._spawn_obstacle()
+            self.obstacle_timer = 0
+
+        # 跳跃：在地面上时 vel_y 恒为 0，直接加上跳跃速度即可
+        if jump is not None:
+            if len(self.ids) != self.n:
+                jump = jump[self.ids]
+            jumped = jump & self.on_ground
+            self.vel_y += jumped * rules.jump_strength
+
+        # 玩家物理：与 Player.update 相同的运算顺序
+        y0 = self.y.copy()
+        y, vel_y = self.y, self.vel_y
+        vel_y += rules.gravity
+        y += vel_y
+        landed = y >= self.ground_y
+        np.minimum(y, self.ground_y, out=y)
+        vel_y *= ~landed
+        self.on_ground = landed
+
+        # 障碍物和星星左移
+        prev_x = self.obs_x.copy()
+        self.obs_x -= speed
+        occupied = self.star_travel != np.inf
+        prev_star_x = self.star_x.copy()
+        for s in np.flatnonzero(occupied):
+            self.star_x[s] -= speed
+            self.star_travel[s] += speed
+
+        # 扫掠碰撞检测：只检测这一步内可能经过玩家的槽位，death 为每局最早的碰撞时刻
+        death = np.full(len(y), np.inf)
+        for k in np.flatnonzero((self.obs_x < px + pw + 1) & (prev_x + MAX_OBSTACLE_WIDTH + 1 > px)):
+            toi = _time_of_impact(px, pw, ph, y0, y, prev_x[k], self.obs_x[k],
+                                  self.obs_width[k], self.obs_top[k], self.obs_height[k])
+            np.minimum(death, toi, out=death)
+
+        # 检查星星收集：在撞上障碍物之前碰到的星星才算
+        for s in np.flatnonzero(occupied):
+            near_x = STAR_X_RANGE[0] - self.star_travel[s]
+            if near_x - 1 < px + pw and near_x + speed + STAR_X_RANGE[1] - STAR_X_RANGE[0] + _STAR.width + 1 > px:
+                toi = _time_of_impact(px, pw, ph, y0, y, prev_star_x[s], self.star_x[s],
+                                      _STAR.width, self.star_y[s], _STAR.height)
+                got = (toi <= death) & (toi != np.inf) & ~self.star_collected[s]
+                if got.any():
+                    self.star_collected[s] |= got
+                    self.row_stars += got
+                    self.row_score += got * rules.points_per_star
+
+        # 移除屏幕外障碍物并增加分数：每局在 x + width 第一次小于 0 的帧计分
+        for k in np.flatnonzero(self.obs_x < 0):
+            width = self.obs_width[k]
+            passed = (self.obs_x[k] + width < 0) & (prev_x[k] + width >= 0)
+            self.row_avoided += passed
+            self.row_score += passed * rules.points_per_obstacle
+            if self.obs_x[k] + MAX_OBSTACLE_WIDTH < 0:
+                self.obs_x[k] = np.inf
+
+        # 移除屏幕外的星星（整个槽位都离开屏幕后释放）
+        for s in np.flatnonzero(occupied):
+            if STAR_X_RANGE[1] + _STAR.width - self.star_travel[s] < -1:
+                self.star_travel[s] = np.inf
+                self.star_x[s] = np.inf
+
+        # 生成星星
+        self.star_timer += 1
+        if self.star_timer > rules.star_interval:
+            self._spawn_stars()
+            self.star_timer = 0
+
+        # 增加难度（生成间隔的计时同时重新开始）
+        self.difficulty_timer += 1
+        if self.difficulty_timer > rules.speed_interval:
+            self.speed += rules.speed_increase
+            spawn_ms = max(rules.min_obstacle_spawn_ms, rules.obstacle_spawn_ms - self.difficulty_timer // 60 * 50)
+            self.obstacle_interval = ms_to_frames(spawn_ms)
+            self.obstacle_timer = 0
+            self.difficulty_timer = 0
+
+        hit = (death != np.inf) & self.live
+        if hit.any():
+            died[self.ids[hit]] = True
+            self._finish(np.flatnonzero(hit))
+        return died
+
+    def _spawn_obstacle(self):
+        k = self.obs_next % self.obstacle_slots
+        if self.obs_x[k] != np.inf:
+            raise RuntimeError("obstacle slots exhausted")
+        types = self._obstacle_types(self.ids)
+        self.obs_x[k] = WIDTH
+        self.obs_width[k] = OBSTACLE_WIDTHS[types]
+        self.obs_top[k] = OBSTACLE_TOPS[types]
+        self.obs_height[k] = OBSTACLE_HEIGHTS[types]
+        self.obs_next += 1
+
+    def _spawn_stars(self):
+        spawn = self._star_rolls(self.ids) < self.run_rules.star_chance
+        if not spawn.any():
+            return
+        s = self.star_next % self.star_slots
+        if self.star_travel[s] != np.inf:
+            raise RuntimeError("star slots exhausted")
+        x, y = self._star_positions(self.ids[spawn])
+        self.star_x[s] = np.inf
+        self.star_x[s, spawn] = x
+        self.star_y[s, spawn] = y
+        self.star_collected[s] = False
+        self.star_travel[s] = 0.0
+        self.star_next += 1
+
+    def _finish(self, rows: np.ndarray):
+        """Record the results of rows that died this frame"""
+        runs = self.ids[rows]
+        self.game_over[runs] = True
+        self.final_frame[runs] = self.frame
+        self.final_speed[runs] = self.speed
+        self.final_score[runs] = self.row_score[rows]
+        self.final_stars[runs] = self.row_stars[rows]
+        self.final_avoided[runs] = self.row_avoided[rows]
+        self.live[rows] = False
+        # 结束的局过半时压缩掉，之后的每一帧只计算仍在进行的局
+        if np.count_nonzero(self.live) * 2 < len(self.live):
+            self._compact()
+
+    def _compact(self):
+        keep = self.live
+        self.ids = self.ids[keep]
+        for name in ('y', 'vel_y', 'on_ground', 'row_score', 'row_stars', 'row_avoided', 'live'):
+            setattr(self, name, getattr(self, name)[keep])
+        for name in ('obs_width', 'obs_top', 'obs_height', 'star_x', 'star_y', 'star_collected'):
+            setattr(self, name, getattr(self, name)[:, keep])
+
+    def run(self, frames: int, jump_probability: float = 0.0) -> np.ndarray:
+        """Step up to frames times with random jumps until every run has died; returns scores"""
+        for _ in range(frames):
+            if self.game_over.all():
+                break
+            jump = self.rng.random(self.n) < jump_probability if jump_probability else None
+            self.step(jump)
+        return self.score
@@ -0,0 +1,324 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join("game_data", "benchmark.json")
+DEFAULT_ITERATIONS = 300
+# 预热要覆盖性能叠加层至少一次文字刷新（每 30 帧），一次性的缓存填充不计入测量
+WARMUP = 60
+DEFAULT_THRESHOLD = 0.10
+METRICS = ("mean_ms", "p50_ms", "p99_ms", "max_ms")
+
+Op = Callable[[], None]
+
+
+class Scenario:
+    """A named piece of game work, timed once per iteration.
+
+    ``setup(module, game, count)`` puts the game into the state to measure
+    (with ``count`` entities where that applies) and returns ``(op, prepare)``:
+    op is what gets timed; prepare, if not None, runs untimed before every
+    iteration to keep the state constant.
+    """
+
+    def __init__(self, name: str, setup, count: Optional[int], description: str):
+        self.name = name
+        self.setup = setup
+        self.count = count
+        self.description = description
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str, count: Optional[int], description: str):
+    def register(setup):
+        SCENARIOS[name] = Scenario(name, setup, count, description)
+        return setup
+    return register
+
+
+def place_entities(module, game, obstacles: int, stars: int, grounded: bool = True):
+    """Put a fixed set of obstacles and stars on screen, evenly spaced.
+
+    Returns a function that moves them back to their starting positions.
+    Obstacles that are not grounded fly above the screen, so the player
+    never hits them.
+    """
+    from src.lanes import Lane
+    rng = random.Random(0)
+    world = game.world
+    obstacle_list = [module.Obstacle(rng) for _ in range(obstacles)]
+    star_list = [module.Star(rng) for _ in range(stars)]
+
+    def reset():
+        for i, obs in enumerate(obstacle_list):
+            obs.x = obs.prev_x = 100 + i * (module.WIDTH - 100) / max(obstacles, 1)
+            if not grounded:
+                obs.y = obs.prev_y = -100
+        for i, star in enumerate(star_list):
+            star.x = star.prev_x = i * module.WIDTH / max(stars, 1)
+            star.y = star.prev_y = 10
+            star.collected = False
+        world.obstacles = Lane(obstacle_list)
+        world.stars = Lane(star_list)
+        world.game_over = False
+    reset()
+    return reset
+
+
+@scenario("update", 50, "Game.update with N obstacles and N/2 stars on screen")
+def _update(module, game, count):
+    game.state = module.PLAYING
+    game.reset_game()
+    return game.update, place_entities(module, game, count, count // 2, grounded=False)
+
+
+@scenario("draw", 50, "Game.draw of a PLAYING frame with N obstacles and N/2 stars")
+def _draw(module, game, count):
+    game.state = module.PLAYING
+    game.reset_game()
+    game.dirty_rects.enabled = False
+    game.profiler.enabled = False
+    place_entities(module, game, count, count // 2)
+    return game.draw, None
+
+
+@scenario("draw_overlay", 50, "the draw scenario with the frame profiler overlay shown")
+def _draw_overlay(module, game, count):
+    _draw(module, game, count)
+    game.profiler.enabled = True
+
+    def op():
+        game.draw()
+        game.profiler.end_frame()
+    return op, None
+
+
+@scenario("draw_menu", None, "Game.draw_menu onto the canvas")
+def _draw_menu(module, game, count):
+    game.state = module.MENU
+    return (lambda: game.draw_menu(game.frame.canvas)), None
+
+
+@scenario("draw_game_over", None, "Game.draw_game_over onto the canvas")
+def _draw_game_over(module, game, count):
+    game.state = module.GAME_OVER
+    return (lambda: game.draw_game_over(game.frame.canvas)), None
+
+
+@scenario("particles", 500, "update and draw exactly N live particles spread across the screen")
+def _particles(module, game, count):
+    import numpy as np
+    particles, canvas = game.particles, game.frame.canvas
+
+    def prepare():
+        particles.clear()
+        particles.rng = np.random.default_rng(0)
+        particles.emit(count, 0, module.HEIGHT // 2, (255, 255, 0), spread_x=module.WIDTH)
+
+    def op():
+        particles.update()
+        particles.draw(canvas)
+    return op, prepare
+
+
+@scenario("save_game_over", None, "Game.handle_game_over including the save file write")
+def _save_game_over(module, game, count):
+    if game.save_manager is None:
+        raise RuntimeError("save manager unavailable")
+    game.state = module.PLAYING
+    game.reset_game()
+    run = {"timestamp": time.time(), "seed": game.world.seed, "score": 0, "stars": 0,
+           "obstacles_avoided": 0, "max_speed": 4.0, "duration": 10.0, "cause": "spike"}
+
+    def op():
+        game.world.score += 10
+        game.handle_game_over(run)
+        game.save_manager.wait()
+    return op, None
+
+
+@scenario("achievements", 100, "AchievementManager.check_achievements with N achievements defined")
+def _achievements(module, game, count):
+    from src.achievements import AchievementManager
+    if game.save_manager is None:
+        raise RuntimeError("save manager unavailable")
+    stats = ("score", "stars_collected_in_game", "obstacles_avoided", "max_speed")
+    definitions = [{"id": f"bench_{i}", "name": f"Bench {i}", "description": "", "stat": stats[i % len(stats)],
+                    "comparison": ">=", "threshold": 10 ** 6 + i, "scope": "run"} for i in range(count)]
+    path = os.path.abspath("bench_achievements.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(definitions, f)
+    manager = AchievementManager(game.save_manager, path)
+    game_stats = dict(game.game_stats)
+
+    def op():
+        game_stats["score"] += 1
+        game_stats["obstacles_avoided"] += 1
+        manager.check_achievements(game_stats)
+    return op, None
+
+
+def measure(op: Op, prepare: Optional[Op], iterations: int, warmup: int = WARMUP) -> List[float]:
+    """Seconds taken by each of ``iterations`` calls of op, after ``warmup`` untimed calls"""
+    samples = []
+    for i in range(warmup + iterations):
+        if prepare is not None:
+            prepare()
+        start = time.perf_counter()
+        op()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """mean / p50 / p99 / max in milliseconds (nearest-rank percentiles)"""
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def percentile(p):
+        return ordered[min(n - 1, max(0, math.ceil(p / 100 * n) - 1))] * 1000
+    return {"mean_ms": sum(ordered) / n * 1000, "p50_ms": percentile(50), "p99_ms": percentile(99),
+            "max_ms": ordered[-1] * 1000, "iterations": n}
+
+
+def run(names: Sequence[str], iterations: int = DEFAULT_ITERATIONS, count: Optional[int] = None,
+        warmup: int = WARMUP) -> Dict[str, Dict[str, float]]:
+    """Run each scenario headless against its own fresh Game in a temporary directory.
+
+    A scenario never sees the game state another one left behind, so its
+    numbers do not depend on which scenarios ran with it; process-wide
+    caches (fonts, sprites) are filled during its warmup.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import enhanced_game as module
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            for name in names:
+                # 存档、回放和历史记录都写到各自的临时目录，不影响真实数据；配置使用默认值
+                directory = os.path.join(tmp, name)
+                os.makedirs(directory)
+                os.chdir(directory)
+                entry = SCENARIOS[name]
+                n = entry.count if count is None or entry.count is None else count
+                random.seed(0)
+                game = module.Game()
+                try:
+                    op, prepare = entry.setup(module, game, n)
+                    results[name] = {**summarize(measure(op, prepare, iterations, warmup)), "entities": n}
+                finally:
+                    if game.config_manager:
+                        game.config_manager.close()
+                    if game.save_manager:
+                        game.save_manager.close()
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float = DEFAULT_THRESHOLD, metric: str = "p50_ms") -> Dict[str, float]:
+    """Relative change of metric per scenario present in both; returns those slower than threshold"""
+    regressions = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get(metric):
+            continue
+        change = result[metric] / base[metric] - 1
+        if change > threshold:
+            regressions[name] = change
+    return regressions
+
+
+def format_table(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None,
+                 metric: str = "p50_ms") -> str:
+    header = f"{'scenario':<16}{'entities':>9}" + "".join(f"{m[:-3] + ' ms':>11}" for m in METRICS)
+    if baseline is not None:
+        header += f"{'vs base':>10}"
+    lines = [header]
+    for name, result in results.items():
+        entities = "-" if result["entities"] is None else str(result["entities"])
+        line = f"{name:<16}{entities:>9}" + "".join(f"{result[m]:>11.3f}" for m in METRICS)
+        if baseline is not None:
+            base = baseline.get(name)
+            line += f"{result[metric] / base[metric] - 1:>+10.1%}" if base and base.get(metric) else f"{'-':>10}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def write_results(path: str, results: Dict[str, Dict[str, float]], iterations: int):
+    import pygame
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    document = {"created": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                "pygame": pygame.version.ver, "platform": platform.platform(), "iterations": iterations,
+                "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=4)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark",
+                                     description="Headless benchmarks of the game's frame and I/O paths")
+    parser.add_argument("scenarios", nargs="*", help="scenarios to run (default: all)")
+    parser.add_argument("-n", "--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--entities", type=int, help="override the entity count of every scenario that has one")
+    parser.add_argument("-o", "--output", default=RESULTS_FILE, help="where to write the results JSON")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a scenario counts as a regression (0.1 = 10%%)")
+    parser.add_argument("--metric", choices=METRICS, default="p50_ms", help="statistic compared with the baseline")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    args = parser.parse_args(argv)
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+
+    if args.list:
+        for entry in SCENARIOS.values():
+            print(f"{entry.name:<16}{entry.description}")
+        return 0
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    output = os.path.abspath(args.output)
+    baseline = load_results(args.baseline) if args.baseline else None
+    results = run(args.scenarios or list(SCENARIOS), args.iterations, args.entities)
+    print(format_table(results, baseline, args.metric))
+    write_results(output, results, args.iterations)
+    print(f"results written to {output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.metric)
+        for name, change in regressions.items():
+            print(f"REGRESSION {name}: {args.metric} {change:+.1%} (threshold {args.threshold:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
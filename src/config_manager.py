@@ -1,33 +1,292 @@
-﻿import json
+﻿import copy
+import json
 import os
-from typing import Dict, Any
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from src.save_backends import write_json_atomic
+
+Color = Tuple[int, int, int]
+
+
+# 配置快照：各节是不可变的 slots 数据类，加载时校验一次，热路径直接读属性
+@dataclass(frozen=True)
+class GameConfig:
+    __slots__ = ('width', 'height', 'scale', 'fps', 'title', 'time_scale', 'max_steps_per_frame')
+    width: int
+    height: int
+    scale: int
+    fps: int
+    title: str
+    time_scale: float
+    max_steps_per_frame: int
+
+
+@dataclass(frozen=True)
+class PhysicsConfig:
+    __slots__ = ('gravity', 'jump_strength', 'initial_obstacle_speed', 'speed_increase_rate',
+                 'speed_increase_interval')
+    gravity: float
+    jump_strength: float
+    initial_obstacle_speed: float
+    speed_increase_rate: float
+    speed_increase_interval: int
+
+
+@dataclass(frozen=True)
+class GameplayConfig:
+    __slots__ = ('obstacle_spawn_rate', 'min_obstacle_spawn_rate', 'star_spawn_rate', 'cloud_spawn_rate',
+                 'star_spawn_chance', 'points_per_obstacle', 'points_per_star')
+    obstacle_spawn_rate: int
+    min_obstacle_spawn_rate: int
+    star_spawn_rate: int
+    cloud_spawn_rate: int
+    star_spawn_chance: float
+    points_per_obstacle: int
+    points_per_star: int
+
+
+@dataclass(frozen=True)
+class ColorsConfig:
+    __slots__ = ('sky', 'ground', 'player', 'obstacle', 'star', 'ui')
+    sky: Color
+    ground: Color
+    player: Color
+    obstacle: Color
+    star: Color
+    ui: Color
+
+
+@dataclass(frozen=True)
+class AudioConfig:
+    __slots__ = ('sound_enabled', 'music_enabled', 'master_volume', 'sfx_volume', 'music_volume')
+    sound_enabled: bool
+    music_enabled: bool
+    master_volume: float
+    sfx_volume: float
+    music_volume: float
+
+
+@dataclass(frozen=True)
+class ControlsConfig:
+    __slots__ = ('jump_key', 'pause_key', 'restart_key', 'menu_key')
+    jump_key: str
+    pause_key: str
+    restart_key: str
+    menu_key: str
+
+
+@dataclass(frozen=True)
+class GraphicsConfig:
+    __slots__ = ('sprite_cache', 'rotation_phases', 'dirty_rects', 'profiler_overlay')
+    sprite_cache: bool
+    rotation_phases: int
+    dirty_rects: bool
+    profiler_overlay: bool
+
+
+@dataclass(frozen=True)
+class SaveConfig:
+    __slots__ = ('backend', 'profile')
+    backend: str
+    profile: str
+
+
+@dataclass(frozen=True)
+class Config:
+    __slots__ = ('game', 'physics', 'gameplay', 'colors', 'audio', 'controls', 'graphics', 'save')
+    game: GameConfig
+    physics: PhysicsConfig
+    gameplay: GameplayConfig
+    colors: ColorsConfig
+    audio: AudioConfig
+    controls: ControlsConfig
+    graphics: GraphicsConfig
+    save: SaveConfig
+
+
+SECTIONS = {f.name: f.type for f in fields(Config)}
+
+# 取值范围（闭区间，None 表示不限）和可选值
+LIMITS = {
+    'game.width': (1, None),
+    'game.height': (1, None),
+    'game.scale': (1, 16),
+    'game.fps': (1, 1000),
+    'game.time_scale': (0.01, 100),
+    'game.max_steps_per_frame': (1, None),
+    'physics.gravity': (0.01, 10),
+    'physics.jump_strength': (-100, -0.01),
+    'physics.initial_obstacle_speed': (0.1, 100),
+    'physics.speed_increase_rate': (0, 100),
+    'physics.speed_increase_interval': (1, None),
+    'gameplay.obstacle_spawn_rate': (1, None),
+    'gameplay.min_obstacle_spawn_rate': (1, None),
+    'gameplay.star_spawn_rate': (1, None),
+    'gameplay.cloud_spawn_rate': (1, None),
+    'gameplay.star_spawn_chance': (0, 1),
+    'gameplay.points_per_obstacle': (0, None),
+    'gameplay.points_per_star': (0, None),
+    'audio.master_volume': (0, 1),
+    'audio.sfx_volume': (0, 1),
+    'audio.music_volume': (0, 1),
+    'graphics.rotation_phases': (1, 360),
+}
+CHOICES = {
+    'save.backend': ('json', 'sqlite'),
+}
+TYPE_NAMES = {bool: 'a boolean', int: 'an integer', float: 'a number', str: 'a non-empty string',
+              Color: 'an [r, g, b] color'}
+
+
+def check_value(key: str, kind, value):
+    """Validate one value against its schema type and limits; returns it in its typed form"""
+    if kind is bool:
+        ok = isinstance(value, bool)
+    elif kind is int:
+        ok = isinstance(value, int) and not isinstance(value, bool)
+    elif kind is float:
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+        value = float(value) if ok else value
+    elif kind is str:
+        ok = isinstance(value, str) and value != ''
+    else:
+        ok = (isinstance(value, (list, tuple)) and len(value) == 3 and
+              all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in value))
+        value = tuple(value) if ok else value
+    if not ok:
+        raise ValueError(f"{key}: expected {TYPE_NAMES[kind]}, got {value!r}")
+    low, high = LIMITS.get(key, (None, None))
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise ValueError(f"{key}: {value!r} is outside [{low}, {high}]")
+    if key in CHOICES and value not in CHOICES[key]:
+        raise ValueError(f"{key}: expected one of {', '.join(CHOICES[key])}, got {value!r}")
+    return value
+
+
+def changed_sections(old: Config, new: Config) -> Set[str]:
+    """Names of the sections that differ between two snapshots"""
+    return {name for name in SECTIONS if getattr(old, name) != getattr(new, name)}
+
+
+class ConfigError(ValueError):
+    """An edit would leave the configuration invalid"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+class ConfigWatcher:
+    """Polls the config file's mtime and size on a background thread.
+
+    A change is re-read and validated on the watcher thread and the result
+    is published to a single slot; take() hands it to the game thread. A
+    file that fails to parse or adds invalid values publishes nothing, so
+    the running game keeps its snapshot until the next save.
+    """
+
+    def __init__(self, manager: "ConfigManager", interval: float = 0.5):
+        self.manager = manager
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._published = None
+        self._stopped = threading.Event()
+        self._signature = self._stat()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.manager.config_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check(self) -> bool:
+        """Reload the file if it changed; returns whether a new snapshot was published"""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            with open(self.manager.config_file, 'r', encoding='utf-8-sig') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Failed to reload config: {e}")
+            return False
+        snapshot, errors = self.manager.validate(config)
+        new_errors = [error for error in errors if error not in self.manager.errors]
+        if new_errors:
+            print(f"Config not reloaded: {'; '.join(new_errors)}")
+            return False
+        with self._lock:
+            self._published = (config, snapshot, errors)
+        return True
+
+    def take(self):
+        """The latest published (config, snapshot, errors), or None"""
+        with self._lock:
+            published, self._published = self._published, None
+        return published
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Config watcher error: {e}")
+
 
 class ConfigManager:
+    """The JSON config file plus a validated, immutable snapshot of it.
+
+    ``config`` is the raw nested dict (get()/set() use dotted keys);
+    ``snapshot`` is a Config of frozen dataclasses, rebuilt only when the
+    config changes, so per-frame code reads ``snapshot.physics.gravity``
+    instead of walking dicts. Invalid values in the file fall back to their
+    defaults with a warning. watch() reloads the file when it changes;
+    poll() swaps the new snapshot in at a frame boundary.
+    """
+
     def __init__(self, config_file: str = "config/game_config.json"):
         self.config_file = config_file
+        self._edit_depth = 0
+        self.watcher: Optional[ConfigWatcher] = None
+        self._unreported: Optional[Config] = None  # edit() 提前换入重新加载的快照时，poll() 还没报告的旧快照
         self.config = self.load_config()
-    
+        self.snapshot, self.errors = self.validate()
+        if self.errors:
+            print(f"Invalid config values, using defaults: {'; '.join(self.errors)}")
+
     def load_config(self) -> Dict[str, Any]:
         """Load configuration file"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
+                with open(self.config_file, 'r', encoding='utf-8-sig') as f:
                     return json.load(f)
             else:
                 return self.get_default_config()
         except Exception as e:
             print(f"Failed to load config: {e}")
             return self.get_default_config()
-    
+
     def save_config(self):
-        """Save configuration file"""
+        """Save configuration file (atomically, so the watcher never reads half a file)"""
         try:
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            directory = os.path.dirname(self.config_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            write_json_atomic(self.config_file, self.config)
         except Exception as e:
             print(f"Failed to save config: {e}")
-    
+
     def get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
         return {
@@ -36,7 +295,9 @@ class ConfigManager:
                 "height": 270,
                 "scale": 2,
                 "fps": 60,
-                "title": "Pixel Runner Game"
+                "title": "Pixel Runner Game",
+                "time_scale": 1.0,
+                "max_steps_per_frame": 240
             },
             "physics": {
                 "gravity": 0.5,
@@ -44,9 +305,110 @@ class ConfigManager:
                 "initial_obstacle_speed": 4,
                 "speed_increase_rate": 0.2,
                 "speed_increase_interval": 600
+            },
+            "gameplay": {
+                "obstacle_spawn_rate": 1500,
+                "min_obstacle_spawn_rate": 800,
+                "star_spawn_rate": 180,
+                "cloud_spawn_rate": 120,
+                "star_spawn_chance": 0.7,
+                "points_per_obstacle": 10,
+                "points_per_star": 50
+            },
+            "colors": {
+                "sky": [135, 206, 235],
+                "ground": [46, 125, 50],
+                "player": [33, 150, 243],
+                "obstacle": [244, 67, 54],
+                "star": [255, 255, 0],
+                "ui": [76, 175, 80]
+            },
+            "audio": {
+                "sound_enabled": True,
+                "music_enabled": True,
+                "master_volume": 0.7,
+                "sfx_volume": 0.8,
+                "music_volume": 0.5
+            },
+            "controls": {
+                "jump_key": "space",
+                "pause_key": "p",
+                "restart_key": "r",
+                "menu_key": "escape"
+            },
+            "graphics": {
+                "sprite_cache": True,
+                "rotation_phases": 32,
+                "dirty_rects": False,
+                "profiler_overlay": False
+            },
+            "save": {
+                "backend": "json",
+                "profile": "default"
             }
         }
-    
+
+    def validate(self, config: Optional[Dict[str, Any]] = None) -> Tuple[Config, List[str]]:
+        """Check a config dict (default: the current one) against the schema and freeze it into a Config.
+
+        Returns the snapshot and a list of errors; missing values take their
+        default silently, invalid ones take it and add an error.
+        """
+        if config is None:
+            config = self.config
+        defaults = self.get_default_config()
+        errors = []
+        sections = {}
+        for name, section_cls in SECTIONS.items():
+            raw = config.get(name)
+            if not isinstance(raw, dict):
+                if raw is not None:
+                    errors.append(f"{name}: expected an object, got {raw!r}")
+                raw = {}
+            values = {}
+            for field in fields(section_cls):
+                key = f"{name}.{field.name}"
+                default = defaults[name][field.name]
+                try:
+                    values[field.name] = check_value(key, field.type, raw.get(field.name, default))
+                except ValueError as e:
+                    errors.append(str(e))
+                    values[field.name] = check_value(key, field.type, default)
+            sections[name] = section_cls(**values)
+        return Config(**sections), errors
+
+    def watch(self, interval: float = 0.5) -> ConfigWatcher:
+        """Start polling the config file for changes (see poll())"""
+        if self.watcher is None:
+            self.watcher = ConfigWatcher(self, interval)
+        return self.watcher
+
+    def poll(self) -> Optional[Tuple[Config, Config]]:
+        """Swap in a snapshot reloaded by the watcher; returns (old, new), or None if nothing changed.
+
+        Call this between frames so a frame never sees two snapshots.
+        Reloads wait while an edit() is open.
+        """
+        if self.watcher is None or self._edit_depth:
+            return None
+        old = self.snapshot if self._unreported is None else self._unreported
+        self._unreported = None
+        self._take_published()
+        # 自己保存文件也会触发重新加载，内容相同时不算变化
+        return None if self.snapshot == old else (old, self.snapshot)
+
+    def _take_published(self):
+        """Swap in the snapshot the watcher last published, if any"""
+        published = self.watcher.take() if self.watcher is not None else None
+        if published is not None:
+            self.config, self.snapshot, self.errors = published
+
+    def close(self):
+        """Stop watching the config file"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
     def get(self, key: str, default=None):
         """Get configuration value"""
         keys = key.split('.')
@@ -57,14 +419,50 @@ class ConfigManager:
             return value
         except (KeyError, TypeError):
             return default
-    
+
+    @contextmanager
+    def edit(self):
+        """Group several set() calls: validated together and written once at the end.
+
+        If the block raises, or leaves a value invalid that was valid before,
+        every edit in it is rolled back (the latter raises ConfigError). A
+        reload the watcher has published but poll() has not swapped in yet
+        is taken first, so saving never overwrites an external edit; the
+        next poll() still reports it.
+        """
+        outermost = self._edit_depth == 0
+        if outermost:
+            if self._unreported is None:
+                self._unreported = self.snapshot
+            self._take_published()
+            if self._unreported == self.snapshot:
+                self._unreported = None
+            backup = copy.deepcopy(self.config)
+        self._edit_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if outermost:
+                self.config = backup
+            raise
+        finally:
+            self._edit_depth -= 1
+        if outermost:
+            snapshot, errors = self.validate()
+            new_errors = [error for error in errors if error not in self.errors]
+            if new_errors:
+                self.config = backup
+                raise ConfigError(new_errors)
+            self.snapshot, self.errors = snapshot, errors
+            self.save_config()
+
     def set(self, key: str, value):
-        """Set configuration value"""
-        keys = key.split('.')
-        config = self.config
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
-        config[keys[-1]] = value
-        self.save_config()
+        """Set configuration value (written immediately unless inside edit())"""
+        with self.edit():
+            keys = key.split('.')
+            config = self.config
+            for k in keys[:-1]:
+                if k not in config:
+                    config[k] = {}
+                config = config[k]
+            config[keys[-1]] = value
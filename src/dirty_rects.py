@@ -0,0 +1,76 @@
+import pygame
+from typing import List, Optional
+
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Union overlapping rects so no pixel is scaled or presented twice"""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectTracker:
+    """Tracks which canvas regions changed between two frames.
+
+    Every frame the renderer restores last frame's regions from the
+    background, redraws everything, records the regions it drew with add(),
+    and presents only the union of last and current regions. Regions that
+    changed without moving (e.g. a recomposed HUD) are recorded with mark().
+    """
+
+    def __init__(self, bounds, enabled: bool = False, max_rects: int = 64):
+        self.bounds = pygame.Rect(bounds)
+        self.enabled = enabled
+        self.max_rects = max_rects
+        self.previous: List[pygame.Rect] = []
+        self.current: List[pygame.Rect] = []
+        self.marked: List[pygame.Rect] = []
+        self.full = True
+
+    def invalidate(self):
+        """Make the next frame a full redraw and full present"""
+        self.full = True
+
+    def add(self, rect):
+        """Record a region drawn this frame; it is restored next frame"""
+        rect = pygame.Rect(rect).clip(self.bounds)
+        if rect.w and rect.h:
+            self.current.append(rect)
+
+    def mark(self, rect):
+        """Record a region that changed in place this frame"""
+        rect = pygame.Rect(rect).clip(self.bounds)
+        if rect.w and rect.h:
+            self.marked.append(rect)
+
+    def restore(self, canvas: pygame.Surface, background: pygame.Surface):
+        """Erase last frame's regions with the background (or all of it after invalidate)"""
+        if self.full:
+            canvas.blit(background, (0, 0))
+        else:
+            for rect in self.previous:
+                canvas.blit(background, rect, rect)
+
+    def end_frame(self) -> Optional[List[pygame.Rect]]:
+        """Return the rects to present, or None when the whole frame must be presented"""
+        if self.full:
+            rects = None
+        else:
+            rects = merge_rects(self.previous + self.current + self.marked)
+            if len(rects) > self.max_rects:
+                rects = [rects[0].unionall(rects[1:])]
+        self.previous = self.current
+        self.current = []
+        self.marked = []
+        self.full = False
+        return rects
+
@@ -0,0 +1,45 @@
+from typing import Dict, Tuple
+
+import pygame
+
+from src.text_render import CachedFont
+
+# pygame 的各个子系统在第一次使用时才初始化，导入游戏模块不会打开窗口或音频设备
+_fonts: Dict[int, CachedFont] = {}
+
+
+def open_window(size: Tuple[int, int], caption: str) -> pygame.Surface:
+    """The game window; the display subsystem is initialised and the window opened on first call"""
+    window = pygame.display.get_surface()
+    if window is None:
+        pygame.display.init()
+        window = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+    return window
+
+
+def font(size: int) -> CachedFont:
+    """The default font at a size, loaded (along with the font subsystem) on first use"""
+    cached = _fonts.get(size)
+    if cached is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        cached = _fonts[size] = CachedFont(pygame.font.Font(None, size))
+    return cached
+
+
+def mixer() -> bool:
+    """Initialise audio on first use; returns False if there is no audio device"""
+    if pygame.mixer.get_init() is None:
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"音频不可用: {e}")
+            return False
+    return True
+
+
+def shutdown():
+    """Shut pygame down; fonts are loaded again if the display is reopened"""
+    _fonts.clear()
+    pygame.quit()
@@ -0,0 +1,73 @@
+import pygame
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class FrameBuffers:
+    """Display-format surfaces owned by the render pipeline and reused every frame.
+
+    The canvas is drawn at native resolution and scaled with the
+    destination-surface form of pygame.transform.scale, so a frame allocates
+    no pixel memory. Translucent panels (overlays, toast backgrounds) are
+    created once per name and handed out again on every later call.
+    """
+
+    def __init__(self, size: Tuple[int, int], scale: int):
+        self.size = tuple(size)
+        self.scale = scale
+        self.scaled_size = (self.size[0] * scale, self.size[1] * scale)
+        self.canvas = self._display_format(pygame.Surface(self.size))
+        self.scaled = self._display_format(pygame.Surface(self.scaled_size))
+        self.panels: Dict[str, pygame.Surface] = {}
+
+    @staticmethod
+    def _display_format(surface: pygame.Surface) -> pygame.Surface:
+        if pygame.display.get_surface() is not None:
+            return surface.convert()
+        return surface
+
+    def panel(self, name: str, size: Tuple[int, int], color: Sequence[int], alpha: int) -> pygame.Surface:
+        """A solid surface with surface-level alpha, allocated on first request only"""
+        surface = self.panels.get(name)
+        if surface is None or surface.get_size() != tuple(size):
+            surface = self._display_format(pygame.Surface(size))
+            surface.fill(color)
+            surface.set_alpha(alpha)
+            self.panels[name] = surface
+        return surface
+
+    def present(self, window: pygame.Surface, rects: Optional[List[pygame.Rect]] = None,
+                offset: Tuple[int, int] = (0, 0)):
+        """Scale the canvas onto the window and update the display"""
+        self.update_display(self.scale_to(window, rects, offset))
+
+    def scale_to(self, window: pygame.Surface, rects: Optional[List[pygame.Rect]] = None,
+                 offset: Tuple[int, int] = (0, 0)) -> Optional[List[pygame.Rect]]:
+        """Scale the canvas onto the window; returns the window rects to update (None for all).
+
+        With an offset (screen shake) the canvas goes through the scaled
+        buffer; otherwise it is scaled straight into the window, either whole
+        or only the given canvas rects.
+        """
+        if offset != (0, 0):
+            pygame.transform.scale(self.canvas, self.scaled_size, self.scaled)
+            window.fill((0, 0, 0))
+            window.blit(self.scaled, offset)
+            return None
+        if rects is None:
+            pygame.transform.scale(self.canvas, self.scaled_size, window)
+            return None
+        scale = self.scale
+        updated = []
+        for rect in rects:
+            target = pygame.Rect(rect.x * scale, rect.y * scale, rect.w * scale, rect.h * scale)
+            pygame.transform.scale(self.canvas.subsurface(rect), target.size, window.subsurface(target))
+            updated.append(target)
+        return updated
+
+    @staticmethod
+    def update_display(updated: Optional[List[pygame.Rect]]):
+        """Present the whole window (None) or only the given window rects"""
+        if updated is None:
+            pygame.display.update()
+        elif updated:
+            pygame.display.update(updated)
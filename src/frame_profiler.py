@@ -0,0 +1,222 @@
+import math
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+# 一帧按顺序经过的阶段；wait 是 clock.tick 等待的时间
+PHASES = ('events', 'update', 'background', 'entities', 'hud', 'overlay', 'scale', 'present', 'wait')
+PHASE_LABELS = {'events': 'evt', 'update': 'upd', 'background': 'bg', 'entities': 'ent', 'hud': 'hud',
+                'overlay': 'ovl', 'scale': 'scl', 'present': 'prs', 'wait': 'wait'}
+PHASE_COLORS = {'events': (255, 193, 7), 'update': (76, 175, 80), 'background': (121, 134, 203),
+                'entities': (33, 150, 243), 'hud': (0, 188, 212), 'overlay': (233, 30, 99),
+                'scale': (255, 87, 34), 'present': (244, 67, 54), 'wait': (70, 70, 70)}
+PERCENTILES = (50, 95, 99)
+NUMBER_CHARS = '0123456789.'
+
+
+class FrameProfiler:
+    """Per-phase wall time of the last ``capacity`` frames in a ring buffer.
+
+    lap(phase) charges the time since the previous lap to that phase, so
+    the main loop only marks where each phase ends; end_frame() stores the
+    frame as one row. While disabled both return immediately. Enabling
+    starts a new session with an empty buffer, so percentiles never mix
+    frames from before the profiler was last switched off.
+    """
+
+    def __init__(self, phases: Sequence[str] = PHASES, capacity: int = 300):
+        self.phases = tuple(phases)
+        self.columns = {name: i for i, name in enumerate(self.phases)}
+        self.capacity = capacity
+        self.samples = np.zeros((capacity, len(self.phases)))
+        self.head = 0       # 下一帧写入的行
+        self.count = 0      # 缓冲区中的有效行数
+        self.frames = 0     # 开始记录以来的总帧数
+        self.session = 0    # 每次开启加一，叠加层据此清空图表
+        self.current = [0.0] * len(self.phases)
+        self._last = 0.0
+        self._enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        if value and not self._enabled:
+            # 新的一段记录：清空缓冲区，从现在开始计时，开启之前的半帧不计入
+            self.samples.fill(0.0)
+            self.head = 0
+            self.count = 0
+            self.session += 1
+            self.current = [0.0] * len(self.phases)
+            self._last = time.perf_counter()
+        self._enabled = bool(value)
+
+    def lap(self, phase: str):
+        if not self._enabled:
+            return
+        now = time.perf_counter()
+        self.current[self.columns[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        if not self._enabled:
+            return
+        self.samples[self.head] = self.current
+        self.current = [0.0] * len(self.phases)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames += 1
+
+    def last(self) -> Optional[List[float]]:
+        """Phase times (seconds) of the most recent frame"""
+        return self.samples[self.head - 1].tolist() if self.count else None
+
+    def history(self) -> np.ndarray:
+        """Buffered rows, oldest first (seconds)"""
+        if self.count < self.capacity:
+            return self.samples[:self.count]
+        return np.roll(self.samples, -self.head, axis=0)
+
+    def rank(self, q: float) -> int:
+        """Row of a sorted buffer holding the q-th percentile (nearest rank, as in src.benchmark)"""
+        return min(self.count - 1, max(0, math.ceil(q / 100 * self.count) - 1))
+
+    # 用排序取最近秩而不是 np.percentile：后者第一次调用要花十几毫秒初始化，开启叠加层的那一帧会卡顿
+    def frame_percentiles(self, q: Sequence[float] = PERCENTILES) -> List[float]:
+        """Percentiles of whole-frame time in milliseconds"""
+        if not self.count:
+            return [0.0] * len(q)
+        totals = np.sort(self.samples[:self.count].sum(axis=1))
+        return [float(totals[self.rank(p)]) * 1000 for p in q]
+
+    def phase_percentiles(self, q: float = 95) -> List[float]:
+        """One percentile of every phase's time in milliseconds, in phase order"""
+        if not self.count:
+            return [0.0] * len(self.phases)
+        return (np.sort(self.samples[:self.count], axis=0)[self.rank(q)] * 1000).tolist()
+
+    def mean_frame_ms(self) -> float:
+        if not self.count:
+            return 0.0
+        return float(self.samples[:self.count].sum(axis=1).mean() * 1000)
+
+
+class ProfilerOverlay:
+    """Frame time, FPS, percentiles and a rolling stacked graph of phase times.
+
+    The graph is a pre-allocated surface that scrolls one pixel per frame,
+    so only the newest column is drawn; the text panel is re-composed every
+    ``text_interval`` frames. Fixed labels and every digit in every text
+    color are rendered when the overlay is built, so refreshing the text
+    only blits and the first frame after switching it on costs no more
+    than the others. A visible overlay costs two blits, a scroll and a few
+    one-pixel-wide fills per frame.
+    """
+
+    PADDING = 3
+    BACKGROUND = (20, 20, 20)
+    TEXT_COLOR = (255, 255, 255)
+    DETAIL_COLOR = (200, 200, 200)
+    GRAPH_BACKGROUND = (0, 0, 0)
+    BUDGET_COLOR = (255, 255, 255)
+    GRAPH_MS = 1000 / 30        # 图表高度对应的帧时间
+    BUDGET_MS = 1000 / 60
+
+    def __init__(self, profiler: FrameProfiler, font, graph_size: Tuple[int, int] = (140, 32),
+                 text_interval: int = 30):
+        self.profiler = profiler
+        self.font = font
+        self.text_interval = text_interval
+        self.line = font.get_linesize()
+        legend_rows = -(-len(profiler.phases) // 3)
+        self.graph_pos = (self.PADDING, self.PADDING + self.line * (2 + legend_rows) + 2)
+        self.size = (graph_size[0] + 2 * self.PADDING, self.graph_pos[1] + graph_size[1] + self.PADDING)
+        self.panel = pygame.Surface(self.size)
+        self.graph = pygame.Surface(graph_size)
+        self.graph.fill(self.GRAPH_BACKGROUND)
+        self.colors = [PHASE_COLORS.get(name, (200, 200, 200)) for name in profiler.phases]
+        self.drawn_frame = profiler.frames
+        self.session = profiler.session
+        self.text_frame = None
+
+        # 每种文字颜色的数字字符；字距用两个相同字符的宽度差近似
+        self.digits = {color: {ch: font.render(ch, True, color) for ch in NUMBER_CHARS}
+                       for color in {self.TEXT_COLOR, self.DETAIL_COLOR, *self.colors}}
+        self.advance = {ch: font.size(ch * 2)[0] - font.size(ch)[0] for ch in NUMBER_CHARS}
+        pad, line = self.PADDING, self.line
+        self.lines = [self.text_line((pad, pad), self.TEXT_COLOR, "{:.0f}", " FPS  ", "{:.1f}", " ms"),
+                      self.text_line((pad, pad + line), self.DETAIL_COLOR,
+                                     "p50 ", "{:.1f}", " p95 ", "{:.1f}", " p99 ", "{:.1f}")]
+        # 各阶段的 p95（毫秒），颜色与图表一致
+        column_width = (self.size[0] - 2 * pad) // 3
+        for i, name in enumerate(profiler.phases):
+            pos = (pad + i % 3 * column_width, pad + line * (2 + i // 3))
+            self.lines.append(self.text_line(pos, self.colors[i], PHASE_LABELS.get(name, name) + " ", "{:.1f}"))
+
+    def text_line(self, pos: Tuple[int, int], color, *parts: str):
+        """A line of fixed text and number formats ('{...}'); the fixed parts are rendered here, once"""
+        return pos, color, [part if part.startswith("{") else self.font.render(part, True, color) for part in parts]
+
+    def bounds(self, pos: Tuple[int, int]) -> pygame.Rect:
+        return pygame.Rect(pos, self.size)
+
+    def draw(self, surface: pygame.Surface, pos: Tuple[int, int]):
+        profiler = self.profiler
+        if profiler.session != self.session:
+            # 重新开启后从空白图表开始
+            self.session = profiler.session
+            self.graph.fill(self.GRAPH_BACKGROUND)
+            self.text_frame = None
+        if profiler.frames != self.drawn_frame:
+            self.push_column(profiler.last())
+            self.drawn_frame = profiler.frames
+        if self.text_frame is None or profiler.frames - self.text_frame >= self.text_interval:
+            self.compose_text()
+            self.text_frame = profiler.frames
+        surface.blit(self.panel, pos)
+        surface.blit(self.graph, (pos[0] + self.graph_pos[0], pos[1] + self.graph_pos[1]))
+
+    def push_column(self, row: Sequence[float]):
+        """Scroll the graph left by one pixel and draw one frame's stacked phase times"""
+        graph = self.graph
+        width, height = graph.get_size()
+        x = width - 1
+        graph.scroll(-1, 0)
+        graph.fill(self.GRAPH_BACKGROUND, (x, 0, 1, height))
+        scale = height / self.GRAPH_MS
+        bottom = height
+        total = 0.0
+        for color, seconds in zip(self.colors, row):
+            total += seconds * 1000
+            top = height - min(height, int(total * scale + 0.5))
+            if top < bottom:
+                graph.fill(color, (x, top, 1, bottom - top))
+                bottom = top
+        graph.set_at((x, height - int(self.BUDGET_MS * scale + 0.5)), self.BUDGET_COLOR)
+
+    def compose_text(self):
+        profiler = self.profiler
+        mean = profiler.mean_frame_ms()
+        fps = 1000 / mean if mean else 0
+        values = iter([fps, mean, *profiler.frame_percentiles(), *profiler.phase_percentiles(95)])
+        panel = self.panel
+        panel.fill(self.BACKGROUND)
+        for (x, y), color, parts in self.lines:
+            for part in parts:
+                if isinstance(part, str):
+                    x = self.blit_number(panel, part.format(next(values)), color, x, y)
+                else:
+                    panel.blit(part, (x, y))
+                    x += part.get_width()
+
+    def blit_number(self, surface: pygame.Surface, text: str, color, x: int, y: int) -> int:
+        """Draw a formatted number from the pre-rendered digits; returns the x after it"""
+        digits = self.digits[color]
+        for ch in text:
+            surface.blit(digits[ch], (x, y))
+            x += self.advance[ch]
+        return x
@@ -0,0 +1,66 @@
+from typing import Sequence
+
+# 可选的时间倍率（慢动作到快进）
+TIME_SCALES = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+
+class FixedTimestep:
+    """Accumulator that turns wall-clock frame time into fixed simulation steps.
+
+    The simulation always advances in steps of 1 / rate seconds; each
+    rendered frame runs however many steps the scaled elapsed time covers.
+    At most max_steps run per frame, and time that could not be simulated
+    within the cap is dropped instead of piling up (no spiral of death).
+    """
+
+    def __init__(self, rate: int = 60, time_scale: float = 1.0, max_steps: int = 240,
+                 scales: Sequence[float] = TIME_SCALES):
+        self.dt = 1.0 / rate
+        self.scales = tuple(scales)
+        self.time_scale = time_scale
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0
+
+    @property
+    def time_scale(self) -> float:
+        return self._time_scale
+
+    @time_scale.setter
+    def time_scale(self, value: float):
+        self._time_scale = min(max(float(value), self.scales[0]), self.scales[-1])
+
+    def advance(self, elapsed: float) -> int:
+        """Add elapsed real seconds and return how many steps to run this frame"""
+        self.accumulator += elapsed * self._time_scale
+        steps = int(self.accumulator / self.dt + 1e-9)  # 容忍浮点累加误差
+        if steps > self.max_steps:
+            # 跟不上时丢弃积压的时间，只保留不足一步的余量
+            self.dropped += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+            self.accumulator %= self.dt
+        else:
+            self.accumulator = max(0.0, self.accumulator - steps * self.dt)
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step left in the accumulator (for render interpolation)"""
+        return self.accumulator / self.dt
+
+    def faster(self) -> float:
+        """Switch to the next larger time scale"""
+        larger = [s for s in self.scales if s > self._time_scale]
+        if larger:
+            self._time_scale = larger[0]
+        return self._time_scale
+
+    def slower(self) -> float:
+        """Switch to the next smaller time scale"""
+        smaller = [s for s in self.scales if s < self._time_scale]
+        if smaller:
+            self._time_scale = smaller[-1]
+        return self._time_scale
+
+    def reset(self):
+        self.accumulator = 0.0
@@ -2,20 +2,25 @@
 import random
 import sys
 import math
+from types import SimpleNamespace
 
-# 初始化 Pygame
-pygame.init()
-pygame.mixer.init()
+from src import display
+from src.dirty_rects import DirtyRectTracker
+from src.frame_buffers import FrameBuffers
+from src.frame_profiler import FrameProfiler, ProfilerOverlay
+from src.game_loop import FixedTimestep
+from src.particles import ParticleSystem
+from src.render_cache import SPRITE_PADDING, BackgroundLayer, HudLayer, SpriteCache
+from src.replay import ReplayRecorder
+from src.run_history import RunHistory
+from src import simulation
+from src.simulation import World
+from src.startup import STARTUP
 
 # 屏幕大小（像素风比例）
-WIDTH, HEIGHT = 480, 270
+WIDTH, HEIGHT = simulation.WIDTH, simulation.HEIGHT
 SCALE = 2  # 放大倍数
-WIN = pygame.display.set_mode((WIDTH * SCALE, HEIGHT * SCALE))
-pygame.display.set_caption("Pixel Runner Game")
-
-# 英文字体
-PIXEL_FONT = pygame.font.Font(None, 24)
-BIG_PIXEL_FONT = pygame.font.Font(None, 48)
+CAPTION = "Pixel Runner Game"
 
 # 颜色主题
 WHITE = (255, 255, 255)
@@ -33,116 +38,78 @@ DEATH_OVERLAY = (0, 0, 0, 128)
 BUTTON_COLOR = (76, 175, 80)
 BUTTON_HOVER = (104, 159, 56)
 
-# 游戏参数
-FPS = 60
-GRAVITY = 0.5
-JUMP_STRENGTH = -10
-OBSTACLE_SPEED = 4
-SPAWN_OBSTACLE_EVENT = pygame.USEREVENT + 1
+# 游戏参数（物理和生成规则在 src/simulation.py）
+FPS = simulation.FPS
+
+# 旋转精灵缓存：星星、锯齿、水晶按量化角度预渲染，F2 切换回矢量绘制
+SPRITE_CACHE = SpriteCache(phases=32)
+ROTATING_OBSTACLES = ('saw', 'crystal')
+
+# 粒子池容量（超出时淘汰最早的粒子）
+MAX_PARTICLES = 1024
 
 # 游戏状态
 MENU = 0
 PLAYING = 1
 GAME_OVER = 2
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.vel_x = random.uniform(-3, 3)
-        self.vel_y = random.uniform(-5, -1)
-        self.color = color
-        self.life = 30
-        self.max_life = 30
-        
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.vel_y += 0.2
-        self.life -= 1
-        
+class Cloud(simulation.Cloud):
     def draw(self, surface):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.max_life))
-            color = (*self.color[:3], alpha)
-            pygame.draw.circle(surface, self.color[:3], (int(self.x), int(self.y)), 2)
+        if SPRITE_CACHE.enabled:
+            surface.blit(*self.sprite())
+        else:
+            self.draw_vector(surface)
 
-class Cloud:
-    def __init__(self):
-        self.x = WIDTH + random.randint(0, 100)
-        self.y = random.randint(20, 80)
-        self.speed = random.uniform(0.5, 1.5)
-        self.size = random.randint(15, 25)
-        
-    def update(self):
-        self.x -= self.speed
-        
-    def draw(self, surface):
+    def sprite(self):
+        """返回 (预渲染的云朵, 绘制位置)"""
+        reach = self.size + 10
+        return SPRITE_CACHE.static(('cloud', self.size), (int(self.x) - reach, int(self.y) - self.size),
+                                   (reach * 2, self.size * 2 + 8), self.render_frame)
+
+    def render_frame(self, target, x, y, angle):
+        """以矢量方式绘制一朵云，左上角位于 (x, y)（用于生成精灵缓存）"""
+        proxy = SimpleNamespace(x=x + self.size + 10, y=y + self.size, size=self.size)
+        Cloud.draw_vector(proxy, target)
+
+    def draw_vector(self, surface):
         pygame.draw.circle(surface, CLOUD_COLOR[:3], (int(self.x), int(self.y)), self.size)
         pygame.draw.circle(surface, CLOUD_COLOR[:3], (int(self.x + 10), int(self.y + 5)), self.size - 5)
         pygame.draw.circle(surface, CLOUD_COLOR[:3], (int(self.x - 10), int(self.y + 3)), self.size - 3)
         
-    def off_screen(self):
-        return self.x + self.size < 0
+    def bounds(self):
+        return pygame.Rect(int(self.x) - self.size - 9, int(self.y) - self.size - 1,
+                           self.size * 2 + 21, self.size * 2 + 4)
 
-class Player:
+class Player(simulation.Player):
     def __init__(self):
-        self.width = 16
-        self.height = 16
-        self.x = 50
-        self.ground_y = HEIGHT - self.height - 20
-        self.y = self.ground_y
-        self.vel_y = 0
-        self.on_ground = True
-        self.animation_frame = 0
-        self.jump_particles = []
-        self.trail_particles = []
+        super().__init__()
+        self.jump_particles = ParticleSystem(capacity=64)
+        self.trail_particles = ParticleSystem(capacity=64)
 
     def jump(self):
-        if self.on_ground:
-            self.vel_y = JUMP_STRENGTH
-            self.on_ground = False
+        jumped = super().jump()
+        if jumped:
             # 添加跳跃粒子效果
-            for i in range(8):
-                self.jump_particles.append(
-                    Particle(self.x + self.width//2, self.y + self.height, PLAYER_COLOR)
-                )
+            self.jump_particles.emit(8, self.x + self.width//2, self.y + self.height, PLAYER_COLOR)
+        return jumped
 
     def update(self):
-        self.vel_y += GRAVITY
-        self.y += self.vel_y
-
-        # 碰到地面
-        if self.y >= self.ground_y:
-            self.y = self.ground_y
-            self.vel_y = 0
-            self.on_ground = True
-
-        # 更新动画
-        self.animation_frame += 0.2
+        super().update()
         
         # 添加尾迹粒子（跑步时）
         if self.on_ground and random.random() < 0.3:
-            self.trail_particles.append(
-                Particle(self.x + random.randint(0, self.width), 
-                        self.y + self.height, 
-                        (PLAYER_COLOR[0], PLAYER_COLOR[1], PLAYER_COLOR[2], 100))
-            )
+            self.trail_particles.emit(1, self.x, self.y + self.height,
+                                      (PLAYER_COLOR[0], PLAYER_COLOR[1], PLAYER_COLOR[2], 100),
+                                      spread_x=self.width)
         
         # 更新粒子
-        self.jump_particles = [p for p in self.jump_particles if p.life > 0]
-        for particle in self.jump_particles:
-            particle.update()
-            
-        self.trail_particles = [p for p in self.trail_particles if p.life > 0]
-        for particle in self.trail_particles:
-            particle.update()
+        self.jump_particles.update()
+        self.trail_particles.update()
 
     def draw(self, surface):
             
         # 绘制跳跃粒子
-        for particle in self.jump_particles:
-            particle.draw(surface)
+        self.jump_particles.draw(surface)
             
         # 绘制阴影
         pygame.draw.rect(surface, PLAYER_SHADOW, 
@@ -176,20 +143,32 @@ class Player:
             pygame.draw.circle(surface, PLAYER_SHADOW, (self.x + 3, self.y + self.height + bob), 2)
             pygame.draw.circle(surface, PLAYER_SHADOW, (self.x + 13, self.y + self.height + bob), 2)
 
-class Star:
-    def __init__(self):
-        self.width = 8
-        self.height = 8
-        self.x = WIDTH + random.randint(0, 100)
-        self.y = random.randint(HEIGHT//2, HEIGHT - 60)
-        self.animation_frame = 0
-        self.collected = False
-
-    def update(self):
-        self.x -= OBSTACLE_SPEED
-        self.animation_frame += 0.3
+    def bounds(self):
+        # 包含阴影、上下摆动和脚部
+        return pygame.Rect(int(self.x) - 2, int(self.y) - 3, self.width + 5, self.height + 8)
 
+class Star(simulation.Star):
     def draw(self, surface):
+        if self.collected:
+            return
+        # 优先使用预渲染的旋转帧，关闭缓存时回退到矢量绘制
+        if SPRITE_CACHE.enabled:
+            surface.blit(*self.sprite())
+        else:
+            self.draw_vector(surface)
+
+    def sprite(self):
+        """返回当前角度对应的 (预渲染帧, 绘制位置)"""
+        return SPRITE_CACHE.sprite('star', (self.x, self.y), (self.width, self.height),
+                                   self.animation_frame, self.render_frame)
+
+    def render_frame(self, target, x, y, angle):
+        """在指定位置和角度以矢量方式绘制一帧（用于生成精灵缓存）"""
+        proxy = SimpleNamespace(x=x, y=y, width=self.width, height=self.height,
+                                animation_frame=angle, collected=False)
+        Star.draw_vector(proxy, target)
+
+    def draw_vector(self, surface):
         if not self.collected:
             # 绘制旋转的星星
             angle = self.animation_frame
@@ -212,37 +191,13 @@ class Star:
             
             pygame.draw.polygon(surface, star_color, points)
 
-    def off_screen(self):
-        return self.x + self.width < 0
-
-    def check_collision(self, player):
-        if not self.collected:
-            if (player.x < self.x + self.width and
-                player.x + player.width > self.x and
-                player.y < self.y + self.height and
-                player.y + player.height > self.y):
-                self.collected = True
-                return True
-        return False
+    def bounds(self):
+        # 发光圆半径为 6，超出星星本体
+        return pygame.Rect(int(self.x) - 3, int(self.y) - 3, self.width + 7, self.height + 7)
 
-class Obstacle:
-    def __init__(self):
-        # 更多样化的障碍物类型
-        obstacle_types = [
-            {'width': 12, 'height': 24, 'type': 'spike'},     # 细长尖刺
-            {'width': 20, 'height': 16, 'type': 'block'},     # 普通方块
-            {'width': 16, 'height': 32, 'type': 'spike'},     # 高尖刺
-            {'width': 24, 'height': 12, 'type': 'block'},     # 宽方块
-            {'width': 18, 'height': 18, 'type': 'saw'},       # 锯齿状
-            {'width': 14, 'height': 28, 'type': 'crystal'}    # 水晶障碍
-        ]
-        chosen = random.choice(obstacle_types)
-        self.width = chosen['width']
-        self.height = chosen['height']
-        self.type = chosen['type']
-        self.x = WIDTH
-        self.y = HEIGHT - self.height - 20
-        self.animation_frame = 0
+class Obstacle(simulation.Obstacle):
+    def __init__(self, rng=random):
+        super().__init__(rng)
         self.color = OBSTACLE_COLOR
         
         # 为不同类型设置不同颜色
@@ -251,11 +206,12 @@ class Obstacle:
         elif self.type == 'crystal':
             self.color = (100, 200, 255)  # 蓝色水晶
 
-    def update(self):
-        self.x -= OBSTACLE_SPEED
-        self.animation_frame += 0.1
-
     def draw(self, surface):
+        # 优先使用预渲染的精灵（旋转类障碍物按角度取帧）
+        if SPRITE_CACHE.enabled:
+            surface.blit(*self.sprite())
+            return
+        
         # 根据障碍物类型绘制不同形状
         if self.type == 'spike':
             self.draw_spike(surface)
@@ -266,6 +222,20 @@ class Obstacle:
         elif self.type == 'crystal':
             self.draw_crystal(surface)
 
+    def sprite(self):
+        """返回当前角度对应的 (预渲染帧, 绘制位置)"""
+        key = (self.type, self.width, self.height, self.color)
+        if self.type in ROTATING_OBSTACLES:
+            return SPRITE_CACHE.sprite(key, (self.x, self.y), (self.width, self.height),
+                                       self.animation_frame, self.render_frame)
+        return SPRITE_CACHE.static(key, (self.x, self.y), (self.width, self.height), self.render_frame)
+
+    def render_frame(self, target, x, y, angle):
+        """在指定位置和角度以矢量方式绘制一帧（用于生成精灵缓存）"""
+        proxy = SimpleNamespace(x=x, y=y, width=self.width, height=self.height,
+                                color=self.color, animation_frame=angle)
+        getattr(Obstacle, 'draw_' + self.type)(proxy, target)
+
     def draw_spike(self, surface):
         # 绘制阴影
         pygame.draw.rect(surface, OBSTACLE_SHADOW, 
@@ -361,8 +331,14 @@ class Obstacle:
         pygame.draw.line(surface, (200, 230, 255), points[1], points[4], 1)
         pygame.draw.line(surface, (200, 230, 255), points[2], points[5], 1)
 
-    def off_screen(self):
-        return self.x + self.width < 0
+    def bounds(self):
+        if self.type in ROTATING_OBSTACLES:
+            # 旋转时顶点可以伸出本体，按旋转后的外接正方形计算
+            half = max(self.width, self.height) // 2 + SPRITE_PADDING + 1
+            center_x, center_y = int(self.x) + self.width // 2, int(self.y) + self.height // 2
+            return pygame.Rect(center_x - half, center_y - half, half * 2, half * 2)
+        # 包含阴影和边缘高光
+        return pygame.Rect(int(self.x) - 2, int(self.y) - 2, self.width + 5, self.height + 5)
 
 class Button:
     def __init__(self, x, y, width, height, text, font):
@@ -394,49 +370,68 @@ class Button:
 
 class Game:
     def __init__(self):
+        STARTUP.mark('imports')
+        # 导入模块没有副作用，创建 Game 时才打开窗口
+        self.window = display.open_window((WIDTH * SCALE, HEIGHT * SCALE), CAPTION)
+        STARTUP.mark('display')
         self.state = MENU
-        self.player = Player()
-        self.obstacles = []
-        self.stars = []
-        self.clouds = []
-        self.particles = []
-        self.score = 0
-        self.stars_collected = 0
+        # 游戏逻辑由无界面的模拟核心推进，Game 只负责输入和渲染
+        self.world = World(player_cls=Player, obstacle_cls=Obstacle, star_cls=Star, cloud_cls=Cloud)
+        self.inputs = set()
+        # 每局记录种子和跳跃帧号，可以无界面地精确重放
+        self.recorder = ReplayRecorder()
+        # 每局结束追加一条定长记录到历史文件
+        self.history = RunHistory()
+        self.particles = ParticleSystem(capacity=MAX_PARTICLES)
         self.high_score = 0
-        self.obstacle_timer = 0
-        self.star_timer = 0
-        self.cloud_timer = 0
-        self.difficulty_timer = 0
         self.screen_shake = 0
         
         # 字体
-        self.font = PIXEL_FONT
-        self.big_font = BIG_PIXEL_FONT
+        # 英文字体
+        # 文字渲染走字形图集 + LRU 字符串缓存，避免每帧重新光栅化
+        self.font = display.font(24)
+        self.big_font = display.font(48)
+        STARTUP.mark('fonts')
+        
+        # 帧分析叠加层（F4 切换）：各阶段耗时记在环形缓冲区里，右上角显示帧时间、百分位和滚动图表
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler, display.font(16))
+        self.profiler_pos = (WIDTH - self.profiler_overlay.size[0] - 5, 5)
         
         # 按钮 - 使用英文避免字体问题
         self.play_button = Button(WIDTH//2 - 50, HEIGHT//2, 100, 30, "PLAY", self.font)
         self.restart_button = Button(WIDTH//2 - 50, HEIGHT//2 + 20, 100, 30, "RESTART", self.font)
         self.menu_button = Button(WIDTH//2 - 50, HEIGHT//2 + 60, 100, 30, "MENU", self.font)
         
+        # 预渲染背景层和UI面板层
+        self.background = BackgroundLayer()
+        self.hud = HudLayer((180, 55))
+        
+        # 预分配的帧缓冲（主画布、放大目标、半透明面板），每帧复用
+        self.frame = FrameBuffers((WIDTH, HEIGHT), SCALE)
+        
+        # 脏矩形渲染（可选）：只恢复和提交变化的区域
+        self.dirty_rects = DirtyRectTracker((0, 0, WIDTH, HEIGHT))
+        
+        # 固定步长：模拟始终以 60Hz 推进，[ ] 调整时间倍率，\ 恢复正常速度
+        self.timestep = FixedTimestep(FPS)
+        STARTUP.mark('setup')
+        
     def reset_game(self):
-        global OBSTACLE_SPEED
-        OBSTACLE_SPEED = 4
-        self.player = Player()
-        self.obstacles = []
-        self.stars = []
-        self.particles = []
-        self.score = 0
-        self.stars_collected = 0
-        self.obstacle_timer = 0
-        self.star_timer = 0
-        self.difficulty_timer = 0
+        self.world.reset()
+        self.recorder.start(self.world.seed, self.world.run_rules)
+        self.inputs.clear()
+        self.particles.clear()
         self.screen_shake = 0
-        pygame.time.set_timer(SPAWN_OBSTACLE_EVENT, 1500)
         
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.profiler.enabled = not self.profiler.enabled
+                self.dirty_rects.invalidate()
+                continue
                 
             if self.state == MENU:
                 if self.play_button.handle_event(event):
@@ -446,9 +441,20 @@ class Game:
             elif self.state == PLAYING:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
-                        self.player.jump()
-                if event.type == SPAWN_OBSTACLE_EVENT:
-                    self.obstacles.append(Obstacle())
+                        self.inputs.add('jump')
+                    elif event.key == pygame.K_F2:
+                        # 切换精灵缓存与矢量绘制（用于对比）
+                        SPRITE_CACHE.enabled = not SPRITE_CACHE.enabled
+                    elif event.key == pygame.K_F3:
+                        # 切换脏矩形渲染模式
+                        self.dirty_rects.enabled = not self.dirty_rects.enabled
+                        self.dirty_rects.invalidate()
+                    elif event.key == pygame.K_LEFTBRACKET:
+                        self.set_time_scale(self.timestep.slower())
+                    elif event.key == pygame.K_RIGHTBRACKET:
+                        self.set_time_scale(self.timestep.faster())
+                    elif event.key == pygame.K_BACKSLASH:
+                        self.set_time_scale(1.0)
                     
             elif self.state == GAME_OVER:
                 if self.restart_button.handle_event(event):
@@ -459,116 +465,66 @@ class Game:
                     
         return True
     
+    def set_time_scale(self, scale):
+        """设置时间倍率，非正常速度时显示在窗口标题上"""
+        self.timestep.time_scale = scale
+        scale = self.timestep.time_scale
+        pygame.display.set_caption(CAPTION if scale == 1 else f"{CAPTION} ({scale:g}x)")
+    
     def update(self):
         if self.state == PLAYING:
-            # 更新玩家
-            self.player.update()
+            world = self.world
+            events = world.step(self.inputs)
+            self.inputs.clear()
+            if events.jumped:
+                self.recorder.record_jump(world.frame)
             
-            # 更新障碍物
-            for obs in self.obstacles:
-                obs.update()
+            # 添加收集粒子效果
+            for star in events.stars_collected:
+                self.particles.emit(15, star.x + 4, star.y + 4, (255, 255, 0))
             
-            # 更新星星
-            for star in self.stars:
-                star.update()
+            if events.died:
+                player = world.player
+                # 添加死亡粒子效果
+                self.particles.emit(20, player.x + player.width//2,
+                                    player.y + player.height//2, PLAYER_COLOR)
                 
-            # 检查星星收集
-            for star in self.stars:
-                if star.check_collision(self.player):
-                    self.stars_collected += 1
-                    self.score += 50
-                    # 添加收集粒子效果
-                    for i in range(15):
-                        self.particles.append(
-                            Particle(star.x + 4, star.y + 4, (255, 255, 0))
-                        )
-            
-            # 移除屏幕外障碍物并增加分数
-            old_count = len(self.obstacles)
-            self.obstacles = [obs for obs in self.obstacles if not obs.off_screen()]
-            self.score += (old_count - len(self.obstacles)) * 10
-            
-            # 移除屏幕外的星星
-            self.stars = [star for star in self.stars if not star.off_screen()]
-            
-            # 生成星星
-            self.star_timer += 1
-            if self.star_timer > 180:  # 每3秒生成星星
-                if random.random() < 0.7:  # 70%概率生成星星
-                    self.stars.append(Star())
-                self.star_timer = 0
-            
-            # 更新云朵
-            self.cloud_timer += 1
-            if self.cloud_timer > 120:  # 每2秒生成云朵
-                self.clouds.append(Cloud())
-                self.cloud_timer = 0
+                # 屏幕震动效果
+                self.screen_shake = 10
+                self.recorder.finish(world.frame, world.score)
+                self.history.record(world, events.collisions[0].type)
                 
-            for cloud in self.clouds:
-                cloud.update()
-            self.clouds = [cloud for cloud in self.clouds if not cloud.off_screen()]
-            
-            # 增加难度
-            self.difficulty_timer += 1
-            if self.difficulty_timer > 600:  # 每10秒增加难度
-                global OBSTACLE_SPEED
-                OBSTACLE_SPEED += 0.2
-                spawn_rate = max(800, 1500 - self.difficulty_timer // 60 * 50)
-                pygame.time.set_timer(SPAWN_OBSTACLE_EVENT, spawn_rate)
-                self.difficulty_timer = 0
-            
-            # 碰撞检测
-            for obs in self.obstacles:
-                if (self.player.x < obs.x + obs.width and
-                    self.player.x + self.player.width > obs.x and
-                    self.player.y < obs.y + obs.height and
-                    self.player.y + self.player.height > obs.y):
-                    
-                    # 添加死亡粒子效果
-                    for i in range(20):
-                        self.particles.append(
-                            Particle(self.player.x + self.player.width//2, 
-                                   self.player.y + self.player.height//2, PLAYER_COLOR)
-                        )
-                    
-                    # 屏幕震动效果
-                    self.screen_shake = 10
-                    
-                    if self.score > self.high_score:
-                        self.high_score = self.score
-                    self.state = GAME_OVER
+                if world.score > self.high_score:
+                    self.high_score = world.score
+                self.state = GAME_OVER
         
         # 更新屏幕震动
         if self.screen_shake > 0:
             self.screen_shake -= 1
         
         # 更新粒子
-        for particle in self.particles:
-            particle.update()
-        self.particles = [p for p in self.particles if p.life > 0]
+        self.particles.update()
+    
+    def background_colors(self):
+        """背景层使用的颜色"""
+        return SKY_COLOR, GROUND_COLOR, GROUND_SHADOW
     
     def draw(self):
-        # 创建主画布
-        surface = pygame.Surface((WIDTH, HEIGHT))
-        
-        # 绘制天空渐变
-        for y in range(HEIGHT - 20):
-            color_ratio = y / (HEIGHT - 20)
-            r = int(SKY_COLOR[0] * (1 - color_ratio) + WHITE[0] * color_ratio)
-            g = int(SKY_COLOR[1] * (1 - color_ratio) + WHITE[1] * color_ratio)
-            b = int(SKY_COLOR[2] * (1 - color_ratio) + WHITE[2] * color_ratio)
-            pygame.draw.line(surface, (r, g, b), (0, y), (WIDTH, y))
-        
-        # 绘制云朵
-        for cloud in self.clouds:
-            cloud.draw(surface)
-        
-        # 绘制地面（带纹理）
-        pygame.draw.rect(surface, GROUND_SHADOW, (0, HEIGHT - 18, WIDTH, 18))
-        pygame.draw.rect(surface, GROUND_COLOR, (0, HEIGHT - 20, WIDTH, 18))
-        # 地面纹理
-        for x in range(0, WIDTH, 8):
-            pygame.draw.line(surface, GROUND_SHADOW, (x, HEIGHT - 20), (x, HEIGHT - 2))
+        # 游戏中且无屏幕震动时可以使用脏矩形渲染
+        if self.dirty_rects.enabled and self.state == PLAYING and self.screen_shake == 0:
+            self.draw_dirty()
+            return
+        
+        # 复用预分配的主画布
+        surface = self.frame.canvas
+        
+        # 绘制预渲染的天空渐变和地面（仅在颜色或分辨率变化时重建）
+        surface.blit(self.background.get((WIDTH, HEIGHT), *self.background_colors()), (0, 0))
+        self.profiler.lap('background')
+        
+        # 绘制云朵（云朵始终位于地面以上，可以画在背景层之后）
+        self.draw_layer(surface, self.world.clouds)
+        self.profiler.lap('entities')
         
         if self.state == MENU:
             self.draw_menu(surface)
@@ -576,16 +532,67 @@ class Game:
             self.draw_game(surface)
         elif self.state == GAME_OVER:
             self.draw_game_over(surface)
+        self.profiler.lap('hud')
+        self.draw_profiler(surface)
         
         # 应用屏幕震动效果
         shake_x = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
         shake_y = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
         
-        # 放大显示
-        scaled_surface = pygame.transform.scale(surface, (WIDTH * SCALE, HEIGHT * SCALE))
-        WIN.fill(BLACK)  # 清除屏幕
-        WIN.blit(scaled_surface, (shake_x, shake_y))
-        pygame.display.update()
+        # 放大显示（缩放到预分配的目标表面，不再每帧创建新表面）
+        self.present(self.frame.scale_to(self.window, offset=(shake_x, shake_y)))
+        
+        # 整帧重绘后，下一次脏矩形渲染需要从整帧开始
+        self.dirty_rects.invalidate()
+    
+    def draw_dirty(self):
+        """脏矩形渲染：从背景层恢复上一帧的区域，重绘实体，只提交变化的区域"""
+        canvas = self.frame.canvas
+        tracker = self.dirty_rects
+        
+        tracker.restore(canvas, self.background.get((WIDTH, HEIGHT), *self.background_colors()))
+        self.profiler.lap('background')
+        self.draw_layer(canvas, self.world.clouds)
+        
+        hud_composes = self.hud.composes
+        self.draw_game(canvas)
+        self.profiler.lap('hud')
+        for rect in self.entity_bounds():
+            tracker.add(rect)
+        if self.hud.composes != hud_composes:
+            tracker.mark((5, 5) + self.hud.size)
+        self.profiler.lap('entities')
+        if self.draw_profiler(canvas):
+            tracker.add(self.profiler_overlay.bounds(self.profiler_pos))
+        
+        self.present(self.frame.scale_to(self.window, rects=tracker.end_frame()))
+    
+    def present(self, updated):
+        """提交放大后的画面（缩放和提交分别计时）"""
+        self.profiler.lap('scale')
+        self.frame.update_display(updated)
+        self.profiler.lap('present')
+    
+    def draw_profiler(self, surface):
+        """帧分析开启时绘制叠加层，返回是否绘制"""
+        if not self.profiler.enabled:
+            return False
+        self.profiler_overlay.draw(surface, self.profiler_pos)
+        self.profiler.lap('overlay')
+        return True
+    
+    def entity_bounds(self):
+        """本帧绘制的所有实体所占区域"""
+        for cloud in self.world.clouds:
+            yield cloud.bounds()
+        for star in self.world.stars:
+            if not star.collected:
+                yield star.bounds()
+        yield self.world.player.bounds()
+        yield from self.world.player.jump_particles.bounds()
+        for obs in self.world.obstacles:
+            yield obs.bounds()
+        yield from self.particles.bounds()
     
     def draw_menu(self, surface):
         # 标题
@@ -607,45 +614,56 @@ class Game:
         hint_rect = hint.get_rect(center=(WIDTH//2, HEIGHT//2 + 60))
         surface.blit(hint, hint_rect)
     
+    def draw_layer(self, surface, entities):
+        """绘制一层实体：启用精灵缓存时收集 (表面, 位置) 后用一次 blits 提交"""
+        if SPRITE_CACHE.enabled:
+            surface.blits([entity.sprite() for entity in entities], doreturn=False)
+        else:
+            for entity in entities:
+                entity.draw(surface)
+    
     def draw_game(self, surface):
         # 绘制星星
-        for star in self.stars:
-            star.draw(surface)
+        self.draw_layer(surface, [star for star in self.world.stars if not star.collected])
             
         # 绘制玩家和障碍
-        self.player.draw(surface)
-        for obs in self.obstacles:
-            obs.draw(surface)
+        self.world.player.draw(surface)
+        self.draw_layer(surface, self.world.obstacles)
         
         # 绘制粒子
-        for particle in self.particles:
-            particle.draw(surface)
+        self.particles.draw(surface)
+        self.profiler.lap('entities')
+        
+        # UI面板（仅在分数、星星数或速度变化时重新合成）
+        hud_key = (self.world.score, self.world.stars_collected, f"{self.world.speed:.1f}")
+        surface.blit(self.hud.get(hud_key, self.compose_hud), (5, 5))
+    
+    def compose_hud(self, panel, key):
+        """合成UI面板：分数、星星收集数、速度"""
+        score, stars_collected, speed = key
         
         # UI面板背景
-        pygame.draw.rect(surface, (0, 0, 0, 150), (5, 5, 180, 55))
-        pygame.draw.rect(surface, BUTTON_COLOR, (5, 5, 180, 55), 2)
+        panel.fill(BLACK)
+        pygame.draw.rect(panel, BUTTON_COLOR, panel.get_rect(), 2)
         
         # 显示分数
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        surface.blit(score_text, (10, 10))
+        score_text = self.font.render(f"Score: {score}", True, WHITE)
+        panel.blit(score_text, (5, 5))
         
         # 显示星星收集数
-        stars_text = self.font.render(f"Stars: {self.stars_collected}", True, (255, 255, 0))
-        surface.blit(stars_text, (10, 25))
+        stars_text = self.font.render(f"Stars: {stars_collected}", True, (255, 255, 0))
+        panel.blit(stars_text, (5, 20))
         
         # 显示速度
-        speed_text = self.font.render(f"Speed: {OBSTACLE_SPEED:.1f}", True, WHITE)
-        surface.blit(speed_text, (10, 40))
+        speed_text = self.font.render(f"Speed: {speed}", True, WHITE)
+        panel.blit(speed_text, (5, 35))
     
     def draw_game_over(self, surface):
         # 绘制游戏画面（暗化）
         self.draw_game(surface)
         
-        # 半透明覆盖
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(BLACK)
-        surface.blit(overlay, (0, 0))
+        # 半透明覆盖（预分配，每帧复用）
+        surface.blit(self.frame.panel('overlay', (WIDTH, HEIGHT), BLACK, 128), (0, 0))
         
         # 游戏结束文本
         game_over_text = self.big_font.render("GAME OVER", True, WHITE)
@@ -653,12 +671,12 @@ class Game:
         surface.blit(game_over_text, game_over_rect)
         
         # 最终分数
-        final_score = self.font.render(f"Final Score: {self.score}", True, WHITE)
+        final_score = self.font.render(f"Final Score: {self.world.score}", True, WHITE)
         final_score_rect = final_score.get_rect(center=(WIDTH//2, HEIGHT//2 - 50))
         surface.blit(final_score, final_score_rect)
         
         # 星星收集数
-        stars_final = self.font.render(f"Stars Collected: {self.stars_collected}", True, (255, 255, 0))
+        stars_final = self.font.render(f"Stars Collected: {self.world.stars_collected}", True, (255, 255, 0))
         stars_final_rect = stars_final.get_rect(center=(WIDTH//2, HEIGHT//2 - 35))
         surface.blit(stars_final, stars_final_rect)
         
@@ -672,18 +690,31 @@ class Game:
         self.menu_button.draw(surface)
 
 def main():
-    clock = pygame.time.Clock()
     game = Game()
+    clock = pygame.time.Clock()
     
-    while True:
-        if not game.handle_events():
-            break
-        
-        game.update()
-        game.draw()
-        clock.tick(FPS)
+    try:
+        while True:
+            if not game.handle_events():
+                break
+            game.profiler.lap('events')
+            
+            # 按实际经过的时间推进若干个固定步长，渲染帧率不影响游戏速度
+            elapsed = clock.tick(FPS) / 1000
+            game.profiler.lap('wait')
+            for _ in range(game.timestep.advance(elapsed)):
+                game.update()
+            game.profiler.lap('update')
+            game.draw()
+            game.profiler.end_frame()
+            if STARTUP.finish():
+                print(STARTUP.report())
+    finally:
+        # 中途退出或崩溃时也保存未完成的回放（便于复现问题）和这一局的历史记录
+        if game.recorder.finish(game.world.frame) and game.world.frame:
+            game.history.record(game.world, 'quit')
     
-    pygame.quit()
+    display.shutdown()
     sys.exit()
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+from collections import deque
+from typing import Iterator
+
+
+class Lane(deque):
+    """Entities kept in ascending x order.
+
+    Everything in a lane scrolls left at the shared speed, so the order never
+    changes once an entity is in place: the leftmost entity is always at the
+    front. Entities that spawn at a fixed x can be appended; add() places
+    one whose spawn x varies. Expired entities are popped from the left and
+    range queries stop at the first entity past the range, so both cost
+    depend on how many entities are involved, not on how many are alive.
+    """
+
+    def add(self, entity):
+        """Insert entity after every entity with x <= entity.x, scanning from the right"""
+        i = len(self)
+        while i and self[i - 1].x > entity.x:
+            i -= 1
+        self.insert(i, entity)
+
+    def cull(self) -> int:
+        """Pop entities whose off_screen() is true from the left; returns how many"""
+        removed = 0
+        while self and self[0].off_screen():
+            self.popleft()
+            removed += 1
+        return removed
+
+    def overlapping(self, x0: float, x1: float) -> Iterator:
+        """Entities whose [x, x + width) span overlaps (x0, x1), scanning from the left"""
+        for entity in self:
+            if entity.x >= x1:
+                return
+            if entity.x + entity.width > x0:
+                yield entity
@@ -0,0 +1,132 @@
+import numpy as np
+import pygame
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as NumPy structure-of-arrays.
+
+    Particles are kept in spawn order, so when a burst would exceed the
+    capacity the oldest ones are evicted from the front. update() integrates,
+    ages and compacts every live particle with a handful of vectorized ops.
+    """
+
+    GRAVITY = 0.2
+    LIFE = 30
+    VEL_X = (-3.0, 3.0)
+    VEL_Y = (-5.0, -1.0)
+    RADIUS = 2
+
+    def __init__(self, capacity: int = 1024, rng: Optional[np.random.Generator] = None):
+        self.capacity = capacity
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.palette: List[Tuple[int, int, int]] = []
+        self.palette_index: Dict[Tuple[int, int, int], int] = {}
+        self.dots: List[pygame.Surface] = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def color_index(self, color: Sequence[int]) -> int:
+        rgb = tuple(color[:3])
+        index = self.palette_index.get(rgb)
+        if index is None:
+            index = self.palette_index[rgb] = len(self.palette)
+            self.palette.append(rgb)
+        return index
+
+    def emit(self, count: int, x: float, y: float, color: Sequence[int], spread_x: int = 0):
+        """Spawn a burst of count particles at (x, y), optionally spread over [x, x + spread_x]"""
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+        overflow = self.count + count - self.capacity
+        if overflow > 0:
+            self._evict(overflow)
+
+        start, end = self.count, self.count + count
+        rng = self.rng
+        self.x[start:end] = x
+        if spread_x:
+            self.x[start:end] += rng.integers(0, spread_x + 1, count)
+        self.y[start:end] = y
+        self.vx[start:end] = rng.uniform(*self.VEL_X, count)
+        self.vy[start:end] = rng.uniform(*self.VEL_Y, count)
+        self.life[start:end] = self.LIFE
+        self.color[start:end] = self.color_index(color)
+        self.count = end
+
+    def _evict(self, n: int):
+        """Drop the n oldest particles"""
+        n = min(n, self.count)
+        keep = self.count - n
+        for arr in (self.x, self.y, self.vx, self.vy, self.life, self.color):
+            arr[:keep] = arr[n:self.count]
+        self.count = keep
+
+    def update(self):
+        """Integrate, age and drop dead particles"""
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += self.GRAVITY
+        self.life[:n] -= 1
+
+        alive = self.life[:n] > 0
+        if alive.all():
+            return
+        # Every particle ages at the same rate, so the dead ones are normally
+        # a prefix of the spawn-ordered arrays and compaction is a shift.
+        dead = n - int(np.count_nonzero(alive))
+        if not alive[:dead].any():
+            self._evict(dead)
+            return
+        keep = int(np.count_nonzero(alive))
+        for arr in (self.x, self.y, self.vx, self.vy, self.life, self.color):
+            arr[:keep] = arr[:n][alive]
+        self.count = keep
+
+    def clear(self):
+        self.count = 0
+
+    def positions(self):
+        """Integer pixel positions of the live particles"""
+        n = self.count
+        return self.x[:n].astype(np.int32), self.y[:n].astype(np.int32)
+
+    def _build_dots(self):
+        """Pre-render one particle dot per palette color not rendered yet"""
+        r = self.RADIUS
+        convert = pygame.display.get_surface() is not None
+        for color in self.palette[len(self.dots):]:
+            dot = pygame.Surface((r * 2 + 1, r * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(dot, color, (r, r), r)
+            self.dots.append(dot.convert_alpha() if convert else dot)
+
+    def draw(self, surface: pygame.Surface):
+        """Blit every live particle in a single Surface.blits call"""
+        n = self.count
+        if not n:
+            return
+        if len(self.dots) < len(self.palette):
+            self._build_dots()
+        r = self.RADIUS
+        xs = (self.x[:n].astype(np.int32) - r).tolist()
+        ys = (self.y[:n].astype(np.int32) - r).tolist()
+        dots = map(self.dots.__getitem__, self.color[:n].tolist())
+        surface.blits(list(zip(dots, zip(xs, ys))), doreturn=False)
+
+    def bounds(self) -> List[pygame.Rect]:
+        """Screen regions covered by the live particles (for dirty-rect rendering)"""
+        xs, ys = self.positions()
+        r = self.RADIUS + 1
+        return [pygame.Rect(x - r, y - r, r * 2 + 1, r * 2 + 1) for x, y in zip(xs.tolist(), ys.tolist())]
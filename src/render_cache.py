@@ -0,0 +1,154 @@
+import math
+import pygame
+from typing import Optional, Sequence, Tuple
+
+Color = Tuple[int, int, int]
+
+TAU = 2 * math.pi
+SPRITE_PADDING = 4
+
+
+class BackgroundLayer:
+    """Pre-rendered sky gradient and ground strip.
+
+    The layer is built once and only rebuilt when the resolution or one of
+    the colors it was built from changes, so a frame costs a single blit.
+    """
+
+    def __init__(self, ground_height: int = 20, horizon_color: Color = (255, 255, 255)):
+        self.ground_height = ground_height
+        self.horizon_color = tuple(horizon_color)
+        self.surface: Optional[pygame.Surface] = None
+        self.key = None
+        self.builds = 0
+
+    def get(self, size: Tuple[int, int], sky_color: Sequence[int],
+            ground_color: Sequence[int], ground_shadow: Sequence[int]) -> pygame.Surface:
+        """Return the cached layer, rebuilding it if any input changed"""
+        key = (tuple(size), tuple(sky_color[:3]), tuple(ground_color[:3]), tuple(ground_shadow[:3]))
+        if self.surface is None or key != self.key:
+            self.surface = self.build(*key)
+            self.key = key
+            self.builds += 1
+        return self.surface
+
+    def invalidate(self):
+        """Force a rebuild on the next get()"""
+        self.surface = None
+        self.key = None
+
+    def build(self, size, sky_color, ground_color, ground_shadow) -> pygame.Surface:
+        width, height = size
+        horizon = height - self.ground_height
+        surface = pygame.Surface((width, height))
+
+        # Sky gradient: sky color at the top fading to the horizon color
+        for y in range(horizon):
+            ratio = y / horizon
+            color = tuple(int(sky_color[i] * (1 - ratio) + self.horizon_color[i] * ratio) for i in range(3))
+            pygame.draw.line(surface, color, (0, y), (width, y))
+
+        # Ground strip with its shadow edge and vertical texture
+        pygame.draw.rect(surface, ground_shadow, (0, height - 18, width, 18))
+        pygame.draw.rect(surface, ground_color, (0, horizon, width, 18))
+        for x in range(0, width, 8):
+            pygame.draw.line(surface, ground_shadow, (x, horizon), (x, height - 2))
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+
+class SpriteCache:
+    """Pre-rendered entity sprites, with rotation frames at quantized phases.
+
+    Each rotating sprite key gets ``phases`` frames covering a full turn and
+    static shapes get one frame, so drawing an entity becomes a single blit
+    (or one item in a Surface.blits batch). Set ``enabled`` to False to fall
+    back to the vector drawing path.
+    """
+
+    def __init__(self, phases: int = 32, enabled: bool = True):
+        self.phases = max(1, int(phases))
+        self.enabled = enabled
+        self.frames = {}
+
+    def configure(self, phases: int = None, enabled: bool = None):
+        """Change phase count or toggle the cache; frames are rebuilt lazily"""
+        if phases is not None and max(1, int(phases)) != self.phases:
+            self.phases = max(1, int(phases))
+            self.clear()
+        if enabled is not None:
+            self.enabled = enabled
+
+    def clear(self):
+        self.frames.clear()
+
+    def phase(self, angle: float) -> int:
+        """Index of the pre-rendered frame nearest to angle (radians)"""
+        return int(angle * self.phases / TAU + 0.5) % self.phases
+
+    def sprite(self, key, pos, size, angle, render):
+        """Return (frame, dest) for an entity whose top-left corner is pos.
+
+        ``render(target, x, y, angle)`` must draw the entity with its top-left
+        corner at (x, y); it is only called while building the frames.
+        """
+        entry = self.frames.get(key)
+        if entry is None:
+            entry = self.frames[key] = self.build(size, render, self.phases)
+        frames, (ox, oy) = entry
+        return frames[self.phase(angle)], (pos[0] - ox, pos[1] - oy)
+
+    def static(self, key, pos, size, render):
+        """Like sprite() for shapes that don't rotate: a single frame, rendered at angle 0"""
+        entry = self.frames.get(key)
+        if entry is None:
+            entry = self.frames[key] = self.build(size, render, 1)
+        frames, (ox, oy) = entry
+        return frames[0], (pos[0] - ox, pos[1] - oy)
+
+    def build(self, size, render, phases):
+        width, height = size
+        # Room for the shape rotating about its center plus shadow and line width
+        side = max(width, height) + 2 * SPRITE_PADDING
+        ox, oy = side // 2 - width // 2, side // 2 - height // 2
+        convert = pygame.display.get_surface() is not None
+        frames = []
+        for i in range(phases):
+            frame = pygame.Surface((side, side), pygame.SRCALPHA)
+            render(frame, ox, oy, i * TAU / phases)
+            frames.append(frame.convert_alpha() if convert else frame)
+        return frames, (ox, oy)
+
+
+class HudLayer:
+    """A UI panel surface that is only recomposed when the values it shows change.
+
+    ``compose(surface, key)`` redraws the whole panel; it is called on the
+    first get() and whenever the key differs from the previous one.
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        self.size = tuple(size)
+        self.surface: Optional[pygame.Surface] = None
+        self.key = None
+        self.dirty = True
+        self.composes = 0
+
+    def get(self, key, compose) -> pygame.Surface:
+        if self.surface is None:
+            self.surface = pygame.Surface(self.size)
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert()
+            self.dirty = True
+        if self.dirty or key != self.key:
+            compose(self.surface, key)
+            self.key = key
+            self.dirty = False
+            self.composes += 1
+        return self.surface
+
+    def invalidate(self):
+        """Force a recompose on the next get()"""
+        self.dirty = True
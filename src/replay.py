@@ -0,0 +1,183 @@
+import os
+import struct
+import sys
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from src.simulation import DEFAULT_RULES, Rules, World
+
+REPLAY_DIR = os.path.join("game_data", "replays")
+REPLAY_SUFFIX = ".rpl"
+MAX_REPLAYS = 20
+
+# magic, version, flags, seed, frames, score
+HEADER = struct.Struct("<4sBBQII")
+# Rules 的各个字段，顺序同 Rules.__slots__
+RULES = struct.Struct("<ddddqqqqdqqq")
+MAGIC = b"PRRP"
+VERSION = 2
+FLAG_FINISHED = 1
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """A run reduced to its seed, its rules and the frames on which the player jumped.
+
+    Stored as a fixed header and the rules, followed by the jump frames
+    delta-encoded as varints, so a typical run takes a few hundred bytes.
+    ``score`` is None for a run that never finished (e.g. saved from a
+    crash). Version 1 files predate configurable rules and play with the
+    defaults.
+    """
+
+    def __init__(self, seed: int, jumps: Iterable[int] = (), frames: int = 0, score: Optional[int] = None,
+                 rules: Rules = DEFAULT_RULES):
+        self.seed = seed
+        self.rules = rules
+        self.jumps: List[int] = list(jumps)
+        self.frames = frames
+        self.score = score
+
+    @property
+    def finished(self) -> bool:
+        return self.score is not None
+
+    def to_bytes(self) -> bytes:
+        flags = FLAG_FINISHED if self.finished else 0
+        out = bytearray(HEADER.pack(MAGIC, VERSION, flags, self.seed, self.frames, self.score or 0))
+        out += RULES.pack(*(getattr(self.rules, name) for name in Rules.__slots__))
+        _write_varint(out, len(self.jumps))
+        previous = 0
+        for frame in self.jumps:
+            _write_varint(out, frame - previous)
+            previous = frame
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        magic, version, flags, seed, frames, score = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError("not a replay file (or unsupported version)")
+        rules, pos = DEFAULT_RULES, HEADER.size
+        if version >= 2:
+            rules = Rules(**dict(zip(Rules.__slots__, RULES.unpack_from(data, pos))))
+            pos += RULES.size
+        count, pos = _read_varint(data, pos)
+        jumps = []
+        frame = 0
+        for _ in range(count):
+            delta, pos = _read_varint(data, pos)
+            frame += delta
+            jumps.append(frame)
+        return cls(seed, jumps, frames, score if flags & FLAG_FINISHED else None, rules)
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """Records the current run and writes finished runs under game_data/replays"""
+
+    def __init__(self, directory: str = REPLAY_DIR, keep: int = MAX_REPLAYS):
+        self.directory = directory
+        self.keep = keep
+        self.replay: Optional[Replay] = None
+
+    def start(self, seed: int, rules: Rules = DEFAULT_RULES):
+        self.replay = Replay(seed, rules=rules)
+
+    def record_jump(self, frame: int):
+        if self.replay is not None:
+            self.replay.jumps.append(frame)
+
+    def discard(self):
+        """Stop recording without saving (e.g. the rules changed mid-run)"""
+        self.replay = None
+
+    def finish(self, frames: int, score: Optional[int] = None) -> Optional[Replay]:
+        """Close the current run and save it; returns the replay (or None if nothing was recording)"""
+        replay, self.replay = self.replay, None
+        if replay is None:
+            return None
+        replay.frames = frames
+        replay.score = score
+        try:
+            self.save(replay)
+        except OSError as e:
+            print(f"保存回放失败: {e}")
+        return replay
+
+    def save(self, replay: Replay) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.directory, f"run_{stamp}_{replay.seed:08x}{REPLAY_SUFFIX}")
+        replay.save(path)
+        self.prune()
+        return path
+
+    def prune(self):
+        """Keep only the newest ``keep`` replays"""
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(REPLAY_SUFFIX))
+        for name in names[:-self.keep]:
+            os.remove(os.path.join(self.directory, name))
+
+
+def play(replay: Replay, world: Optional[World] = None) -> World:
+    """Re-run a replay headless under its own rules, as fast as possible, and return the final world"""
+    if world is None:
+        world = World(seed=replay.seed, rules=replay.rules)
+    else:
+        world.rules = replay.rules
+        world.reset(replay.seed)
+    jumps = set(replay.jumps)
+    jump, idle = ('jump',), ()
+    while not world.game_over and world.frame < replay.frames:
+        world.step(jump if world.frame + 1 in jumps else idle)
+    return world
+
+
+def main(argv: List[str]) -> int:
+    if not argv:
+        print("usage: python -m src.replay <replay file>...")
+        return 2
+    status = 0
+    for path in argv:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        world = play(replay)
+        elapsed = time.perf_counter() - start
+        expected = replay.score if replay.finished else "-"
+        ok = not replay.finished or (world.score == replay.score and world.frame == replay.frames)
+        print(f"{path}: seed={replay.seed} frames={world.frame} score={world.score} "
+              f"expected={expected} {'OK' if ok else 'MISMATCH'} ({elapsed * 1000:.1f} ms)")
+        if not ok:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
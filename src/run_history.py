@@ -0,0 +1,123 @@
+import os
+import struct
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.simulation import FPS, OBSTACLE_TYPES
+
+HISTORY_FILE = os.path.join("game_data", "run_history.bin")
+
+# magic, version, record size
+HEADER = struct.Struct("<4sHH")
+MAGIC = b"PRRH"
+VERSION = 1
+# timestamp, seed, score, stars, obstacles avoided, max speed, duration (s), cause
+RECORD = struct.Struct("<dQIIIffB3x")
+DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("seed", "<u8"),
+    ("score", "<u4"),
+    ("stars", "<u4"),
+    ("obstacles_avoided", "<u4"),
+    ("max_speed", "<f4"),
+    ("duration", "<f4"),
+    ("cause", "u1"),
+    ("_pad", "V3"),
+])
+assert DTYPE.itemsize == RECORD.size
+
+# 死亡原因编码：0 表示中途退出，其余为撞上的障碍物类型
+CAUSES = ("quit",) + tuple(dict.fromkeys(t["type"] for t in OBSTACLE_TYPES))
+
+
+class RunHistory:
+    """Append-only log of finished runs as fixed-size records.
+
+    Appending writes one record at the end of the file, so it costs the
+    same however long the history is; a torn record left by a crash is cut
+    off first, so later records stay aligned. load() reads the records
+    straight into a NumPy structured array (see DTYPE) with one read, so
+    queries over a million runs are vectorised and nothing is parsed. The
+    file is closed again before load() returns, so appending (and the
+    truncate on Windows) never conflicts with a loaded array.
+    """
+
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+
+    def append(self, seed: int, score: int, stars: int, obstacles_avoided: int, max_speed: float,
+               duration: float, cause: str = "quit", timestamp: Optional[float] = None):
+        record = RECORD.pack(time.time() if timestamp is None else timestamp, seed, score, stars,
+                             obstacles_avoided, max_speed, duration, CAUSES.index(cause))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "ab") as f:
+            size = f.tell()
+            # 上次写入中断时会留下不完整的记录（或文件头），先截掉，让新记录仍然对齐
+            end = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size if size >= HEADER.size else 0
+            if end != size:
+                f.truncate(end)
+            if end == 0:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            f.write(record)
+
+    def record(self, world, cause: str = "quit") -> Dict[str, Any]:
+        """Append the run a World just finished; returns the record's fields as a dict"""
+        run = {"timestamp": time.time(), "seed": world.seed, "score": world.score,
+               "stars": world.stars_collected, "obstacles_avoided": world.obstacles_avoided,
+               "max_speed": world.max_speed, "duration": world.frame / FPS, "cause": cause}
+        try:
+            self.append(**run)
+        except OSError as e:
+            print(f"保存历史记录失败: {e}")
+        return run
+
+    def load(self) -> np.ndarray:
+        """Every run so far as a read-only array (a copy; the file is not kept open)"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= HEADER.size:
+            return np.zeros(0, dtype=DTYPE)
+        with open(self.path, "rb") as f:
+            magic, version, size = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION or size != RECORD.size:
+                raise ValueError(f"{self.path} is not a run history file (or unsupported version)")
+            # 崩溃时可能留下写了一半的记录，忽略末尾不完整的部分
+            count = (os.fstat(f.fileno()).st_size - HEADER.size) // RECORD.size
+            runs = np.fromfile(f, dtype=DTYPE, count=count)
+        runs.flags.writeable = False
+        return runs
+
+
+def best_runs(runs: np.ndarray, n: int = 10) -> np.ndarray:
+    """The n highest-scoring runs, best first"""
+    if len(runs) > n:
+        runs = runs[np.argpartition(runs["score"], -n)[-n:]]
+    return runs[np.argsort(runs["score"], kind="stable")[::-1]]
+
+
+def daily_averages(runs: np.ndarray, utc_offset: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Average score per day as (day start timestamps, averages, run counts)
+
+    Days are split at local midnight unless utc_offset (seconds) is given.
+    """
+    if utc_offset is None:
+        utc_offset = -time.altzone if time.localtime().tm_isdst > 0 else -time.timezone
+    days = (runs["timestamp"].astype(np.int64) + int(utc_offset)) // 86400
+    scores = runs["score"].astype(np.float64)
+    if len(days) and (days[1:] >= days[:-1]).all():
+        # 追加顺序就是时间顺序，每天的记录是连续的一段，不需要排序
+        starts = np.flatnonzero(np.diff(days)) + 1
+        starts = np.concatenate(([0], starts))
+        unique, totals = days[starts], np.add.reduceat(scores, starts)
+        counts = np.diff(np.append(starts, len(days)))
+    else:
+        unique, inverse, counts = np.unique(days, return_inverse=True, return_counts=True)
+        totals = np.bincount(inverse, weights=scores, minlength=len(unique))
+    return unique * 86400 - int(utc_offset), totals / np.maximum(counts, 1), counts
+
+
+def score_distribution(runs: np.ndarray, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """Histogram of scores as (counts, bin edges)"""
+    return np.histogram(runs["score"], bins=bins)
@@ -0,0 +1,291 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote, unquote
+
+SQLITE_FILE = "saves.db"
+DEFAULT_PROFILE = "default"
+PROFILE_SUFFIX = ".json"
+
+
+def write_json_atomic(path: str, data):
+    """Write to a temp file and rename it over path, so a crash never leaves a truncated file"""
+    temp_file = path + '.tmp'
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def index_entry(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {'high_score': data.get('high_score', 0), 'last_played': data.get('last_save')}
+
+
+class JsonBackend:
+    """One JSON file per profile plus a small profile index.
+
+    The default profile stays in save_data.json (the original format); other
+    profiles live in profiles/<name>.json. profiles.json holds only
+    each profile's name, high score and last-played time, so listing
+    profiles never opens the profile files. Runs are not stored here; the
+    run history log keeps them instead.
+    """
+
+    def __init__(self, save_dir: str):
+        self.save_dir = save_dir
+        self.save_file = os.path.join(save_dir, "save_data.json")
+        self.profile_dir = os.path.join(save_dir, "profiles")
+        self.index_file = os.path.join(save_dir, "profiles.json")
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._index_lock = threading.Lock()
+
+    def profile_file(self, profile: str) -> str:
+        if profile == DEFAULT_PROFILE:
+            return self.save_file
+        return os.path.join(self.profile_dir, quote(profile, safe='') + PROFILE_SUFFIX)
+
+    def load(self, profile: str) -> Optional[Dict[str, Any]]:
+        return self._read(self.profile_file(profile))
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, profile: str, data: Dict[str, Any], runs: List[Dict[str, Any]]):
+        if profile != DEFAULT_PROFILE:
+            os.makedirs(self.profile_dir, exist_ok=True)
+        write_json_atomic(self.profile_file(profile), data)
+        with self._index_lock:
+            index = self._load_index()
+            if index.get(profile) != index_entry(data):
+                index[profile] = index_entry(data)
+                write_json_atomic(self.index_file, index)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """The cached index; read from disk once, rebuilt from the profile files if it is missing"""
+        if self._index is None:
+            self._index = self._read(self.index_file)
+            if self._index is None:
+                self._index = {}
+                names = [DEFAULT_PROFILE]
+                if os.path.isdir(self.profile_dir):
+                    names += [unquote(name[:-len(PROFILE_SUFFIX)]) for name in os.listdir(self.profile_dir)
+                              if name.endswith(PROFILE_SUFFIX)]
+                for name in names:
+                    data = self._read(self.profile_file(name))
+                    if data is not None:
+                        self._index[name] = index_entry(data)
+        return self._index
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Name, high score and last-played time of every profile, most recently played first"""
+        with self._index_lock:
+            profiles = [{'name': name, **entry} for name, entry in self._load_index().items()]
+        profiles.sort(key=lambda p: p['last_played'] or '', reverse=True)
+        return profiles
+
+    def leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
+        profiles = sorted(self.list_profiles(), key=lambda p: p['high_score'], reverse=True)
+        return [{'name': p['name'], 'high_score': p['high_score']} for p in profiles[:limit]]
+
+    def best_runs(self, profile: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return []
+
+    def close(self):
+        pass
+
+
+class SqliteBackend:
+    """Profiles, achievements and runs in indexed tables of one SQLite file.
+
+    The database runs in WAL mode so the save-writer thread can commit while
+    the game thread reads. Each thread gets its own connection; the SQL
+    strings are constants, so sqlite3's statement cache reuses the prepared
+    statements.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            high_score INTEGER NOT NULL DEFAULT 0,
+            total_stars_collected INTEGER NOT NULL DEFAULT 0,
+            total_games_played INTEGER NOT NULL DEFAULT 0,
+            last_save TEXT,
+            statistics TEXT NOT NULL DEFAULT '{}',
+            extra TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS profiles_high_score ON profiles (high_score DESC);
+        CREATE INDEX IF NOT EXISTS profiles_last_save ON profiles (last_save DESC);
+        CREATE TABLE IF NOT EXISTS achievements (
+            profile_id INTEGER NOT NULL REFERENCES profiles (id),
+            achievement_id TEXT NOT NULL,
+            unlocked_at TEXT,
+            data TEXT NOT NULL DEFAULT '{}',
+            PRIMARY KEY (profile_id, achievement_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            profile_id INTEGER NOT NULL REFERENCES profiles (id),
+            timestamp REAL NOT NULL,
+            seed INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            stars INTEGER NOT NULL,
+            obstacles_avoided INTEGER NOT NULL,
+            max_speed REAL NOT NULL,
+            duration REAL NOT NULL,
+            cause TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS runs_profile_score ON runs (profile_id, score DESC);
+    """
+    COLUMNS = ('high_score', 'total_stars_collected', 'total_games_played', 'last_save', 'statistics')
+    RUN_COLUMNS = ('timestamp', 'seed', 'score', 'stars', 'obstacles_avoided', 'max_speed', 'duration', 'cause')
+
+    def __init__(self, save_dir: str, filename: str = SQLITE_FILE):
+        self.save_dir = save_dir
+        self.path = os.path.join(save_dir, filename)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        with self.connection() as db:
+            db.executescript(self.SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            self._local.db = db
+            with self._lock:
+                self._connections.append(db)
+        return db
+
+    def has_profile(self, profile: str) -> bool:
+        row = self.connection().execute("SELECT 1 FROM profiles WHERE name = ?", (profile,)).fetchone()
+        return row is not None
+
+    def load(self, profile: str) -> Optional[Dict[str, Any]]:
+        db = self.connection()
+        row = db.execute(
+            "SELECT id, high_score, total_stars_collected, total_games_played, last_save, statistics, extra"
+            " FROM profiles WHERE name = ?", (profile,)).fetchone()
+        if row is None:
+            return None
+        profile_id, high_score, stars, games, last_save, statistics, extra = row
+        data = json.loads(extra)
+        data.update({
+            'high_score': high_score,
+            'total_stars_collected': stars,
+            'total_games_played': games,
+            'statistics': json.loads(statistics),
+            'achievements': {
+                achievement_id: {**json.loads(achievement), 'unlocked_at': unlocked_at}
+                for achievement_id, unlocked_at, achievement in db.execute(
+                    "SELECT achievement_id, unlocked_at, data FROM achievements WHERE profile_id = ?",
+                    (profile_id,))
+            },
+        })
+        if last_save is not None:
+            data['last_save'] = last_save
+        return data
+
+    def save(self, profile: str, data: Dict[str, Any], runs: List[Dict[str, Any]]):
+        extra = {k: v for k, v in data.items() if k not in self.COLUMNS and k != 'achievements'}
+        with self.connection() as db:
+            db.execute(
+                "INSERT INTO profiles (name, high_score, total_stars_collected, total_games_played,"
+                " last_save, statistics, extra) VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET high_score = excluded.high_score,"
+                " total_stars_collected = excluded.total_stars_collected,"
+                " total_games_played = excluded.total_games_played, last_save = excluded.last_save,"
+                " statistics = excluded.statistics, extra = excluded.extra",
+                (profile, data.get('high_score', 0), data.get('total_stars_collected', 0),
+                 data.get('total_games_played', 0), data.get('last_save'),
+                 json.dumps(data.get('statistics', {}), ensure_ascii=False), json.dumps(extra, ensure_ascii=False)))
+            profile_id = db.execute("SELECT id FROM profiles WHERE name = ?", (profile,)).fetchone()[0]
+            # 成就只会增加，已有的行保持不变
+            db.executemany(
+                "INSERT OR IGNORE INTO achievements (profile_id, achievement_id, unlocked_at, data)"
+                " VALUES (?, ?, ?, ?)",
+                [(profile_id, achievement_id, achievement.get('unlocked_at'),
+                  json.dumps({k: v for k, v in achievement.items() if k != 'unlocked_at'}, ensure_ascii=False))
+                 for achievement_id, achievement in data.get('achievements', {}).items()])
+            db.executemany(
+                "INSERT INTO runs (profile_id, timestamp, seed, score, stars, obstacles_avoided,"
+                " max_speed, duration, cause) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(profile_id, *(run[column] for column in self.RUN_COLUMNS)) for run in runs])
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Name, high score and last-played time of every profile, without loading their data"""
+        rows = self.connection().execute("SELECT name, high_score, last_save FROM profiles ORDER BY last_save DESC")
+        return [{'name': name, 'high_score': high_score, 'last_played': last_save}
+                for name, high_score, last_save in rows]
+
+    def leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Profiles by high score, read through the high_score index"""
+        rows = self.connection().execute(
+            "SELECT name, high_score FROM profiles ORDER BY high_score DESC LIMIT ?", (limit,))
+        return [{'name': name, 'high_score': high_score} for name, high_score in rows]
+
+    def best_runs(self, profile: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """A profile's highest-scoring runs, read through the (profile_id, score) index"""
+        rows = self.connection().execute(
+            "SELECT timestamp, seed, score, stars, obstacles_avoided, max_speed, duration, cause FROM runs"
+            " WHERE profile_id = (SELECT id FROM profiles WHERE name = ?) ORDER BY score DESC LIMIT ?",
+            (profile, limit))
+        return [dict(zip(self.RUN_COLUMNS, row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for db in connections:
+            db.close()
+        self._local = threading.local()
+
+
+BACKENDS = {'json': JsonBackend, 'sqlite': SqliteBackend}
+
+
+def open_backend(kind: str, save_dir: str):
+    if kind not in BACKENDS:
+        raise ValueError(f"unknown save backend {kind!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[kind](save_dir)
+
+
+def migrate_json(save_dir: str, backend) -> List[str]:
+    """Import every JSON profile into backend once; each file is renamed afterwards.
+
+    Covers save_data.json and every profile under profiles/ (found through
+    profiles.json, rebuilt from the files if it is missing). Profiles that
+    already exist in the backend are left alone. Returns the names of the
+    profiles migrated.
+    """
+    source = JsonBackend(save_dir)
+    if isinstance(backend, JsonBackend):
+        return []
+    migrated = []
+    for entry in source.list_profiles():
+        name = entry['name']
+        path = source.profile_file(name)
+        if not os.path.exists(path) or backend.has_profile(name):
+            continue
+        backend.save(name, source.load(name), [])
+        os.replace(path, path + '.migrated')
+        migrated.append(name)
+    if migrated and os.path.exists(source.index_file):
+        # 档案文件已改名，索引失效；JSON 后端再次使用时会从剩下的文件重建
+        os.replace(source.index_file, source.index_file + '.migrated')
+    return migrated
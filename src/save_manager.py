@@ -1,40 +1,228 @@
-﻿import json
+﻿import atexit
+import copy
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
+
+from src.save_backends import DEFAULT_PROFILE, migrate_json, open_backend
+
+class SaveWriter:
+    """Runs save writes on a single background thread.
+
+    Only the newest submitted snapshot is kept, so a burst of saves while a
+    write is in progress costs one more write rather than one per save.
+    """
+
+    def __init__(self, write: Callable[[Dict[str, Any]], None]):
+        self._write = write
+        self._cond = threading.Condition()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, snapshot: Dict[str, Any]):
+        """Queue a snapshot; the caller must not modify it afterwards"""
+        with self._cond:
+            if not self._closed:
+                self._pending = snapshot
+                self._cond.notify_all()
+                return
+        # 线程已经停止（例如退出流程中），直接同步写入
+        self._write_logged(snapshot)
+
+    def wait(self):
+        """Block until every submitted snapshot has been written"""
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    def close(self):
+        """Write what is pending and stop the thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _write_logged(self, snapshot: Dict[str, Any]):
+        try:
+            self._write(snapshot)
+        except Exception as e:
+            print(f"Save failed: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                snapshot, self._pending = self._pending, None
+                self._busy = True
+            self._write_logged(snapshot)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
 
 class SaveManager:
-    def __init__(self, save_dir: str = "game_data"):
+    """Save data held in memory and written back to save_data.json.
+
+    The file is parsed once. Mutators change the in-memory state and mark it
+    dirty; outside a transaction() each change is flushed right away, inside
+    one the flush happens once when the outermost transaction ends. A flush
+    only copies the state and hands it to a SaveWriter, so the game loop
+    never waits on the disk; close() (also run at exit) drains the writer.
+
+    Storage is a backend from src.save_backends ("json" or "sqlite"). The
+    first time the sqlite backend opens a directory that still has a
+    save_data.json, the JSON save is migrated into it.
+
+    Each profile is stored separately. Only the selected profile is read,
+    and only when its data is first used; profiles() lists the others from
+    the backend's lightweight index.
+    """
+
+    def __init__(self, save_dir: str = "game_data", backend: str = "json", profile: str = DEFAULT_PROFILE):
         self.save_dir = save_dir
         self.save_file = os.path.join(save_dir, "save_data.json")
+        self.profile = profile
         self.ensure_save_dir()
+        self.backend = open_backend(backend, save_dir)
+        migrated = migrate_json(save_dir, self.backend)
+        if migrated:
+            print(f"已将 JSON 存档迁移到 {backend}: {', '.join(migrated)}")
+        # 每局结果先暂存在游戏线程，flush 时移到 _runs，再由写入线程取走
+        self._staged_runs: List[Dict[str, Any]] = []
+        self._runs: List[Dict[str, Any]] = []
+        self._runs_lock = threading.Lock()
+        self._data: Optional[Dict[str, Any]] = None
+        self.dirty = False
+        self._depth = 0
+        self.writer = SaveWriter(self._write)
+        atexit.register(self.close)
         
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+    
+    @data.setter
+    def data(self, value: Dict[str, Any]):
+        self._data = value
+    
+    def profiles(self) -> List[Dict[str, Any]]:
+        """Name, high score and last-played time of every saved profile, most recent first"""
+        return self.backend.list_profiles()
+    
+    def select_profile(self, profile: str):
+        """Switch to another profile (a new name starts a new one); its data is read on first use"""
+        if self._depth:
+            raise RuntimeError("cannot switch profiles inside a transaction")
+        if profile == self.profile:
+            return
+        # 先把当前档案写完，写入线程之后只会写新档案
+        self.flush()
+        self.wait()
+        self.profile = profile
+        self._data = None
+        self.dirty = False
+    
     def ensure_save_dir(self):
         if not os.path.exists(self.save_dir):
             os.makedirs(self.save_dir)
     
-    def save_game_data(self, data: Dict[str, Any]):
-        try:
-            save_data = self.load_game_data()
-            save_data.update(data)
-            save_data['last_save'] = datetime.now().isoformat()
-            
-            with open(self.save_file, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"Save failed: {e}")
-    
-    def load_game_data(self) -> Dict[str, Any]:
+    def _read(self) -> Dict[str, Any]:
         try:
-            if os.path.exists(self.save_file):
-                with open(self.save_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                return self.get_default_save_data()
+            data = self.backend.load(self.profile)
+            return self.get_default_save_data() if data is None else data
         except Exception as e:
             print(f"Load failed: {e}")
             return self.get_default_save_data()
     
+    def _write(self, data: Dict[str, Any]):
+        """Runs on the writer thread; also takes the runs recorded since the last write"""
+        with self._runs_lock:
+            runs, self._runs = self._runs, []
+        try:
+            self.backend.save(self.profile, data, runs)
+        except BaseException:
+            with self._runs_lock:
+                self._runs[:0] = runs
+            raise
+    
+    def reload(self):
+        """Drop unsaved changes and re-read the file"""
+        self.wait()
+        self.data = self._read()
+        self.dirty = False
+    
+    def flush(self) -> bool:
+        """Queue a write if the state changed since the last flush; returns whether it queued one"""
+        if not self.dirty:
+            return False
+        self.data['last_save'] = datetime.now().isoformat()
+        if self._staged_runs:
+            with self._runs_lock:
+                self._runs.extend(self._staged_runs)
+            self._staged_runs = []
+        self.writer.submit(copy.deepcopy(self.data))
+        self.dirty = False
+        return True
+    
+    def wait(self):
+        """Block until queued writes are on disk"""
+        self.writer.wait()
+    
+    def close(self):
+        self.flush()
+        self.writer.close()
+        self.backend.close()
+        atexit.unregister(self.close)
+    
+    def leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Profiles by high score, as written so far"""
+        return self.backend.leaderboard(limit)
+    
+    def best_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """This profile's best recorded runs, as written so far (the JSON backend keeps none)"""
+        return self.backend.best_runs(self.profile, limit)
+    
+    @contextmanager
+    def transaction(self):
+        """Batch mutations into one write; an exception rolls the state back"""
+        snapshot = copy.deepcopy(self.data) if self._depth == 0 else None
+        staged = len(self._staged_runs)
+        dirty = self.dirty
+        self._depth += 1
+        try:
+            yield self.data
+        except BaseException:
+            if snapshot is not None:
+                self.data, self.dirty = snapshot, dirty
+                del self._staged_runs[staged:]
+            raise
+        finally:
+            self._depth -= 1
+        if self._depth == 0:
+            self.flush()
+    
+    def _changed(self):
+        self.dirty = True
+        if self._depth == 0:
+            self.flush()
+    
+    def save_game_data(self, data: Dict[str, Any]):
+        self.data.update(data)
+        self._changed()
+    
+    def load_game_data(self) -> Dict[str, Any]:
+        """The in-memory save state; change it through the mutators, not in place"""
+        return self.data
+    
     def get_default_save_data(self) -> Dict[str, Any]:
         return {
             'high_score': 0,
@@ -50,43 +238,39 @@ class SaveManager:
         }
     
     def update_high_score(self, score: int) -> bool:
-        data = self.load_game_data()
-        if score > data.get('high_score', 0):
-            data['high_score'] = score
-            self.save_game_data(data)
+        if score > self.data.get('high_score', 0):
+            self.data['high_score'] = score
+            self._changed()
             return True
         return False
     
     def add_stars(self, stars: int):
-        data = self.load_game_data()
-        data['total_stars_collected'] = data.get('total_stars_collected', 0) + stars
-        self.save_game_data(data)
+        self.data['total_stars_collected'] = self.data.get('total_stars_collected', 0) + stars
+        self._changed()
+    
+    def record_run(self, run: Dict[str, Any]):
+        """Queue one finished run (the fields of src.run_history records) for the backend"""
+        self._staged_runs.append(dict(run))
+        self._changed()
     
     def increment_games_played(self):
-        data = self.load_game_data()
-        data['total_games_played'] = data.get('total_games_played', 0) + 1
-        self.save_game_data(data)
+        self.data['total_games_played'] = self.data.get('total_games_played', 0) + 1
+        self._changed()
     
     def update_statistics(self, stats: Dict[str, Any]):
-        data = self.load_game_data()
-        if 'statistics' not in data:
-            data['statistics'] = {}
-        data['statistics'].update(stats)
-        self.save_game_data(data)
+        self.data.setdefault('statistics', {}).update(stats)
+        self._changed()
     
     def unlock_achievement(self, achievement_id: str, achievement_data: Dict[str, Any]):
-        data = self.load_game_data()
-        if 'achievements' not in data:
-            data['achievements'] = {}
-        if achievement_id not in data['achievements']:
-            data['achievements'][achievement_id] = {
+        achievements = self.data.setdefault('achievements', {})
+        if achievement_id not in achievements:
+            achievements[achievement_id] = {
                 **achievement_data,
                 'unlocked_at': datetime.now().isoformat()
             }
-            self.save_game_data(data)
+            self._changed()
             return True
         return False
     
     def is_achievement_unlocked(self, achievement_id: str) -> bool:
-        data = self.load_game_data()
-        return achievement_id in data.get('achievements', {})
+        return achievement_id in self.data.get('achievements', {})
@@ -0,0 +1,394 @@
+import math
+import random
+from typing import Iterable, List, Optional
+
+from src.lanes import Lane
+
+# 逻辑画面大小（像素风比例）
+WIDTH, HEIGHT = 480, 270
+GROUND_HEIGHT = 20
+FPS = 60
+
+# 物理参数
+GRAVITY = 0.5
+JUMP_STRENGTH = -10
+INITIAL_SPEED = 4
+SPEED_INCREASE = 0.2
+SPEED_INTERVAL = 600        # 帧，每10秒加速一次
+
+# 生成参数
+OBSTACLE_SPAWN_MS = 1500
+MIN_OBSTACLE_SPAWN_MS = 800
+STAR_INTERVAL = 180         # 帧
+STAR_CHANCE = 0.7
+CLOUD_INTERVAL = 120        # 帧
+
+# 分数
+POINTS_PER_OBSTACLE = 10
+POINTS_PER_STAR = 50
+
+OBSTACLE_TYPES = [
+    {'width': 12, 'height': 24, 'type': 'spike'},     # 细长尖刺
+    {'width': 20, 'height': 16, 'type': 'block'},     # 普通方块
+    {'width': 16, 'height': 32, 'type': 'spike'},     # 高尖刺
+    {'width': 24, 'height': 12, 'type': 'block'},     # 宽方块
+    {'width': 18, 'height': 18, 'type': 'saw'},       # 锯齿状
+    {'width': 14, 'height': 28, 'type': 'crystal'}    # 水晶障碍
+]
+
+
+class Rules:
+    """Tunable physics, spawn and scoring parameters of a World.
+
+    The defaults are the module constants above; ConfigManager snapshots
+    supply tuned values through from_config(). Runs are only reproducible
+    under the rules they were played with.
+    """
+    __slots__ = ('gravity', 'jump_strength', 'initial_speed', 'speed_increase', 'speed_interval',
+                 'obstacle_spawn_ms', 'min_obstacle_spawn_ms', 'star_interval', 'star_chance',
+                 'cloud_interval', 'points_per_obstacle', 'points_per_star')
+
+    def __init__(self, gravity=GRAVITY, jump_strength=JUMP_STRENGTH, initial_speed=INITIAL_SPEED,
+                 speed_increase=SPEED_INCREASE, speed_interval=SPEED_INTERVAL,
+                 obstacle_spawn_ms=OBSTACLE_SPAWN_MS, min_obstacle_spawn_ms=MIN_OBSTACLE_SPAWN_MS,
+                 star_interval=STAR_INTERVAL, star_chance=STAR_CHANCE, cloud_interval=CLOUD_INTERVAL,
+                 points_per_obstacle=POINTS_PER_OBSTACLE, points_per_star=POINTS_PER_STAR):
+        self.gravity = gravity
+        self.jump_strength = jump_strength
+        self.initial_speed = initial_speed
+        self.speed_increase = speed_increase
+        self.speed_interval = speed_interval
+        self.obstacle_spawn_ms = obstacle_spawn_ms
+        self.min_obstacle_spawn_ms = min_obstacle_spawn_ms
+        self.star_interval = star_interval
+        self.star_chance = star_chance
+        self.cloud_interval = cloud_interval
+        self.points_per_obstacle = points_per_obstacle
+        self.points_per_star = points_per_star
+
+    @classmethod
+    def from_config(cls, config) -> "Rules":
+        """Rules from the physics and gameplay sections of a config snapshot"""
+        physics, gameplay = config.physics, config.gameplay
+        return cls(gravity=physics.gravity, jump_strength=physics.jump_strength,
+                   initial_speed=physics.initial_obstacle_speed, speed_increase=physics.speed_increase_rate,
+                   speed_interval=physics.speed_increase_interval,
+                   obstacle_spawn_ms=gameplay.obstacle_spawn_rate,
+                   min_obstacle_spawn_ms=gameplay.min_obstacle_spawn_rate,
+                   star_interval=gameplay.star_spawn_rate, star_chance=gameplay.star_spawn_chance,
+                   cloud_interval=gameplay.cloud_spawn_rate, points_per_obstacle=gameplay.points_per_obstacle,
+                   points_per_star=gameplay.points_per_star)
+
+
+DEFAULT_RULES = Rules()
+
+
+def ms_to_frames(ms: int) -> int:
+    """Convert a millisecond interval to a whole number of simulation frames"""
+    return max(1, round(ms * FPS / 1000))
+
+
+def overlaps(a, b) -> bool:
+    """Axis-aligned bounding box test between two entities"""
+    return (a.x < b.x + b.width and
+            a.x + a.width > b.x and
+            a.y < b.y + b.height and
+            a.y + a.height > b.y)
+
+
+def _sweep_span(a0: float, a1: float, a_size: float, b0: float, b1: float, b_size: float):
+    """Open time interval in which two 1-D spans moving linearly from t=0 to t=1 overlap"""
+    d0 = b0 - a0
+    v = (b1 - a1) - d0
+    if v == 0:
+        return (-math.inf, math.inf) if -b_size < d0 < a_size else (math.inf, -math.inf)
+    t0 = (-b_size - d0) / v
+    t1 = (a_size - d0) / v
+    return (t0, t1) if v > 0 else (t1, t0)
+
+
+def time_of_impact(a, b) -> Optional[float]:
+    """Swept AABB test over one step.
+
+    Both entities move linearly from (prev_x, prev_y) to (x, y); returns the
+    earliest time in [0, 1] at which they overlap, or None. A pair that
+    overlaps at the end of the step always hits, so this never misses what
+    overlaps() would catch, but it also catches boxes that pass through each
+    other between two frames.
+    """
+    x0, x1 = _sweep_span(a.prev_x, a.x, a.width, b.prev_x, b.x, b.width)
+    y0, y1 = _sweep_span(a.prev_y, a.y, a.height, b.prev_y, b.y, b.height)
+    start, end = max(x0, y0), min(x1, y1)
+    if start < end and start < 1 and end > 0:
+        return max(start, 0.0)
+    return 1.0 if overlaps(a, b) else None
+
+
+class Player:
+    def __init__(self):
+        self.width = 16
+        self.height = 16
+        self.x = 50
+        self.ground_y = HEIGHT - self.height - GROUND_HEIGHT
+        self.y = self.ground_y
+        self.prev_x, self.prev_y = self.x, self.y
+        self.vel_y = 0
+        self.on_ground = True
+        self.animation_frame = 0
+        self.gravity = GRAVITY
+        self.jump_strength = JUMP_STRENGTH
+
+    def jump(self) -> bool:
+        if self.on_ground:
+            self.vel_y = self.jump_strength
+            self.on_ground = False
+            return True
+        return False
+
+    def update(self):
+        self.prev_y = self.y
+        self.vel_y += self.gravity
+        self.y += self.vel_y
+
+        # 碰到地面
+        if self.y >= self.ground_y:
+            self.y = self.ground_y
+            self.vel_y = 0
+            self.on_ground = True
+
+        # 更新动画
+        self.animation_frame += 0.2
+
+
+class Obstacle:
+    def __init__(self, rng=random):
+        chosen = rng.choice(OBSTACLE_TYPES)
+        self.width = chosen['width']
+        self.height = chosen['height']
+        self.type = chosen['type']
+        self.x = WIDTH
+        self.y = HEIGHT - self.height - GROUND_HEIGHT
+        self.prev_x, self.prev_y = self.x, self.y
+        self.animation_frame = 0
+
+    def update(self, speed: float):
+        self.prev_x = self.x
+        self.x -= speed
+        self.animation_frame += 0.1
+
+    def off_screen(self) -> bool:
+        return self.x + self.width < 0
+
+
+class Star:
+    def __init__(self, rng=random):
+        self.width = 8
+        self.height = 8
+        self.x = WIDTH + rng.randint(0, 100)
+        self.y = rng.randint(HEIGHT // 2, HEIGHT - 60)
+        self.prev_x, self.prev_y = self.x, self.y
+        self.animation_frame = 0
+        self.collected = False
+
+    def update(self, speed: float):
+        self.prev_x = self.x
+        self.x -= speed
+        self.animation_frame += 0.3
+
+    def off_screen(self) -> bool:
+        return self.x + self.width < 0
+
+    def impact(self, player) -> Optional[float]:
+        """Time within this step at which the player touches the star, or None"""
+        if self.collected:
+            return None
+        return time_of_impact(player, self)
+
+
+class Cloud:
+    def __init__(self, rng=random):
+        self.x = WIDTH + rng.randint(0, 100)
+        self.y = rng.randint(20, 80)
+        self.speed = rng.uniform(0.5, 1.5)
+        self.size = rng.randint(15, 25)
+
+    def update(self):
+        self.x -= self.speed
+
+    def off_screen(self) -> bool:
+        return self.x + self.size < 0
+
+
+class StepEvents:
+    """What happened during one World.step()"""
+    __slots__ = ('jumped', 'stars_collected', 'obstacles_passed', 'collisions', 'impact_time', 'speed_increased')
+
+    def __init__(self):
+        self.jumped = False
+        self.stars_collected: List[Star] = []
+        self.obstacles_passed = 0
+        self.collisions: List[Obstacle] = []   # 按接触时间排序
+        self.impact_time: Optional[float] = None
+        self.speed_increased = False
+
+    @property
+    def died(self) -> bool:
+        return bool(self.collisions)
+
+
+def new_seed() -> int:
+    return random.getrandbits(32)
+
+
+class World:
+    """State of one run, advanced one 60 Hz frame at a time by step(inputs).
+
+    Nothing here touches pygame, so worlds run headless and several can live
+    in one process. Entity classes are injectable so a renderer can
+    substitute subclasses that know how to draw themselves.
+
+    Every run has a seed. Everything that affects the outcome (obstacle
+    types, stars) draws from the gameplay stream ``rng``; clouds draw from a
+    separate cosmetic stream, so the seed plus the jump frames reproduce a
+    run exactly. Physics and spawn parameters come from ``rules``; a new
+    Rules takes effect at the next reset(), or at once through apply_rules().
+    """
+
+    def __init__(self, player_cls=Player, obstacle_cls=Obstacle, star_cls=Star, cloud_cls=Cloud,
+                 seed: Optional[int] = None, rules: Rules = DEFAULT_RULES):
+        self.rules = rules
+        self.player_cls = player_cls
+        self.obstacle_cls = obstacle_cls
+        self.star_cls = star_cls
+        self.cloud_cls = cloud_cls
+        self.clouds: List[Cloud] = []
+        self.cloud_timer = 0
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None):
+        """Start a new run (with a fresh seed unless one is given); clouds drift on across runs"""
+        self.seed = new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.cosmetic_rng = random.Random(f"cosmetic:{self.seed}")
+        self.run_rules = rules = self.rules
+        self.player = self.player_cls()
+        self.player.gravity = rules.gravity
+        self.player.jump_strength = rules.jump_strength
+        # 按 x 有序的通道；障碍物都在右边缘生成，星星的出生位置有随机偏移，用 add() 插入
+        self.obstacles = Lane()
+        self.stars = Lane()
+        self.speed = rules.initial_speed
+        self.max_speed = rules.initial_speed
+        self.score = 0
+        self.stars_collected = 0
+        self.obstacles_avoided = 0
+        self.frame = 0
+        self.speed_level = 0
+        self.obstacle_timer = 0
+        self.obstacle_interval = ms_to_frames(self.obstacle_spawn_ms())
+        self.star_timer = 0
+        self.difficulty_timer = 0
+        self.game_over = False
+
+    def apply_rules(self, rules: Rules):
+        """Switch the current run to new rules mid-run (live tuning); such a run no longer replays"""
+        self.rules = self.run_rules = rules
+        self.player.gravity = rules.gravity
+        self.player.jump_strength = rules.jump_strength
+        self.obstacle_interval = ms_to_frames(self.obstacle_spawn_ms())
+
+    def obstacle_spawn_ms(self) -> int:
+        """Obstacle spawn interval at the current speed level"""
+        rules = self.run_rules
+        if self.speed_level == 0:
+            return rules.obstacle_spawn_ms
+        # 每次加速时 difficulty_timer 都等于 speed_interval + 1
+        return max(rules.min_obstacle_spawn_ms, rules.obstacle_spawn_ms - (rules.speed_interval + 1) // 60 * 50)
+
+    def step(self, inputs: Iterable[str] = ()) -> StepEvents:
+        """Advance one frame. ``inputs`` may contain 'jump'."""
+        events = StepEvents()
+        if self.game_over:
+            return events
+        self.frame += 1
+        player = self.player
+        rules = self.run_rules
+
+        # 生成障碍物
+        self.obstacle_timer += 1
+        if self.obstacle_timer >= self.obstacle_interval:
+            self.obstacles.append(self.obstacle_cls(self.rng))
+            self.obstacle_timer = 0
+
+        if 'jump' in inputs:
+            events.jumped = player.jump()
+
+        # 更新玩家、障碍物和星星
+        player.update()
+        for obs in self.obstacles:
+            obs.update(self.speed)
+        for star in self.stars:
+            star.update(self.speed)
+
+        # 碰撞检测：扫掠整个步长求接触时间，实体在两帧之间穿过玩家也能检测到
+        # （粗筛范围向左扩展一个步长的移动距离）
+        x0, x1 = player.x - self.speed - 1, player.x + player.width + 1
+        impacts = []
+        for obs in self.obstacles.overlapping(x0, x1):
+            toi = time_of_impact(player, obs)
+            if toi is not None:
+                impacts.append((toi, obs))
+        impacts.sort(key=lambda impact: impact[0])
+        death = impacts[0][0] if impacts else math.inf
+
+        # 检查星星收集（撞上障碍物之前碰到的才算）
+        for star in self.stars.overlapping(x0, x1):
+            toi = star.impact(player)
+            if toi is not None and toi <= death:
+                star.collected = True
+                self.stars_collected += 1
+                self.score += rules.points_per_star
+                events.stars_collected.append(star)
+
+        # 移除屏幕外障碍物并增加分数
+        events.obstacles_passed = self.obstacles.cull()
+        self.obstacles_avoided += events.obstacles_passed
+        self.score += events.obstacles_passed * rules.points_per_obstacle
+
+        # 移除屏幕外的星星
+        self.stars.cull()
+
+        # 生成星星
+        self.star_timer += 1
+        if self.star_timer > rules.star_interval:
+            if self.rng.random() < rules.star_chance:
+                self.stars.add(self.star_cls(self.rng))
+            self.star_timer = 0
+
+        # 更新云朵
+        self.cloud_timer += 1
+        if self.cloud_timer > rules.cloud_interval:
+            self.clouds.append(self.cloud_cls(self.cosmetic_rng))
+            self.cloud_timer = 0
+        for cloud in self.clouds:
+            cloud.update()
+        # 云朵速度各不相同，不保持 x 顺序，仍然整体过滤
+        self.clouds = [cloud for cloud in self.clouds if not cloud.off_screen()]
+
+        # 增加难度（生成间隔的计时同时重新开始）
+        self.difficulty_timer += 1
+        if self.difficulty_timer > rules.speed_interval:
+            self.speed += rules.speed_increase
+            self.max_speed = max(self.max_speed, self.speed)
+            self.speed_level += 1
+            self.obstacle_interval = ms_to_frames(self.obstacle_spawn_ms())
+            self.obstacle_timer = 0
+            self.difficulty_timer = 0
+            events.speed_increased = True
+
+        if impacts:
+            events.collisions = [obs for _, obs in impacts]
+            events.impact_time = death
+            self.game_over = True
+
+        return events
@@ -0,0 +1,68 @@
+import os
+import time
+from typing import List, Optional, Tuple
+
+# 从进程启动到第一帧显示的目标时间
+TARGET_MS = 300
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process started (Linux /proc, 10 ms resolution), or None if unknown"""
+    try:
+        with open('/proc/self/stat') as f:
+            stat = f.read()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        # 进程名里可能有空格，从最后一个 ')' 之后数字段；starttime 是第 22 个字段
+        start_ticks = int(stat[stat.rindex(')') + 2:].split()[19])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupTimer:
+    """Wall time of each startup phase, up to the first presented frame.
+
+    mark(name) closes the phase that ran since the previous mark; finish()
+    closes the last one and freezes the timings. The first phase starts at
+    process start where the OS reports it, otherwise when this module was
+    imported.
+    """
+
+    def __init__(self, age: Optional[float] = None):
+        now = time.perf_counter()
+        if age is None:
+            age = process_age() or 0.0
+        self.start = now - age
+        self.last = self.start
+        self.phases: List[Tuple[str, float]] = []
+        self.finished = False
+
+    def mark(self, name: str):
+        if self.finished:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def finish(self, name: str = "first frame") -> bool:
+        """Close the last phase; returns False if startup had already finished"""
+        if self.finished:
+            return False
+        self.mark(name)
+        self.finished = True
+        return True
+
+    @property
+    def total(self) -> float:
+        return self.last - self.start
+
+    def report(self) -> str:
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases)
+        total_ms = self.total * 1000
+        verdict = "ok" if total_ms <= TARGET_MS else "over target"
+        return f"Startup {total_ms:.0f} ms ({verdict}, target {TARGET_MS} ms): {phases}"
+
+
+# 整个进程共用一个计时器，游戏在各阶段结束时调用 mark()
+STARTUP = StartupTimer()
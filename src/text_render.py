@@ -0,0 +1,116 @@
+import string
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+ATLAS_CHARSET = ''.join(ch for ch in string.printable if ch not in '\t\n\r\x0b\x0c')
+
+
+class GlyphAtlas:
+    """All printable ASCII glyphs of a font rasterized once into one surface.
+
+    Strings are composed by copying glyph cells out of a per-color tinted copy
+    of the atlas, so the font rasterizer is only called while building it.
+    """
+
+    def __init__(self, font: pygame.font.Font, charset: str = ATLAS_CHARSET):
+        self.font = font
+        self.glyphs: Dict[str, pygame.Rect] = {}
+        self.kerning: Dict[str, int] = {}
+        x = 0
+        cells = []
+        for ch in charset:
+            glyph = font.render(ch, True, (255, 255, 255))
+            self.glyphs[ch] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            cells.append((glyph, x))
+            x += glyph.get_width()
+        self.height = max(cell.height for cell in self.glyphs.values())
+        self.surface = pygame.Surface((max(1, x), self.height), pygame.SRCALPHA)
+        for glyph, gx in cells:
+            self.surface.blit(glyph, (gx, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        self.tinted: Dict[Tuple[int, ...], pygame.Surface] = {}
+
+    def supports(self, text: str) -> bool:
+        return all(ch in self.glyphs for ch in text)
+
+    def tint(self, color) -> pygame.Surface:
+        key = tuple(color)
+        atlas = self.tinted.get(key)
+        if atlas is None:
+            atlas = self.surface.copy()
+            atlas.fill((*key[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+            self.tinted[key] = atlas
+        return atlas
+
+    def kern(self, pair: str) -> int:
+        """Kerning adjustment between two glyphs (measured once, no rasterizing)"""
+        offset = self.kerning.get(pair)
+        if offset is None:
+            offset = self.font.size(pair)[0] - self.glyphs[pair[0]].width - self.glyphs[pair[1]].width
+            self.kerning[pair] = offset
+        return offset
+
+    def render(self, text: str, color) -> pygame.Surface:
+        """Compose text from atlas cells; every character must be supported"""
+        atlas = self.tint(color)
+        positions = []
+        x = 0
+        height = 1
+        for i, ch in enumerate(text):
+            if i:
+                x += self.kern(text[i - 1:i + 1])
+            cell = self.glyphs[ch]
+            positions.append((x, cell))
+            x += cell.width
+            height = max(height, cell.height)
+        surface = pygame.Surface((max(1, x), height), pygame.SRCALPHA)
+        for gx, cell in positions:
+            # MAX onto the cleared surface copies cells and merges kerned overlaps
+            surface.blit(atlas, (gx, 0), cell, special_flags=pygame.BLEND_RGBA_MAX)
+        return surface
+
+
+class CachedFont:
+    """Drop-in replacement for pygame.font.Font.render with an LRU string cache.
+
+    Misses are composed from a GlyphAtlas built lazily on first use; strings
+    the atlas can't represent fall back to the wrapped font.
+    """
+
+    def __init__(self, font: pygame.font.Font, capacity: int = 256):
+        self.font = font
+        self.capacity = capacity
+        self.cache: OrderedDict = OrderedDict()
+        self.atlas: Optional[GlyphAtlas] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # size(), get_height(), get_linesize()... come from the wrapped font
+        return getattr(self.font, name)
+
+    def render(self, text: str, antialias: bool, color, background=None) -> pygame.Surface:
+        key = (text, antialias, tuple(color), None if background is None else tuple(background))
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if antialias and background is None:
+            if self.atlas is None:
+                self.atlas = GlyphAtlas(self.font)
+            if self.atlas.supports(text):
+                surface = self.atlas.render(text, color)
+        if surface is None:
+            surface = self.font.render(text, antialias, color, background)
+
+        self.cache[key] = surface
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.cache.clear()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.achievements import Achievement, AchievementManager, ThresholdIndex, load_achievements
+from src.save_manager import SaveManager
+
+ACHIEVEMENTS_FILE = os.path.join(os.path.dirname(__file__), '..', 'config', 'achievements.json')
+
+
+class TestThresholdIndex(unittest.TestCase):
+    def test_crossed_returns_all_at_once(self):
+        """一次查询返回所有越过阈值的成就，并从索引中移除"""
+        index = ThresholdIndex()
+        for threshold in (500, 100, 1000, 250):
+            index.add(Achievement(f'score_{threshold}', '', '', threshold=threshold))
+        self.assertEqual([a.id for a in index.crossed(99)], [])
+        self.assertEqual([a.id for a in index.crossed(500)], ['score_100', 'score_250', 'score_500'])
+        self.assertEqual([a.id for a in index.crossed(600)], [])
+        self.assertEqual(len(index), 1)
+
+    def test_comparisons(self):
+        """严格与非严格比较，以及越小越满足的比较"""
+        index = ThresholdIndex()
+        for comparison in ('>=', '>', '<=', '<'):
+            index.add(Achievement(comparison, '', '', comparison=comparison, threshold=10))
+        self.assertEqual(sorted(a.id for a in index.crossed(10)), ['<=', '>='])
+        self.assertEqual([a.id for a in index.crossed(10.5)], ['>'])
+        self.assertEqual([a.id for a in index.crossed(9)], ['<'])
+
+    def test_matches_met(self):
+        """索引的结果与逐个判断一致"""
+        achievements = [Achievement(str(i), '', '', comparison=('>=', '>', '<=', '<')[i % 4], threshold=i % 37)
+                        for i in range(400)]
+        for value in (-1, 0, 5, 17.5, 36, 40):
+            index = ThresholdIndex()
+            for achievement in achievements:
+                index.add(achievement)
+            expected = {a.id for a in achievements if a.met(value)}
+            self.assertEqual({a.id for a in index.crossed(value)}, expected)
+
+
+class TestDefinitions(unittest.TestCase):
+    def test_data_file(self):
+        """成就定义从数据文件读取"""
+        achievements = load_achievements(ACHIEVEMENTS_FILE)
+        self.assertIn('first_100', achievements)
+        self.assertEqual(achievements['stargazer'].scope, 'lifetime')
+
+    def test_invalid(self):
+        """无效的定义会报错"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'achievements.json')
+            for definition in ({'id': 'a', 'name': '', 'description': '', 'comparison': '=='},
+                               {'id': 'a', 'name': '', 'description': '', 'scope': 'forever'},
+                               {'id': 'a', 'name': '', 'description': '', 'colour': 'red'}):
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump([definition], f)
+                with self.assertRaises(ValueError):
+                    load_achievements(path)
+
+
+class TestAchievementManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.save_manager = SaveManager(self.tmp.name)
+        self.manager = AchievementManager(self.save_manager, ACHIEVEMENTS_FILE)
+
+    def tearDown(self):
+        self.save_manager.close()
+        self.tmp.cleanup()
+
+    def test_unlock_once(self):
+        """达到条件时解锁，之后不再重复解锁"""
+        unlocked = self.manager.check_achievements({'score': 120, 'max_speed': 6})
+        self.assertEqual([a.id for a in unlocked], ['first_100'])
+        self.assertTrue(self.save_manager.is_achievement_unlocked('first_100'))
+        self.assertEqual(self.manager.check_achievements({'score': 130, 'max_speed': 6}), [])
+
+    def test_lifetime_scope(self):
+        """累计成就读取存档数据，包括嵌套的统计项"""
+        self.save_manager.add_stars(99)
+        self.assertEqual(self.manager.check_achievements({'total_stars_collected': 500}), [])
+        self.save_manager.add_stars(1)
+        self.save_manager.update_statistics({'obstacles_avoided': 1000})
+        unlocked = self.manager.check_achievements({})
+        self.assertEqual({a.id for a in unlocked}, {'stargazer', 'marathon'})
+
+    def test_state_loaded_from_save(self):
+        """新的管理器从存档中读取已解锁的成就"""
+        self.manager.check_achievements({'score': 600})
+        other = AchievementManager(self.save_manager, ACHIEVEMENTS_FILE)
+        self.assertEqual({a.id for a in other.get_unlocked_achievements()}, {'first_100', 'score_500'})
+        self.assertEqual([a.id for a in other.check_achievements({'score': 2000})], ['score_1000'])
+
+    def test_progress_cached(self):
+        """进度信息在解锁前保持缓存，解锁后更新"""
+        progress = self.manager.get_progress_info()
+        self.assertIs(self.manager.get_progress_info(), progress)
+        self.assertEqual(progress['unlocked'], 0)
+        self.manager.check_achievements({'max_speed': 10})
+        self.assertEqual(self.manager.get_progress_info()['unlocked'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import os
+import sys
+import random
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from src.batch_world import BatchWorld, slot_counts
+from src.simulation import DEFAULT_RULES, OBSTACLE_TYPES, Rules, World
+
+
+class MirrorBatch(BatchWorld):
+    """用一组 World 本帧实际生成的实体代替随机数，逐局对照"""
+
+    def __init__(self, n, rules=DEFAULT_RULES):
+        self.spawned_obstacles = {}
+        self.spawned_stars = {}
+        super().__init__(n, rules=rules)
+
+    def _obstacle_types(self, runs):
+        return np.array([self.spawned_obstacles.get(run, 0) for run in runs], dtype=np.int64)
+
+    def _star_rolls(self, runs):
+        return np.array([0.0 if run in self.spawned_stars else 1.0 for run in runs])
+
+    def _star_positions(self, runs):
+        xs, ys = zip(*(self.spawned_stars[run] for run in runs))
+        return np.array(xs), np.array(ys)
+
+
+def type_index(obstacle):
+    for i, t in enumerate(OBSTACLE_TYPES):
+        if (t['width'], t['height'], t['type']) == (obstacle.width, obstacle.height, obstacle.type):
+            return i
+    raise AssertionError(obstacle.type)
+
+
+class TestBatchWorld(unittest.TestCase):
+    def check_lockstep(self, rules, n=40, frames=2500):
+        """逐帧对照 n 个 World 和同样规则下的 BatchWorld"""
+        worlds = [World(seed=seed, rules=rules) for seed in range(n)]
+        batch = MirrorBatch(n, rules)
+        inputs = random.Random(99)
+        for _ in range(frames):
+            # 障碍物靠近时跳跃，外加少量随机跳跃，让部分局活过加速
+            jump = np.array([any(0 < obs.x - world.player.x < 12 + run for obs in world.obstacles) or
+                             inputs.random() < 0.02 for run, world in enumerate(worlds)])
+            batch.spawned_obstacles.clear()
+            batch.spawned_stars.clear()
+            for run, world in enumerate(worlds):
+                obstacles, stars = set(map(id, world.obstacles)), set(map(id, world.stars))
+                world.step(('jump',) if jump[run] else ())
+                for obs in world.obstacles:
+                    if id(obs) not in obstacles:
+                        batch.spawned_obstacles[run] = type_index(obs)
+                for star in world.stars:
+                    if id(star) not in stars:
+                        batch.spawned_stars[run] = (star.x, star.y)
+
+            died = batch.step(jump)
+            self.assertEqual(died.sum(), sum(world.game_over and world.frame == batch.frame for world in worlds))
+            np.testing.assert_array_equal(batch.game_over, [world.game_over for world in worlds])
+            np.testing.assert_array_equal(batch.score, [world.score for world in worlds])
+            live = batch.ids[batch.live]
+            np.testing.assert_array_equal(batch.y[batch.live], [worlds[run].player.y for run in live])
+            np.testing.assert_array_equal(batch.vel_y[batch.live], [worlds[run].player.vel_y for run in live])
+
+        np.testing.assert_array_equal(batch.frames, [world.frame for world in worlds])
+        np.testing.assert_array_equal(batch.max_speed, [world.max_speed for world in worlds])
+        np.testing.assert_array_equal(batch.stars_collected, [world.stars_collected for world in worlds])
+        np.testing.assert_array_equal(batch.obstacles_avoided, [world.obstacles_avoided for world in worlds])
+        self.assertGreater(max(world.stars_collected for world in worlds), 0)
+        self.assertGreater(max(world.max_speed for world in worlds), rules.initial_speed)
+
+    def test_matches_world(self):
+        """与逐个对象模拟的结果逐帧完全一致"""
+        self.check_lockstep(DEFAULT_RULES)
+
+    def test_matches_world_tuned_rules(self):
+        """使用非默认规则时也与 World 逐帧一致"""
+        rules = Rules(gravity=0.4, jump_strength=-9, initial_speed=2.5, speed_increase=0.3, speed_interval=300,
+                      obstacle_spawn_ms=1200, min_obstacle_spawn_ms=600, star_interval=120, star_chance=0.8,
+                      points_per_obstacle=7, points_per_star=30)
+        self.assertGreater(slot_counts(rules), slot_counts(DEFAULT_RULES))
+        self.check_lockstep(rules)
+
+    def test_random_batch(self):
+        """随机生成时所有局最终都会结束，结果合理"""
+        batch = BatchWorld(500, rng=np.random.default_rng(3))
+        scores = batch.run(5000, jump_probability=0.05)
+        self.assertTrue(batch.game_over.all())
+        self.assertEqual(len(scores), 500)
+        self.assertTrue((scores >= 0).all())
+        self.assertTrue((batch.frames > 0).all())
+        np.testing.assert_array_equal(scores % 10, 0)
+
+    def test_same_seed_same_results(self):
+        """相同种子得到相同结果"""
+        results = [BatchWorld(200, rng=np.random.default_rng(5)).run(3000, 0.05) for _ in range(2)]
+        np.testing.assert_array_equal(results[0], results[1])
+
+    def test_reset(self):
+        """重置后所有局重新开始"""
+        batch = BatchWorld(50, rng=np.random.default_rng(0))
+        batch.run(3000)
+        batch.reset()
+        self.assertFalse(batch.game_over.any())
+        self.assertEqual(batch.frame, 0)
+        np.testing.assert_array_equal(batch.score, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+import types
+
+import pygame
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import benchmark
+from src.particles import ParticleSystem
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_summarize(self):
+        """统计值以毫秒为单位，百分位取最近秩"""
+        summary = benchmark.summarize([i / 1000 for i in range(1, 101)])
+        self.assertAlmostEqual(summary['mean_ms'], 50.5)
+        self.assertAlmostEqual(summary['p50_ms'], 50)
+        self.assertAlmostEqual(summary['p99_ms'], 99)
+        self.assertAlmostEqual(summary['max_ms'], 100)
+        self.assertEqual(summary['iterations'], 100)
+
+    def test_compare(self):
+        """只报告超过阈值的变慢，基线中没有的场景忽略"""
+        baseline = {'draw': {'p50_ms': 1.0}, 'update': {'p50_ms': 1.0}}
+        results = {'draw': {'p50_ms': 1.25}, 'update': {'p50_ms': 1.05}, 'particles': {'p50_ms': 9.0}}
+        regressions = benchmark.compare(results, baseline, threshold=0.1)
+        self.assertEqual(list(regressions), ['draw'])
+        self.assertAlmostEqual(regressions['draw'], 0.25)
+
+    def test_run_headless(self):
+        """无窗口运行场景，实体数量可以统一覆盖"""
+        results = benchmark.run(['update', 'draw_menu', 'save_game_over'], iterations=3, count=5, warmup=1)
+        self.assertEqual(results['update']['entities'], 5)
+        self.assertIsNone(results['draw_menu']['entities'])
+        for result in results.values():
+            self.assertEqual(result['iterations'], 3)
+            self.assertGreater(result['max_ms'], 0)
+
+    def test_particles_fixed_count(self):
+        """粒子场景每次测量前重新放入恰好 N 个存活粒子"""
+        frame = types.SimpleNamespace(canvas=pygame.Surface((480, 270)))
+        game = types.SimpleNamespace(particles=ParticleSystem(), frame=frame)
+        module = types.SimpleNamespace(WIDTH=480, HEIGHT=270)
+        op, prepare = benchmark.SCENARIOS['particles'].setup(module, game, 40)
+        for _ in range(3):
+            prepare()
+            self.assertEqual(len(game.particles), 40)
+            op()
+            self.assertEqual(len(game.particles), 40)
+
+    def test_iterations_must_be_positive(self):
+        """迭代次数为 0 时报参数错误"""
+        with open(os.devnull, 'w') as devnull:
+            stderr, sys.stderr = sys.stderr, devnull
+            try:
+                with self.assertRaises(SystemExit):
+                    benchmark.main(['-n', '0'])
+            finally:
+                sys.stderr = stderr
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import dataclasses
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config_manager import ConfigError, ConfigManager, changed_sections
+from src.simulation import Rules
+
+
+class TestConfigSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp.name, 'config', 'game_config.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, config):
+        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+    def test_typed_snapshot(self):
+        """快照各节是不可变的类型化数据类"""
+        self.write({'physics': {'gravity': 1, 'jump_strength': -8}, 'colors': {'sky': [1, 2, 3]}})
+        snapshot = ConfigManager(self.config_file).snapshot
+        self.assertEqual(snapshot.physics.gravity, 1.0)
+        self.assertIsInstance(snapshot.physics.gravity, float)
+        self.assertEqual(snapshot.colors.sky, (1, 2, 3))
+        self.assertEqual(snapshot.gameplay.obstacle_spawn_rate, 1500)  # 缺少的值使用默认值
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.physics.gravity = 2.0
+        self.assertFalse(hasattr(snapshot.physics, '__dict__'))
+
+        rules = Rules.from_config(snapshot)
+        self.assertEqual((rules.gravity, rules.jump_strength), (1.0, -8.0))
+
+    def test_invalid_values_use_defaults(self):
+        """文件中的非法值回退到默认值并记录错误"""
+        self.write({'physics': {'gravity': 'heavy'}, 'audio': {'master_volume': 3},
+                    'colors': {'player': [300, 0, 0]}, 'save': {'backend': 'xml'}})
+        manager = ConfigManager(self.config_file)
+        self.assertEqual(manager.snapshot.physics.gravity, 0.5)
+        self.assertEqual(manager.snapshot.audio.master_volume, 0.7)
+        self.assertEqual(manager.snapshot.colors.player, (33, 150, 243))
+        self.assertEqual(manager.snapshot.save.backend, 'json')
+        self.assertEqual(len(manager.errors), 4)
+
+    def test_edit_writes_once(self):
+        """批量修改结束时校验一次、写入一次"""
+        manager = ConfigManager(self.config_file)
+        writes = []
+        save = manager.save_config
+        manager.save_config = lambda: writes.append(1) or save()
+        with manager.edit():
+            manager.set('physics.gravity', 0.8)
+            manager.set('colors.sky', [0, 0, 0])
+            self.assertEqual(manager.snapshot.physics.gravity, 0.5)  # 结束前快照不变
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(manager.snapshot.physics.gravity, 0.8)
+        self.assertEqual(ConfigManager(self.config_file).snapshot.colors.sky, (0, 0, 0))
+
+    def test_invalid_edit_rolls_back(self):
+        """非法的修改整体回滚，不写文件"""
+        manager = ConfigManager(self.config_file)
+        with self.assertRaises(ConfigError):
+            with manager.edit():
+                manager.set('game.fps', 120)
+                manager.set('gameplay.star_spawn_chance', 2)
+        self.assertEqual(manager.get('game.fps'), 60)
+        self.assertEqual(manager.snapshot.game.fps, 60)
+        self.assertFalse(os.path.exists(self.config_file))
+
+
+
+class TestConfigReload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp.name, 'game_config.json')
+        self.manager = ConfigManager(self.config_file)
+        self.manager.save_config()
+        self.watcher = self.manager.watch(interval=60)  # 测试中手动调用 check()
+
+    def tearDown(self):
+        self.manager.close()
+        self.tmp.cleanup()
+
+    def rewrite(self, text):
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_reload_swaps_snapshot(self):
+        """文件修改后在 poll() 时换入新快照，并报告变化的配置节"""
+        self.rewrite(json.dumps({'gameplay': {'obstacle_spawn_rate': 1200}}))
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(self.manager.snapshot.gameplay.obstacle_spawn_rate, 1500)  # poll 之前不变
+        old, new = self.manager.poll()
+        self.assertEqual(new.gameplay.obstacle_spawn_rate, 1200)
+        self.assertIs(self.manager.snapshot, new)
+        self.assertEqual(changed_sections(old, new), {'gameplay'})
+        self.assertIsNone(self.manager.poll())
+        self.assertFalse(self.watcher.check())  # 文件没有再变化
+
+    def test_bad_file_keeps_snapshot(self):
+        """写了一半或含非法值的文件不会替换当前快照"""
+        snapshot = self.manager.snapshot
+        self.rewrite('{"physics": {"gravity": ')
+        self.assertFalse(self.watcher.check())
+        self.rewrite(json.dumps({'physics': {'gravity': -1}}))
+        self.assertFalse(self.watcher.check())
+        self.assertIsNone(self.manager.poll())
+        self.assertIs(self.manager.snapshot, snapshot)
+
+    def test_own_save_is_not_a_change(self):
+        """自己保存配置触发的重新加载不算变化"""
+        self.manager.set('save.profile', 'bob')
+        self.watcher.check()
+        self.assertIsNone(self.manager.poll())
+        self.assertEqual(self.manager.snapshot.save.profile, 'bob')
+
+    def test_set_keeps_pending_reload(self):
+        """已重新加载但还没 poll() 的外部修改不会被 set() 覆盖，之后仍会报告"""
+        self.rewrite(json.dumps({'gameplay': {'obstacle_spawn_rate': 1200}}))
+        self.assertTrue(self.watcher.check())
+        self.manager.set('save.profile', 'bob')
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(saved['gameplay']['obstacle_spawn_rate'], 1200)
+        self.assertEqual(saved['save']['profile'], 'bob')
+        self.assertFalse(os.path.exists(self.config_file + '.tmp'))
+
+        old, new = self.manager.poll()
+        self.assertEqual(old.gameplay.obstacle_spawn_rate, 1500)
+        self.assertEqual(new.gameplay.obstacle_spawn_rate, 1200)
+        self.watcher.check()
+        self.assertIsNone(self.manager.poll())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+
+from src.dirty_rects import DirtyRectTracker, merge_rects
+
+
+class TestDirtyRectTracker(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.tracker = DirtyRectTracker((0, 0, 100, 50), enabled=True)
+        self.background = pygame.Surface((100, 50))
+        self.background.fill((0, 0, 255))
+        self.canvas = pygame.Surface((100, 50))
+
+    def draw_box(self, x):
+        self.tracker.restore(self.canvas, self.background)
+        rect = pygame.Rect(x, 10, 10, 10)
+        self.canvas.fill((255, 0, 0), rect)
+        self.tracker.add(rect)
+        return self.tracker.end_frame()
+
+    def test_first_frame_is_full(self):
+        """首帧和 invalidate 之后整帧提交"""
+        self.assertIsNone(self.draw_box(10))
+        self.assertIsNotNone(self.draw_box(12))
+        self.tracker.invalidate()
+        self.assertIsNone(self.draw_box(14))
+
+    def test_previous_and_current_regions(self):
+        """提交上一帧和本帧区域的并集，旧位置恢复为背景"""
+        self.draw_box(10)
+        rects = self.draw_box(30)
+        self.assertEqual(sorted(map(tuple, rects)), [(10, 10, 10, 10), (30, 10, 10, 10)])
+        self.assertEqual(self.canvas.get_at((12, 12))[:3], (0, 0, 255))
+        self.assertEqual(self.canvas.get_at((32, 12))[:3], (255, 0, 0))
+
+        rects = self.draw_box(34)
+        self.assertEqual(list(map(tuple, rects)), [(30, 10, 14, 10)])
+
+    def test_marked_and_clipped(self):
+        """原地变化的区域和越界区域"""
+        self.draw_box(10)
+        self.tracker.mark((90, 40, 30, 30))
+        self.tracker.add((-5, 0, 3, 3))
+        rects = self.draw_box(10)
+        self.assertIn((90, 40, 10, 10), [tuple(r) for r in rects])
+
+    def test_merge_rects(self):
+        merged = merge_rects([pygame.Rect(0, 0, 5, 5), pygame.Rect(20, 0, 5, 5), pygame.Rect(4, 4, 20, 2)])
+        self.assertEqual([tuple(r) for r in merged], [(0, 0, 25, 6)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+
+from src.frame_buffers import FrameBuffers
+
+
+class TestFrameBuffers(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.window = pygame.display.set_mode((80, 60))
+        self.frame = FrameBuffers((40, 30), 2)
+        self.frame.canvas.fill((0, 0, 255))
+        self.frame.canvas.fill((255, 0, 0), (10, 10, 5, 5))
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def test_panels_are_reused(self):
+        """同名面板只分配一次"""
+        overlay = self.frame.panel('overlay', (40, 30), (0, 0, 0), 128)
+        self.assertIs(self.frame.panel('overlay', (40, 30), (0, 0, 0), 128), overlay)
+        self.assertEqual(overlay.get_alpha(), 128)
+
+    def test_present_full_frame(self):
+        """整帧直接缩放到窗口"""
+        canvas, scaled = self.frame.canvas, self.frame.scaled
+        self.frame.present(self.window)
+        self.assertEqual(self.window.get_at((21, 21))[:3], (255, 0, 0))
+        self.assertEqual(self.window.get_at((0, 0))[:3], (0, 0, 255))
+        self.assertIs(self.frame.canvas, canvas)
+        self.assertIs(self.frame.scaled, scaled)
+
+    def test_present_rects_and_offset(self):
+        """只提交给定区域；有偏移时经过放大缓冲"""
+        self.window.fill((0, 255, 0))
+        self.frame.present(self.window, rects=[pygame.Rect(10, 10, 5, 5)])
+        self.assertEqual(self.window.get_at((21, 21))[:3], (255, 0, 0))
+        self.assertEqual(self.window.get_at((0, 0))[:3], (0, 255, 0))
+
+        self.frame.present(self.window, offset=(3, 0))
+        self.assertEqual(self.window.get_at((1, 0))[:3], (0, 0, 0))
+        self.assertEqual(self.window.get_at((23, 21))[:3], (255, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import os
+import sys
+import types
+
+import pygame
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.frame_profiler import FrameProfiler, ProfilerOverlay
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def record(self, profiler, rows):
+        """直接写入每帧各阶段的耗时（秒）"""
+        for row in rows:
+            profiler.current = list(row)
+            profiler.end_frame()
+
+    def test_disabled_records_nothing(self):
+        """关闭时 lap 和 end_frame 不做任何事"""
+        profiler = FrameProfiler(('a', 'b'))
+        profiler.lap('a')
+        profiler.end_frame()
+        self.assertEqual(profiler.count, 0)
+        profiler.enabled = True
+        profiler.lap('a')
+        profiler.lap('b')
+        profiler.end_frame()
+        self.assertEqual(profiler.count, 1)
+        self.assertGreaterEqual(min(profiler.last()), 0)
+
+    def test_ring_buffer(self):
+        """缓冲区写满后覆盖最旧的帧"""
+        profiler = FrameProfiler(('a', 'b'), capacity=4)
+        profiler.enabled = True
+        self.record(profiler, [(i / 1000, 0.001) for i in range(6)])
+        self.assertEqual(profiler.count, 4)
+        self.assertEqual(profiler.frames, 6)
+        self.assertEqual(profiler.last(), [0.005, 0.001])
+        self.assertEqual([round(row[0] * 1000) for row in profiler.history()], [2, 3, 4, 5])
+
+    def test_percentiles(self):
+        """整帧和单个阶段的百分位（毫秒）"""
+        profiler = FrameProfiler(('a', 'b'), capacity=100)
+        profiler.enabled = True
+        self.record(profiler, [(0.010, 0.006)] * 98 + [(0.050, 0.006)] * 2)
+        p50, p95, p99 = profiler.frame_percentiles()
+        self.assertAlmostEqual(p50, 16)
+        self.assertAlmostEqual(p95, 16)
+        self.assertGreater(p99, 50)
+        self.assertAlmostEqual(profiler.phase_percentiles(50)[1], 6)
+
+    def test_reenable_starts_new_session(self):
+        """关闭后重新开启时清空缓冲区，百分位不混入上一段记录"""
+        profiler = FrameProfiler(('a', 'b'), capacity=10)
+        profiler.enabled = True
+        self.record(profiler, [(0.050, 0.0)] * 4)
+        profiler.enabled = False
+        profiler.enabled = True
+        self.assertEqual(profiler.count, 0)
+        self.assertIsNone(profiler.last())
+        self.record(profiler, [(0.010, 0.0)] * 2)
+        self.assertEqual(profiler.count, 2)
+        self.assertAlmostEqual(profiler.frame_percentiles()[2], 10)
+
+
+class TestProfilerOverlay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def test_graph_scrolls_one_column_per_frame(self):
+        """图表每帧左移一列，只绘制最新的一列"""
+        profiler = FrameProfiler(('a', 'b'))
+        profiler.enabled = True
+        overlay = ProfilerOverlay(profiler, pygame.font.Font(None, 16), graph_size=(10, 30))
+        target = pygame.Surface((200, 200))
+
+        profiler.current = [0.010, 0.010]   # 20 ms，占图表高度的 60%
+        profiler.end_frame()
+        overlay.draw(target, (0, 0))
+        graph = overlay.graph
+        self.assertEqual(graph.get_at((9, 29))[:3], overlay.colors[0])
+        self.assertEqual(graph.get_at((9, 13))[:3], overlay.colors[1])
+        self.assertEqual(graph.get_at((9, 5))[:3], overlay.GRAPH_BACKGROUND)
+
+        overlay.draw(target, (0, 0))      # 没有新的帧，图表不动
+        self.assertEqual(graph.get_at((8, 29))[:3], overlay.GRAPH_BACKGROUND)
+        profiler.current = [0.0, 0.0]
+        profiler.end_frame()
+        overlay.draw(target, (0, 0))
+        self.assertEqual(graph.get_at((8, 29))[:3], overlay.colors[0])
+        self.assertEqual(graph.get_at((9, 29))[:3], overlay.GRAPH_BACKGROUND)
+
+        profiler.enabled = False
+        profiler.enabled = True
+        overlay.draw(target, (0, 0))      # 重新开启后图表清空
+        self.assertEqual(graph.get_at((8, 29))[:3], overlay.GRAPH_BACKGROUND)
+
+    def test_text_uses_prerendered_glyphs(self):
+        """文字只在构造时渲染，之后刷新文字不再调用字体"""
+        profiler = FrameProfiler(('a', 'b'))
+        profiler.enabled = True
+        font = pygame.font.Font(None, 16)
+        overlay = ProfilerOverlay(profiler, font, text_interval=1)
+        calls = []
+        render = font.render
+        overlay.font = types.SimpleNamespace(render=lambda *args: calls.append(args) or render(*args))
+        target = pygame.Surface((200, 200))
+        for i in range(5):
+            profiler.current = [0.001 * (i + 1), 0.0123]
+            profiler.end_frame()
+            overlay.draw(target, (0, 0))
+        self.assertEqual(calls, [])
+        self.assertTrue(any(overlay.panel.get_at((x, y))[:3] != overlay.BACKGROUND
+                            for x in range(40) for y in range(overlay.line)))
+
+
+if __name__ == '__main__':
+    unittest.main()
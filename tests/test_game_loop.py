@@ -0,0 +1,55 @@
+import unittest
+import os
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.game_loop import FixedTimestep
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def test_steps_independent_of_frame_rate(self):
+        """不同渲染帧率下一秒都推进 60 步"""
+        for fps in (20, 30, 60, 144):
+            timestep = FixedTimestep(60)
+            steps = sum(timestep.advance(1 / fps) for _ in range(fps))
+            self.assertEqual(steps, 60, fps)
+
+    def test_uneven_frames(self):
+        """帧时间抖动时余量保留到下一帧"""
+        timestep = FixedTimestep(60)
+        self.assertEqual(timestep.advance(0.010), 0)
+        self.assertEqual(timestep.advance(0.010), 1)
+        self.assertAlmostEqual(timestep.alpha, 0.2)
+
+    def test_time_scale(self):
+        """时间倍率按比例改变步数，并限制在可选范围内"""
+        timestep = FixedTimestep(60, time_scale=64)
+        self.assertEqual(timestep.advance(1 / 60), 64)
+        timestep = FixedTimestep(60, time_scale=0.25)
+        self.assertEqual(sum(timestep.advance(1 / 60) for _ in range(8)), 2)
+        timestep.time_scale = 1000
+        self.assertEqual(timestep.time_scale, 64)
+
+    def test_faster_slower(self):
+        """逐级切换倍率"""
+        timestep = FixedTimestep(60)
+        self.assertEqual(timestep.faster(), 2)
+        self.assertEqual(timestep.slower(), 1)
+        self.assertEqual(timestep.slower(), 0.5)
+        for _ in range(10):
+            timestep.slower()
+        self.assertEqual(timestep.time_scale, 0.25)
+
+    def test_max_steps_guard(self):
+        """单帧步数有上限，积压的时间被丢弃"""
+        timestep = FixedTimestep(60, max_steps=5)
+        self.assertEqual(timestep.advance(2.0), 5)
+        self.assertLess(timestep.accumulator, timestep.dt)
+        self.assertAlmostEqual(timestep.dropped, 115 / 60)
+        self.assertEqual(timestep.advance(1 / 60), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lanes import Lane
+
+
+class Box:
+    def __init__(self, x, width=10):
+        self.x = x
+        self.width = width
+
+    def off_screen(self):
+        return self.x + self.width < 0
+
+
+class CountingBox(Box):
+    """记录 x 被读取的次数"""
+    reads = 0
+
+    def __getattribute__(self, name):
+        if name == 'x':
+            CountingBox.reads += 1
+        return object.__getattribute__(self, name)
+
+
+class TestLane(unittest.TestCase):
+    def test_cull_pops_expired_front(self):
+        """从左侧弹出离开屏幕的实体并返回数量"""
+        lane = Lane([Box(-30), Box(-15), Box(-5), Box(100)])
+        self.assertEqual(lane.cull(), 2)
+        self.assertEqual([box.x for box in lane], [-5, 100])
+        self.assertEqual(lane.cull(), 0)
+        self.assertEqual(Lane().cull(), 0)
+
+    def test_overlapping(self):
+        """区间查询与 AABB 的 x 方向判定一致"""
+        lane = Lane([Box(0), Box(40, 24), Box(60), Box(200)])
+        self.assertEqual([box.x for box in lane.overlapping(50, 66)], [40, 60])
+        self.assertEqual([box.x for box in lane.overlapping(10, 40)], [])   # 边界相接不算重叠
+        self.assertEqual([box.x for box in lane.overlapping(-5, 1)], [0])
+
+    def test_add_keeps_order(self):
+        """add() 按 x 插入，x 相同时排在已有实体之后"""
+        lane = Lane([Box(0), Box(40)])
+        lane.add(Box(90))
+        lane.add(Box(20))
+        lane.add(Box(-10))
+        first, second = Box(40), Box(40)
+        lane.add(first)
+        lane.add(second)
+        self.assertEqual([box.x for box in lane], [-10, 0, 20, 40, 40, 40, 90])
+        self.assertIs(lane[4], first)
+        self.assertIs(lane[5], second)
+
+    def test_overlapping_scans_only_front(self):
+        """查询只扫描到区间右侧第一个实体为止"""
+        lane = Lane(CountingBox(x) for x in range(0, 10000, 50))
+        CountingBox.reads = 0
+        self.assertEqual(len(list(lane.overlapping(50, 66))), 1)
+        self.assertLess(CountingBox.reads, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
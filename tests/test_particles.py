@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pygame
+
+from src.particles import ParticleSystem
+
+
+class TestParticleSystem(unittest.TestCase):
+    def setUp(self):
+        self.system = ParticleSystem(capacity=32, rng=np.random.default_rng(1))
+
+    def test_emit_and_integrate(self):
+        """粒子按速度和重力积分"""
+        self.system.emit(5, 100, 50, (255, 255, 0))
+        self.assertEqual(len(self.system), 5)
+        vx, vy = self.system.vx[:5].copy(), self.system.vy[:5].copy()
+        self.assertTrue(((vx >= -3) & (vx <= 3)).all())
+        self.assertTrue(((vy >= -5) & (vy <= -1)).all())
+
+        self.system.update()
+        np.testing.assert_allclose(self.system.x[:5], 100 + vx, rtol=1e-6)
+        np.testing.assert_allclose(self.system.y[:5], 50 + vy, rtol=1e-6)
+        np.testing.assert_allclose(self.system.vy[:5], vy + 0.2, rtol=1e-6)
+
+    def test_particles_expire(self):
+        """生命周期结束后被移除"""
+        self.system.emit(4, 0, 0, (1, 2, 3))
+        for _ in range(10):
+            self.system.update()
+        self.system.emit(3, 0, 0, (1, 2, 3))
+        for _ in range(20):
+            self.system.update()
+        self.assertEqual(len(self.system), 3)
+        for _ in range(10):
+            self.system.update()
+        self.assertEqual(len(self.system), 0)
+
+    def test_capacity_evicts_oldest(self):
+        """超出容量时淘汰最早的粒子"""
+        self.system.emit(30, 0, 0, (255, 0, 0))
+        self.system.emit(10, 0, 0, (0, 255, 0))
+        self.assertEqual(len(self.system), 32)
+        colors = [self.system.palette[c] for c in self.system.color[:32]]
+        self.assertEqual(colors.count((255, 0, 0)), 22)
+        self.assertEqual(colors[-10:], [(0, 255, 0)] * 10)
+
+    def test_spread_and_bounds(self):
+        """横向散布与脏矩形区域"""
+        self.system.emit(20, 10, 5, (0, 0, 0, 100), spread_x=16)
+        xs = self.system.x[:20]
+        self.assertTrue(((xs >= 10) & (xs <= 26)).all())
+        self.assertEqual(self.system.palette, [(0, 0, 0)])
+        self.assertEqual(len(self.system.bounds()), 20)
+
+    def test_draw(self):
+        pygame.init()
+        surface = pygame.Surface((20, 20))
+        self.system.emit(1, 10, 10, (255, 0, 0))
+        self.system.draw(surface)
+        self.assertEqual(surface.get_at((10, 10))[:3], (255, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import math
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+
+from src.render_cache import BackgroundLayer, HudLayer, SpriteCache
+
+SKY = (135, 206, 235)
+GROUND = (46, 125, 50)
+SHADOW = (27, 94, 32)
+
+
+class TestBackgroundLayer(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.layer = BackgroundLayer()
+
+    def test_matches_per_frame_drawing(self):
+        """背景层与逐帧绘制的像素一致"""
+        width, height = 120, 80
+        expected = pygame.Surface((width, height))
+        for y in range(height - 20):
+            ratio = y / (height - 20)
+            color = tuple(int(SKY[i] * (1 - ratio) + 255 * ratio) for i in range(3))
+            pygame.draw.line(expected, color, (0, y), (width, y))
+        pygame.draw.rect(expected, SHADOW, (0, height - 18, width, 18))
+        pygame.draw.rect(expected, GROUND, (0, height - 20, width, 18))
+        for x in range(0, width, 8):
+            pygame.draw.line(expected, SHADOW, (x, height - 20), (x, height - 2))
+
+        layer = self.layer.get((width, height), SKY, GROUND, SHADOW)
+        for y in range(height):
+            for x in range(width):
+                self.assertEqual(layer.get_at((x, y)), expected.get_at((x, y)))
+
+    def test_rebuild_only_on_change(self):
+        """仅在颜色或分辨率变化时重建"""
+        first = self.layer.get((64, 48), SKY, GROUND, SHADOW)
+        self.assertIs(self.layer.get((64, 48), list(SKY), GROUND, SHADOW), first)
+        self.assertEqual(self.layer.builds, 1)
+
+        self.layer.get((64, 48), (0, 0, 0), GROUND, SHADOW)
+        self.assertEqual(self.layer.builds, 2)
+        self.layer.get((96, 48), (0, 0, 0), GROUND, SHADOW)
+        self.assertEqual(self.layer.builds, 3)
+
+        self.layer.invalidate()
+        self.layer.get((96, 48), (0, 0, 0), GROUND, SHADOW)
+        self.assertEqual(self.layer.builds, 4)
+
+
+class TestSpriteCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.cache = SpriteCache(phases=8)
+        self.calls = []
+
+    def render(self, target, x, y, angle):
+        self.calls.append(angle)
+        pygame.draw.rect(target, (255, 0, 0), (x, y, 4, 4))
+
+    def test_phase_quantization(self):
+        """角度量化到最近的预渲染帧"""
+        self.assertEqual(self.cache.phase(0), 0)
+        self.assertEqual(self.cache.phase(math.pi / 4), 1)
+        self.assertEqual(self.cache.phase(2 * math.pi), 0)
+        self.assertEqual(self.cache.phase(100 * math.pi + 0.1), 0)
+
+    def test_frames_built_once_per_key(self):
+        """每个精灵只在首次使用时渲染全部旋转帧"""
+        frame, dest = self.cache.sprite('box', (10, 20), (4, 4), 0.0, self.render)
+        self.assertEqual(len(self.calls), 8)
+        self.assertEqual(frame.get_at((10 - dest[0], 20 - dest[1]))[:3], (255, 0, 0))
+
+        for angle in (0.5, 1.0, 7.0):
+            self.cache.sprite('box', (10, 20), (4, 4), angle, self.render)
+        self.assertEqual(len(self.calls), 8)
+
+    def test_static_sprite(self):
+        """静态精灵只渲染一帧"""
+        frame, dest = self.cache.static('block', (10, 20), (4, 4), self.render)
+        self.assertEqual(self.calls, [0.0])
+        again, _ = self.cache.static('block', (50, 20), (4, 4), self.render)
+        self.assertIs(again, frame)
+        self.assertEqual(frame.get_at((10 - dest[0], 20 - dest[1]))[:3], (255, 0, 0))
+
+    def test_configure_rebuilds_on_phase_change(self):
+        """修改帧数后缓存重建"""
+        self.cache.sprite('box', (0, 0), (4, 4), 0.0, self.render)
+        self.cache.configure(phases=8, enabled=False)
+        self.assertFalse(self.cache.enabled)
+        self.assertIn('box', self.cache.frames)
+        self.cache.configure(phases=16)
+        self.assertEqual(self.cache.frames, {})
+
+
+class TestHudLayer(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.hud = HudLayer((40, 20))
+        self.keys = []
+
+    def compose(self, surface, key):
+        self.keys.append(key)
+        surface.fill((key, 0, 0))
+
+    def test_recompose_only_on_change(self):
+        """数值不变时不重新合成"""
+        for key in (1, 1, 1, 2, 2, 1):
+            panel = self.hud.get(key, self.compose)
+        self.assertEqual(self.keys, [1, 2, 1])
+        self.assertEqual(panel.get_at((0, 0))[:3], (1, 0, 0))
+
+        self.hud.invalidate()
+        self.hud.get(1, self.compose)
+        self.assertEqual(self.hud.composes, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
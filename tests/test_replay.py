@@ -0,0 +1,126 @@
+import unittest
+import os
+import sys
+import random
+import tempfile
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.replay import Replay, ReplayRecorder, main, play
+from src.simulation import Rules, World
+
+
+def record_run(seed, max_frames=5000, rules=None):
+    """用带随机性的简单策略玩一局，返回 (回放, 结束时的世界)"""
+    world = World(seed=seed) if rules is None else World(seed=seed, rules=rules)
+    replay = Replay(seed, rules=world.run_rules)
+    policy = random.Random(seed + 1)
+    while not world.game_over and world.frame < max_frames:
+        near = any(0 < obs.x - world.player.x < 30 for obs in world.obstacles)
+        inputs = ('jump',) if near or policy.random() < 0.02 else ()
+        if world.step(inputs).jumped:
+            replay.jumps.append(world.frame)
+    replay.frames = world.frame
+    replay.score = world.score if world.game_over else None
+    return replay, world
+
+
+class TestReplayFormat(unittest.TestCase):
+    def test_round_trip(self):
+        """编码后再解码得到相同的回放"""
+        replay = Replay(0xDEADBEEF, [3, 90, 91, 400, 20000], frames=20500, score=1230)
+        loaded = Replay.from_bytes(replay.to_bytes())
+        self.assertEqual((loaded.seed, loaded.jumps, loaded.frames, loaded.score),
+                         (replay.seed, replay.jumps, replay.frames, replay.score))
+
+    def test_unfinished(self):
+        """未完成的回放没有分数"""
+        loaded = Replay.from_bytes(Replay(5, [10], frames=42).to_bytes())
+        self.assertFalse(loaded.finished)
+        self.assertIsNone(loaded.score)
+
+    def test_compact(self):
+        """跳跃帧差分编码，每次跳跃通常只占 1-2 字节"""
+        replay = Replay(1, range(50, 50 * 201, 50), frames=10100, score=0)
+        self.assertLess(len(replay.to_bytes()), 24 + 200 * 2)
+
+    def test_bad_file(self):
+        """拒绝不是回放的数据"""
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(b'{"high_score": 0}' + bytes(32))
+
+
+class TestPlayback(unittest.TestCase):
+    def test_reproduces_score(self):
+        """重放得到完全相同的分数和帧数"""
+        for seed in (1, 2, 3):
+            replay, world = record_run(seed)
+            replayed = play(Replay.from_bytes(replay.to_bytes()))
+            self.assertEqual((replayed.score, replayed.frame), (world.score, world.frame))
+            self.assertEqual(replayed.game_over, world.game_over)
+
+    def test_tuned_rules(self):
+        """用非默认规则玩的一局按回放中保存的规则重放"""
+        rules = Rules(gravity=0.35, jump_strength=-8.5, initial_speed=5.5, speed_increase=0.5, speed_interval=300,
+                      obstacle_spawn_ms=1100, min_obstacle_spawn_ms=500, star_interval=90, star_chance=0.9,
+                      points_per_obstacle=7, points_per_star=30)
+        for seed in (1, 2):
+            replay, world = record_run(seed, rules=rules)
+            loaded = Replay.from_bytes(replay.to_bytes())
+            self.assertEqual([getattr(loaded.rules, name) for name in Rules.__slots__],
+                             [getattr(rules, name) for name in Rules.__slots__])
+            replayed = play(loaded, World(seed=0))
+            self.assertEqual((replayed.score, replayed.frame), (world.score, world.frame))
+            self.assertNotEqual(play(Replay(seed, replay.jumps, replay.frames)).score, world.score)
+
+    def test_gameplay_independent_of_cosmetics(self):
+        """外观随机流（云朵）不影响玩法结果"""
+        replay, world = record_run(4)
+        other = World(seed=0)
+        for _ in range(500):
+            other.step()  # 先积累一些云朵和计时
+        self.assertEqual(play(replay, other).score, world.score)
+
+
+class TestReplayRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, 'replays')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_finish_saves(self):
+        """结束一局时保存回放文件，且可以校验"""
+        replay, world = record_run(6)
+        recorder = ReplayRecorder(self.directory)
+        recorder.start(replay.seed)
+        for frame in replay.jumps:
+            recorder.record_jump(frame)
+        recorder.finish(replay.frames, replay.score)
+        self.assertIsNone(recorder.finish(0))  # 没有进行中的一局
+
+        files = os.listdir(self.directory)
+        self.assertEqual(len(files), 1)
+        path = os.path.join(self.directory, files[0])
+        self.assertEqual(Replay.load(path).jumps, replay.jumps)
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                self.assertEqual(main([path]), 0)
+            finally:
+                sys.stdout = stdout
+
+    def test_prune(self):
+        """只保留最新的若干个回放"""
+        recorder = ReplayRecorder(self.directory, keep=3)
+        os.makedirs(self.directory)
+        for i in range(5):
+            Replay(i).save(os.path.join(self.directory, f'run_0000000{i}.rpl'))
+        recorder.prune()
+        self.assertEqual(sorted(os.listdir(self.directory)), ['run_00000002.rpl', 'run_00000003.rpl', 'run_00000004.rpl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.run_history import RECORD, HEADER, RunHistory, best_runs, daily_averages, score_distribution
+from src.simulation import World
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = RunHistory(os.path.join(self.tmp.name, 'game_data', 'run_history.bin'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_empty(self):
+        """没有历史文件时返回空数组"""
+        self.assertEqual(len(self.history.load()), 0)
+
+    def test_append_and_load(self):
+        """追加的记录按顺序读回，每条记录长度固定"""
+        self.history.append(7, 120, 3, 11, 6.5, 20.25, 'saw', timestamp=1000.0)
+        world = World(seed=9)
+        while not world.game_over:
+            events = world.step()
+        self.history.record(world, events.collisions[0].type)
+
+        self.assertEqual(os.path.getsize(self.history.path), HEADER.size + 2 * RECORD.size)
+        runs = self.history.load()
+        self.assertEqual(runs['seed'].tolist(), [7, 9])
+        self.assertEqual(runs[0]['score'], 120)
+        self.assertEqual(runs[0]['max_speed'], 6.5)
+        self.assertEqual(runs[0]['timestamp'], 1000.0)
+        self.assertEqual(runs[1]['score'], world.score)
+        self.assertAlmostEqual(runs[1]['duration'], world.frame / 60, places=4)
+        self.assertFalse(runs.flags.writeable)
+
+    def test_torn_record_ignored(self):
+        """末尾写了一半的记录被忽略"""
+        self.history.append(1, 10, 0, 1, 4.0, 3.0)
+        with open(self.history.path, 'ab') as f:
+            f.write(b'\0' * 5)
+        self.assertEqual(len(self.history.load()), 1)
+
+    def test_append_after_torn_record(self):
+        """写了一半的记录被截掉，之后追加的记录仍然对齐"""
+        self.history.append(1, 10, 0, 1, 4.0, 3.0)
+        with open(self.history.path, 'ab') as f:
+            f.write(b'\xff' * 5)
+        self.history.append(2, 20, 1, 2, 5.0, 6.0, 'saw')
+        runs = self.history.load()
+        self.assertEqual(os.path.getsize(self.history.path), HEADER.size + 2 * RECORD.size)
+        self.assertEqual(runs['seed'].tolist(), [1, 2])
+        self.assertEqual(runs['score'].tolist(), [10, 20])
+        self.assertEqual(runs[1]['max_speed'], 5.0)
+
+    def test_loaded_array_is_independent(self):
+        """读出的数组不占用文件，之后追加（包括截断）不影响它"""
+        self.history.append(1, 10, 0, 1, 4.0, 3.0)
+        runs = self.history.load()
+        with open(self.history.path, 'ab') as f:
+            f.write(b'\xff' * 5)
+        self.history.append(2, 20, 1, 2, 5.0, 6.0)
+        self.assertEqual(runs['seed'].tolist(), [1])
+        self.assertEqual(self.history.load()['seed'].tolist(), [1, 2])
+
+    def test_bad_file(self):
+        """拒绝不是历史记录的文件"""
+        os.makedirs(os.path.dirname(self.history.path))
+        with open(self.history.path, 'wb') as f:
+            f.write(b'{"high_score": 0}' + bytes(64))
+        with self.assertRaises(ValueError):
+            self.history.load()
+
+
+class TestQueries(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        history = RunHistory(os.path.join(self.tmp.name, 'run_history.bin'))
+        for day, score in ((0, 10), (0, 30), (1, 50), (3, 5)):
+            history.append(day, score, 0, 0, 4.0, 1.0, 'block', timestamp=day * 86400 + 3600)
+        self.runs = history.load()
+
+    def tearDown(self):
+        del self.runs
+        self.tmp.cleanup()
+
+    def test_best_runs(self):
+        """按分数从高到低取前几名"""
+        self.assertEqual(best_runs(self.runs, 2)['score'].tolist(), [50, 30])
+        self.assertEqual(len(best_runs(self.runs, 10)), 4)
+
+    def test_daily_averages(self):
+        """按天统计平均分"""
+        days, averages, counts = daily_averages(self.runs, utc_offset=0)
+        self.assertEqual(days.tolist(), [0, 86400, 3 * 86400])
+        self.assertEqual(averages.tolist(), [20, 50, 5])
+        self.assertEqual(counts.tolist(), [2, 1, 1])
+        # 时间戳乱序时（例如系统时钟被调整）结果相同
+        shuffled = self.runs[[2, 0, 3, 1]]
+        self.assertEqual(daily_averages(shuffled, utc_offset=0)[1].tolist(), [20, 50, 5])
+        self.assertEqual(len(daily_averages(self.runs[:0])[0]), 0)
+
+    def test_score_distribution(self):
+        """分数分布直方图"""
+        counts, edges = score_distribution(self.runs, bins=5)
+        self.assertEqual(counts.sum(), 4)
+        self.assertEqual((edges[0], edges[-1]), (5, 50))
+
+
+if __name__ == '__main__':
+    unittest.main()
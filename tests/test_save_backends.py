@@ -0,0 +1,183 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.save_backends import JsonBackend, SqliteBackend, migrate_json, open_backend
+from src.save_manager import SaveManager
+
+
+def make_run(score, seed=1):
+    return {'timestamp': 1000.0 + score, 'seed': seed, 'score': score, 'stars': 2, 'obstacles_avoided': 5,
+            'max_speed': 6.5, 'duration': 12.0, 'cause': 'spike'}
+
+
+class TestSqliteBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.backend = SqliteBackend(self.tmp.name)
+
+    def tearDown(self):
+        self.backend.close()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """保存后读回相同的存档数据"""
+        data = {'high_score': 300, 'total_stars_collected': 12, 'total_games_played': 4,
+                'achievements': {'first_100': {'name': 'First Steps', 'icon': '', 'unlocked_at': '2026-01-01'}},
+                'statistics': {'longest_run': 300, 'highest_speed': 7.5}, 'last_save': '2026-01-02',
+                'settings': {'mute': True}}
+        self.assertIsNone(self.backend.load('alice'))
+        self.backend.save('alice', data, [])
+        self.assertEqual(self.backend.load('alice'), data)
+        self.assertEqual(self.backend.connection().execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+    def test_leaderboard_and_runs(self):
+        """排行榜和最佳记录通过索引查询"""
+        for name, score in (('a', 50), ('b', 300), ('c', 120)):
+            self.backend.save(name, {'high_score': score}, [make_run(score), make_run(score // 2)])
+        self.assertEqual([row['name'] for row in self.backend.leaderboard(2)], ['b', 'c'])
+        self.assertEqual([run['score'] for run in self.backend.best_runs('c', 5)], [120, 60])
+        self.assertEqual(self.backend.best_runs('c')[0], make_run(120))
+
+        db = self.backend.connection()
+        plan = ' '.join(row[-1] for row in db.execute(
+            'EXPLAIN QUERY PLAN SELECT name, high_score FROM profiles ORDER BY high_score DESC LIMIT 10'))
+        self.assertIn('profiles_high_score', plan)
+        plan = ' '.join(row[-1] for row in db.execute(
+            'EXPLAIN QUERY PLAN SELECT score FROM runs WHERE profile_id = 1 ORDER BY score DESC LIMIT 10'))
+        self.assertIn('runs_profile_score', plan)
+
+
+class TestMigration(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_file = os.path.join(self.tmp.name, 'save_data.json')
+        with open(self.json_file, 'w', encoding='utf-8') as f:
+            json.dump({'high_score': 90, 'total_stars_collected': 3, 'total_games_played': 2,
+                       'achievements': {}, 'statistics': {'longest_run': 90}}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_migrate_once(self):
+        """JSON 存档只迁移一次，之后重命名"""
+        backend = open_backend('sqlite', self.tmp.name)
+        self.assertTrue(migrate_json(self.tmp.name, backend))
+        self.assertFalse(os.path.exists(self.json_file))
+        self.assertTrue(os.path.exists(self.json_file + '.migrated'))
+        self.assertEqual(backend.load('default')['high_score'], 90)
+        self.assertFalse(migrate_json(self.tmp.name, backend))
+        backend.close()
+
+    def test_migrate_all_profiles(self):
+        """所有 JSON 档案都迁移到 SQLite，而不只是默认档案"""
+        JsonBackend(self.tmp.name).save('小明', {'high_score': 250, 'last_save': '2026-01-03'}, [])
+        backend = open_backend('sqlite', self.tmp.name)
+        self.assertEqual(sorted(migrate_json(self.tmp.name, backend)), ['default', '小明'])
+        self.assertEqual(backend.load('小明')['high_score'], 250)
+        self.assertEqual({p['name'] for p in backend.list_profiles()}, {'default', '小明'})
+        self.assertEqual(os.listdir(os.path.join(self.tmp.name, 'profiles')), ['%E5%B0%8F%E6%98%8E.json.migrated'])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'profiles.json')))
+        self.assertEqual(migrate_json(self.tmp.name, backend), [])
+        backend.close()
+
+    def test_save_manager_selects_backend(self):
+        """SaveManager 按配置选择后端并在首次打开时迁移"""
+        manager = SaveManager(self.tmp.name, backend='sqlite')
+        self.assertEqual(manager.load_game_data()['high_score'], 90)
+        with manager.transaction():
+            manager.update_high_score(140)
+            manager.record_run(make_run(140))
+        manager.wait()
+        self.assertEqual(manager.leaderboard(), [{'name': 'default', 'high_score': 140}])
+        self.assertEqual([run['score'] for run in manager.best_runs()], [140])
+        manager.close()
+
+        manager = SaveManager(self.tmp.name, backend='sqlite')
+        self.assertEqual(manager.load_game_data()['high_score'], 140)
+        manager.close()
+        with self.assertRaises(ValueError):
+            SaveManager(self.tmp.name, backend='xml')
+
+    def test_rolled_back_run_not_saved(self):
+        """回滚的事务中记录的一局不会写入"""
+        manager = SaveManager(self.tmp.name, backend='sqlite')
+        with self.assertRaises(RuntimeError):
+            with manager.transaction():
+                manager.record_run(make_run(10))
+                raise RuntimeError
+        manager.record_run(make_run(20))
+        manager.wait()
+        self.assertEqual([run['score'] for run in manager.best_runs()], [20])
+        manager.close()
+
+    def test_json_backend_unchanged(self):
+        """默认的 JSON 后端继续使用 save_data.json"""
+        self.assertEqual(JsonBackend(self.tmp.name).load('default')['high_score'], 90)
+        manager = SaveManager(self.tmp.name)
+        self.assertEqual(manager.load_game_data()['high_score'], 90)
+        self.assertTrue(os.path.exists(self.json_file))
+        manager.close()
+
+
+
+class TestProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_json_profile_files_and_index(self):
+        """每个档案单独一个文件，索引只记录名称、高分和最后游玩时间"""
+        backend = JsonBackend(self.tmp.name)
+        backend.save('default', {'high_score': 10, 'last_save': '2026-01-01'}, [])
+        backend.save('a/b 小明', {'high_score': 70, 'last_save': '2026-01-03'}, [])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, 'save_data.json')))
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp.name, 'profiles'))), 1)
+        expected = [{'name': 'a/b 小明', 'high_score': 70, 'last_played': '2026-01-03'},
+                    {'name': 'default', 'high_score': 10, 'last_played': '2026-01-01'}]
+        self.assertEqual(backend.list_profiles(), expected)
+        self.assertEqual(backend.load('a/b 小明')['high_score'], 70)
+
+        # 索引丢失时从档案文件重建
+        os.remove(backend.index_file)
+        self.assertEqual(JsonBackend(self.tmp.name).list_profiles(), expected)
+
+    def test_sqlite_profiles(self):
+        """SQLite 后端的档案列表只查询档案表的几列"""
+        backend = SqliteBackend(self.tmp.name)
+        backend.save('a', {'high_score': 5, 'last_save': '2026-01-01'}, [])
+        backend.save('b', {'high_score': 9, 'last_save': '2026-01-02'}, [])
+        self.assertEqual([p['name'] for p in backend.list_profiles()], ['b', 'a'])
+        backend.close()
+
+    def test_lazy_load_and_switch(self):
+        """只在使用时读取选中的档案，切换前写完当前档案"""
+        for backend in ('json', 'sqlite'):
+            manager = SaveManager(os.path.join(self.tmp.name, backend), backend=backend)
+            loads = []
+            load = manager.backend.load
+            manager.backend.load = lambda profile: loads.append(profile) or load(profile)
+            self.assertEqual(loads, [])
+
+            manager.update_high_score(30)
+            manager.select_profile('bob')
+            self.assertEqual(loads, ['default'])
+            self.assertEqual(manager.load_game_data()['high_score'], 0)
+            manager.update_high_score(80)
+            manager.select_profile('default')
+            self.assertEqual(manager.load_game_data()['high_score'], 30)
+            self.assertEqual(loads, ['default', 'bob', 'default'])
+            self.assertEqual({(p['name'], p['high_score']) for p in manager.profiles()},
+                             {('default', 30), ('bob', 80)})
+            manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import threading
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.save_manager import SaveManager
+
+
+class CountingSaveManager(SaveManager):
+    """记录写文件的次数"""
+    def __init__(self, save_dir):
+        self.writes = 0
+        super().__init__(save_dir)
+
+    def _write(self, data):
+        self.writes += 1
+        super()._write(data)
+
+
+class TestSaveManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = CountingSaveManager(self.tmp.name)
+
+    def tearDown(self):
+        self.manager.close()
+        self.tmp.cleanup()
+
+    def read_file(self):
+        self.manager.wait()
+        with open(self.manager.save_file, encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_mutations_outside_transaction_write(self):
+        """事务外的修改立即写入文件"""
+        self.assertTrue(self.manager.update_high_score(50))
+        self.assertFalse(self.manager.update_high_score(10))  # 没有变化不写
+        self.assertEqual(self.read_file()['high_score'], 50)
+        self.assertEqual(self.manager.writes, 1)
+
+    def test_transaction_writes_once(self):
+        """事务内的多次修改只在结束时写一次"""
+        with self.manager.transaction():
+            self.manager.update_high_score(120)
+            self.manager.add_stars(3)
+            with self.manager.transaction():
+                self.manager.update_statistics({'longest_run': 120})
+            self.manager.unlock_achievement('first_100', {'name': 'First Steps'})
+            self.manager.wait()
+            self.assertEqual(self.manager.writes, 0)
+
+        data = self.read_file()
+        self.assertEqual(self.manager.writes, 1)
+        self.assertEqual((data['high_score'], data['total_stars_collected']), (120, 3))
+        self.assertEqual(data['statistics']['longest_run'], 120)
+        self.assertIn('first_100', data['achievements'])
+
+    def test_transaction_rolls_back(self):
+        """事务中抛出异常时恢复修改前的状态，不写文件"""
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction():
+                self.manager.add_stars(5)
+                raise RuntimeError
+        self.assertEqual(self.manager.load_game_data()['total_stars_collected'], 0)
+        self.assertFalse(self.manager.dirty)
+        self.manager.wait()
+        self.assertEqual(self.manager.writes, 0)
+
+    def test_reads_from_memory(self):
+        """文件只在创建时解析一次，之后的读取不访问磁盘"""
+        self.manager.unlock_achievement('score_500', {})
+        self.manager.wait()
+        os.remove(self.manager.save_file)
+        self.assertTrue(self.manager.is_achievement_unlocked('score_500'))
+
+        other = SaveManager(self.tmp.name)
+        self.assertFalse(other.is_achievement_unlocked('score_500'))
+        other.close()
+
+    def test_flush_only_when_dirty(self):
+        """flush 只在有未保存的修改时写入"""
+        self.assertFalse(self.manager.flush())
+        self.manager.dirty = True
+        self.assertTrue(self.manager.flush())
+        self.manager.wait()
+        self.assertEqual(self.manager.writes, 1)
+
+    def test_writes_coalesce(self):
+        """写入进行中提交的多次保存合并为一次，只写最新的快照"""
+        release = threading.Event()
+        write = self.manager.writer._write
+
+        def slow_write(data):
+            release.wait()
+            write(data)
+        self.manager.writer._write = slow_write
+
+        for stars in range(10):
+            self.manager.add_stars(1)  # 游戏线程不会等待磁盘
+        release.set()
+        self.assertEqual(self.read_file()['total_stars_collected'], 10)
+        self.assertLessEqual(self.manager.writes, 2)
+
+    def test_failed_write_keeps_old_file(self):
+        """写入失败时原存档保持完整，也不留下临时文件"""
+        self.manager.update_high_score(70)
+        self.manager.wait()
+        self.manager.update_statistics({'bad': object()})  # 无法序列化
+        self.assertEqual(self.read_file()['high_score'], 70)
+        self.assertEqual(os.listdir(self.tmp.name), ['save_data.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
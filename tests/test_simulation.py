@@ -0,0 +1,191 @@
+import unittest
+import os
+import sys
+import random
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import simulation
+from src.simulation import Obstacle, Rules, Star, World
+
+
+def run(world, frames, jump_every=0):
+    """推进若干帧，按固定间隔跳跃，返回死亡帧（未死亡返回 None）"""
+    for i in range(frames):
+        inputs = ('jump',) if jump_every and i % jump_every == 0 else ()
+        if world.step(inputs).died:
+            return world.frame
+    return None
+
+
+class TestWorld(unittest.TestCase):
+    def test_headless_without_pygame(self):
+        """模拟核心不依赖 pygame"""
+        self.assertNotIn('pygame', vars(simulation))
+
+    def test_jump_physics(self):
+        """跳跃后按重力回落到地面"""
+        world = World(seed=0)
+        player = world.player
+        events = world.step(['jump'])
+        self.assertTrue(events.jumped)
+        self.assertEqual(player.vel_y, simulation.JUMP_STRENGTH + simulation.GRAVITY)
+        self.assertFalse(world.step(['jump']).jumped)  # 空中不能再跳
+        for _ in range(60):
+            world.step()
+        self.assertTrue(player.on_ground)
+        self.assertEqual(player.y, player.ground_y)
+
+    def test_obstacle_spawn_and_score(self):
+        """障碍物按帧间隔生成，离开屏幕后加分"""
+        world = World(seed=0)
+        interval = simulation.ms_to_frames(simulation.OBSTACLE_SPAWN_MS)
+        for _ in range(interval - 1):
+            world.step()
+        self.assertEqual(len(world.obstacles), 0)
+        world.step()
+        self.assertEqual(len(world.obstacles), 1)
+
+        obstacle = world.obstacles[0]
+        obstacle.y = obstacle.prev_y = -100  # 移出玩家所在高度，避免碰撞
+        while obstacle in world.obstacles:
+            self.assertFalse(world.game_over)
+            while len(world.obstacles) > 1:
+                world.obstacles.pop()  # 丢弃之后生成的障碍物
+            events = world.step()
+        self.assertEqual(events.obstacles_passed, 1)
+        self.assertEqual(world.score, simulation.POINTS_PER_OBSTACLE)
+        self.assertEqual(world.obstacles_avoided, 1)
+
+    def test_star_collection(self):
+        """碰到星星加分且只计一次"""
+        world = World(seed=0)
+        star = Star(random.Random(0))
+        star.x, star.y = world.player.x + world.speed, world.player.y
+        world.stars.append(star)
+        events = world.step()
+        self.assertEqual(events.stars_collected, [star])
+        self.assertEqual(world.score, simulation.POINTS_PER_STAR)
+        self.assertFalse(world.step().stars_collected)
+        self.assertEqual(world.stars_collected, 1)
+
+    def test_collision_ends_run(self):
+        """撞到障碍物后游戏结束，之后 step 不再推进"""
+        world = World(seed=0)
+        obstacle = Obstacle(random.Random(0))
+        obstacle.x = world.player.x
+        world.obstacles.append(obstacle)
+        self.assertTrue(world.step().died)
+        self.assertTrue(world.game_over)
+        frame = world.frame
+        world.step()
+        self.assertEqual(world.frame, frame)
+
+        world.reset()
+        self.assertFalse(world.game_over)
+        self.assertEqual(world.score, 0)
+        self.assertEqual(world.speed, simulation.INITIAL_SPEED)
+
+    def test_difficulty_increase(self):
+        """每隔一段时间加速并缩短生成间隔"""
+        world = World(seed=0)
+        for _ in range(simulation.SPEED_INTERVAL + 1):
+            world.obstacles.clear()  # 只关心计时，不让玩家死亡
+            world.step()
+        self.assertAlmostEqual(world.speed, simulation.INITIAL_SPEED + simulation.SPEED_INCREASE)
+        self.assertEqual(world.max_speed, world.speed)
+        self.assertLess(world.obstacle_interval, simulation.ms_to_frames(simulation.OBSTACLE_SPAWN_MS))
+
+    def test_deterministic_with_seed(self):
+        """相同种子和输入得到相同结果"""
+        results = []
+        for _ in range(2):
+            world = World(seed=42)
+            results.append((run(world, 3000, jump_every=23), world.score, world.frame))
+        self.assertEqual(results[0], results[1])
+
+    def test_independent_worlds(self):
+        """同一进程中的多个世界互不影响"""
+        a = World(seed=7)
+        b = World(seed=7)
+        run(a, 500, jump_every=30)
+        self.assertEqual(b.frame, 0)
+        run(b, 500, jump_every=30)
+        self.assertEqual((a.score, a.frame, a.player.y), (b.score, b.frame, b.player.y))
+
+    def test_rules(self):
+        """自定义规则从下一局开始生效"""
+        world = World(seed=0, rules=Rules(gravity=1.0, jump_strength=-6, initial_speed=2, obstacle_spawn_ms=500))
+        self.assertEqual(world.speed, 2)
+        self.assertEqual(world.obstacle_interval, simulation.ms_to_frames(500))
+        world.step(['jump'])
+        self.assertEqual(world.player.vel_y, -5.0)
+
+        world.rules = simulation.DEFAULT_RULES
+        world.step()
+        self.assertEqual(world.player.vel_y, -4.0)  # 本局仍按原规则
+        world.reset()
+        self.assertEqual(world.speed, simulation.INITIAL_SPEED)
+
+    def test_apply_rules_mid_run(self):
+        """运行中换用新规则时立即生效，并按当前速度等级重新计算生成间隔"""
+        world = World(seed=0)
+        for _ in range(simulation.SPEED_INTERVAL + 1):
+            world.obstacles.clear()
+            world.step()
+        level_interval = world.obstacle_interval
+        world.apply_rules(Rules(obstacle_spawn_ms=3000, min_obstacle_spawn_ms=100, jump_strength=-4))
+        self.assertEqual(world.obstacle_interval, simulation.ms_to_frames(3000 - 500))
+        self.assertNotEqual(world.obstacle_interval, level_interval)
+        world.step(['jump'])
+        self.assertEqual(world.player.vel_y, -4 + simulation.GRAVITY)
+
+    def test_stars_stay_sorted_when_spawned_close(self):
+        """星星生成间隔很短、速度很慢时仍按 x 有序，后面的星星不会被漏检"""
+        world = World(seed=3, rules=Rules(initial_speed=0.1, star_interval=1, star_chance=1.0))
+        for _ in range(300):
+            world.obstacles.clear()
+            world.step()
+            xs = [star.x for star in world.stars]
+            self.assertEqual(xs, sorted(xs))
+        self.assertGreater(len(world.stars), 100)
+
+
+class Box:
+    def __init__(self, prev_x, x, prev_y, y, width=16, height=16):
+        self.prev_x, self.x, self.prev_y, self.y = prev_x, x, prev_y, y
+        self.width, self.height = width, height
+
+
+class TestTimeOfImpact(unittest.TestCase):
+    def test_tunnelling(self):
+        """一步内穿过玩家的高速物体也能检测到，并给出碰撞时刻"""
+        player = Box(50, 50, 300, 300)
+        bullet = Box(120, -40, 300, 300, width=8, height=8)
+        self.assertFalse(simulation.overlaps(player, bullet))
+        self.assertAlmostEqual(simulation.time_of_impact(player, bullet), (120 - 66) / 160)
+
+    def test_corner_and_miss(self):
+        """开始时重叠的时刻为 0；在对角方向擦过的不算"""
+        player = Box(50, 50, 300, 300)
+        self.assertEqual(simulation.time_of_impact(player, Box(60, 60, 310, 310)), 0.0)
+        self.assertEqual(simulation.time_of_impact(Box(50, 50, 290, 300), Box(60, 60, 310, 310)), 0.4)
+        # 先在 x 方向进入再在 y 方向离开，两段区间不相交
+        self.assertIsNone(simulation.time_of_impact(player, Box(70, 60, 280, 280)))
+
+    def test_world_catches_fast_obstacle(self):
+        """速度很快时障碍物不会从玩家身上穿过去"""
+        world = World(seed=0)
+        world.speed = 80
+        obstacle = Obstacle(random.Random(0))
+        obstacle.x = world.player.x + world.player.width + 20
+        world.obstacles.append(obstacle)
+        events = world.step()
+        self.assertTrue(obstacle.x + obstacle.width < world.player.x)  # 一步后已经在玩家左边
+        self.assertTrue(events.died)
+        self.assertGreater(events.impact_time, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import os
+import sys
+import subprocess
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.startup import StartupTimer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CHECK_IMPORTS = """
+import pygame
+import enhanced_game
+import src.game_v2
+print(pygame.display.get_init(), pygame.font.get_init(), pygame.mixer.get_init())
+"""
+
+
+class TestImports(unittest.TestCase):
+    def test_import_has_no_side_effects(self):
+        """导入游戏模块不会初始化显示、字体和音频"""
+        env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+        result = subprocess.run([sys.executable, '-c', CHECK_IMPORTS], cwd=ROOT, env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split()[-3:], ['False', 'False', 'None'])
+
+
+class TestStartupTimer(unittest.TestCase):
+    def test_phases(self):
+        """各阶段按顺序记录，结束后不再变化"""
+        timer = StartupTimer(age=0.05)
+        timer.mark('imports')
+        timer.mark('display')
+        self.assertTrue(timer.finish())
+        self.assertEqual([name for name, _ in timer.phases], ['imports', 'display', 'first frame'])
+        self.assertGreaterEqual(timer.phases[0][1], 0.05)  # 第一阶段从进程启动算起
+        self.assertAlmostEqual(sum(seconds for _, seconds in timer.phases), timer.total)
+
+        self.assertFalse(timer.finish())
+        timer.mark('later')
+        self.assertEqual(len(timer.phases), 3)
+        self.assertIn('display', timer.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
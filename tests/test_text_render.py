@@ -0,0 +1,61 @@
+import unittest
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+
+from src.text_render import CachedFont
+
+
+def flatten(text_surface, size=(300, 40)):
+    """把文字贴到黑色底板上，便于逐像素比较"""
+    board = pygame.Surface(size)
+    board.fill((0, 0, 0))
+    board.blit(text_surface, (0, 0))
+    return board
+
+
+class TestCachedFont(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.raw = pygame.font.Font(None, 24)
+        self.font = CachedFont(self.raw, capacity=3)
+
+    def test_atlas_matches_font_render(self):
+        """字形图集合成的文字与直接光栅化一致"""
+        for text in ("Score: 1230", "Speed: 4.2", "High Score: 490", "Press SPACE to Jump"):
+            expected = self.raw.render(text, True, (255, 255, 0))
+            actual = self.font.render(text, True, (255, 255, 0))
+            self.assertEqual(actual.get_size(), expected.get_size())
+            a, b = flatten(actual), flatten(expected)
+            for x in range(expected.get_width()):
+                for y in range(expected.get_height()):
+                    self.assertEqual(a.get_at((x, y)), b.get_at((x, y)))
+
+    def test_lru_cache(self):
+        """相同字符串直接命中缓存，超出容量时淘汰最久未用的"""
+        first = self.font.render("A", True, (255, 255, 255))
+        self.assertIs(self.font.render("A", True, (255, 255, 255)), first)
+        self.assertEqual((self.font.hits, self.font.misses), (1, 1))
+
+        self.font.render("B", True, (255, 255, 255))
+        self.font.render("C", True, (255, 255, 255))
+        self.font.render("A", True, (255, 255, 255))
+        self.font.render("D", True, (255, 255, 255))
+        self.assertNotIn(("B", True, (255, 255, 255), None), self.font.cache)
+        self.assertIn(("A", True, (255, 255, 255), None), self.font.cache)
+
+    def test_unsupported_text_falls_back(self):
+        """图集中没有的字符回退到原字体"""
+        surface = self.font.render("Über", True, (0, 0, 0))
+        self.assertEqual(surface.get_size(), self.raw.size("Über"))
+        self.assertEqual(self.font.get_height(), self.raw.get_height())
+
+
+if __name__ == '__main__':
+    unittest.main()